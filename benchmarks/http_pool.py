@@ -0,0 +1,78 @@
+"""Benchmark connection reuse in the shared HTTP client pool.
+
+Sends requests to a local server, once through a shared keep-alive pool
+and once with a fresh connection per request, and reports connections
+opened (handshakes), mean time-to-first-byte and total time.
+
+Usage:
+    python benchmarks/http_pool.py [--requests 200]
+"""
+
+import argparse
+import http.server
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hire.httpclient import ConnectionPool  # noqa: E402
+
+
+class _EchoHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def run(url: str, count: int, shared: bool) -> tuple[int, float, float]:
+    pool = ConnectionPool()
+    opened = 0
+    ttfb = 0.0
+    start = time.perf_counter()
+    for _ in range(count):
+        if not shared:
+            opened += pool.connections_opened
+            pool.close()
+            pool = ConnectionPool()
+        resp = pool.request("POST", url, body=b"{}", headers={"Content-Type": "application/json"})
+        ttfb += resp.ttfb
+        resp.read()
+    opened += pool.connections_opened
+    pool.close()
+    return opened, ttfb / count, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode")
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/responses"
+
+    print(f"{'MODE':<12} {'CONNECTIONS':>11} {'MEAN TTFB':>10} {'TOTAL':>8}")
+    for label, shared in (("pooled", True), ("fresh", False)):
+        opened, ttfb, total = run(url, args.requests, shared)
+        print(f"{label:<12} {opened:>11} {ttfb * 1000:>8.2f}ms {total:>7.2f}s")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
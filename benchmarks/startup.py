@@ -0,0 +1,114 @@
+"""Benchmark CLI cold-start time.
+
+Runs `hire --version`, `hire sessions` and `hire claude ...` (against a
+stub claude command, in a temporary config/data directory) as fresh
+processes and reports median wall time plus the import breakdown from
+`python -X importtime`.
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--top 8]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+STUB_CLAUDE = """#!/bin/sh
+echo '{"result": "ok", "session_id": "bench"}'
+"""
+
+SCENARIOS = {
+    "hire --version": ["--version"],
+    "hire sessions": ["sessions", "--limit", "5"],
+    "hire claude ...": ["claude", "hello"],
+}
+
+
+def _env(tmp: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["XDG_CONFIG_HOME"] = os.path.join(tmp, "config")
+    env["XDG_DATA_HOME"] = os.path.join(tmp, "data")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _setup(tmp: str) -> None:
+    """Write a config whose claude command is a stub that answers at once."""
+    stub = os.path.join(tmp, "claude")
+    with open(stub, "w") as f:
+        f.write(STUB_CLAUDE)
+    os.chmod(stub, 0o755)
+    config_dir = os.path.join(tmp, "config", "hire")
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, "config.json"), "w") as f:
+        json.dump({"adapters": {"claude": {"command": stub, "args": []}}}, f)
+
+
+def _run(args: list[str], env: dict[str, str], importtime: bool = False) -> tuple[float, str]:
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-m", "hire.cli", *args]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL,
+                          capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed: {proc.stderr}")
+    return elapsed, proc.stderr
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, depth, self_us, cumulative_us) per line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative)))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _setup(tmp)
+        env = _env(tmp)
+        # Warm up (bytecode compilation, index creation)
+        for argv in SCENARIOS.values():
+            _run(argv, env)
+
+        for label, argv in SCENARIOS.items():
+            times = [_run(argv, env)[0] for _ in range(args.runs)]
+            _, stderr = _run(argv, env, importtime=True)
+            rows = _parse_importtime(stderr)
+            total_ms = sum(r[2] for r in rows) / 1000
+            hire_modules = [r for r in rows if r[0].startswith("hire")]
+            top_level = [r for r in rows if r[1] == 0]
+
+            print(f"{label}")
+            print(f"  wall time:   median {statistics.median(times) * 1000:.1f} ms, "
+                  f"min {min(times) * 1000:.1f} ms ({args.runs} runs)")
+            print(f"  import time: {total_ms:.1f} ms, {len(rows)} modules "
+                  f"({len(hire_modules)} from hire)")
+            # Top-level imports (their cumulative times add up to the total)
+            for name, _, _, cumulative in sorted(top_level, key=lambda r: -r[3])[: args.top]:
+                print(f"    {cumulative / 1000:7.1f} ms  {name}")
+            print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
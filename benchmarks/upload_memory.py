@@ -0,0 +1,86 @@
+"""Benchmark peak memory and throughput of Grok file uploads.
+
+Uploads sparse files of several sizes to a local stand-in for the xAI
+Files API and reports peak Python heap usage (tracemalloc) and throughput.
+
+Usage:
+    python benchmarks/upload_memory.py [--sizes 1M,100M,1G]
+"""
+
+import argparse
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hire.adapters.grok import _upload_file  # noqa: E402
+
+UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+class _DrainHandler(http.server.BaseHTTPRequestHandler):
+    """Reads and discards the request body, then returns a file ID."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, 64 * 1024)))
+        body = json.dumps({"id": "file-bench"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().upper()
+    if value[-1] in UNITS:
+        return int(value[:-1]) * UNITS[value[-1]]
+    return int(value)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1M,100M,1G", help="Comma-separated file sizes")
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _DrainHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    print(f"{'SIZE':>8} {'PEAK HEAP':>12} {'TIME':>8} {'THROUGHPUT':>12}")
+    for label in args.sizes.split(","):
+        size = parse_size(label)
+        with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as f:
+            f.truncate(size)  # sparse file: no disk usage
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            _upload_file("bench", f.name, base_url)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            os.unlink(f.name)
+
+        print(f"{label:>8} {peak / 1024**2:>10.1f}MB {elapsed:>7.2f}s "
+              f"{size / 1024**2 / elapsed:>8.0f}MB/s")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
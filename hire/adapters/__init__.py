@@ -1,23 +1,101 @@
-"""Agent adapters."""
+"""Agent adapters.
 
-from .base import AgentAdapter
-from .claude import ClaudeAdapter
-from .codex import CodexAdapter
-from .gemini import GeminiAdapter
-from .grok import GrokAdapter
+Adapters are looked up by name and imported on first use, so a call only
+loads the adapter it needs. Third-party packages can add adapters through
+the "hire.adapters" entry point group, e.g. in pyproject.toml:
 
+    [project.entry-points."hire.adapters"]
+    myagent = "my_package.adapter:MyAgentAdapter"
+"""
 
-def get_adapter(agent: str) -> AgentAdapter:
-    """Get an adapter for the specified agent."""
-    adapters = {
-        "claude": ClaudeAdapter,
-        "codex": CodexAdapter,
-        "gemini": GeminiAdapter,
-        "grok": GrokAdapter,
-    }
-    if agent not in adapters:
-        raise ValueError(f"Unknown agent: {agent}. Available: {list(adapters.keys())}")
-    return adapters[agent]()
+import importlib
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from .base import AgentAdapter
 
-__all__ = ["AgentAdapter", "ClaudeAdapter", "CodexAdapter", "GeminiAdapter", "GrokAdapter", "get_adapter"]
+ENTRY_POINT_GROUP = "hire.adapters"
+
+# Built-in adapters: name -> "module:class" (relative to this package)
+BUILTIN_ADAPTERS = {
+    "claude": ".claude:ClaudeAdapter",
+    "codex": ".codex:CodexAdapter",
+    "gemini": ".gemini:GeminiAdapter",
+    "grok": ".grok:GrokAdapter",
+}
+
+_plugins: dict[str, Any] | None = None
+
+
+def _plugin_adapters() -> dict[str, Any]:
+    """Adapter entry points from installed packages (scanned once)."""
+    global _plugins
+    if _plugins is None:
+        from importlib.metadata import entry_points
+
+        _plugins = {
+            ep.name: ep
+            for ep in entry_points(group=ENTRY_POINT_GROUP)
+            if ep.name not in BUILTIN_ADAPTERS
+        }
+    return _plugins
+
+
+def available_adapters() -> list[str]:
+    """Names of all adapters: built-in ones first, then plugins."""
+    return list(BUILTIN_ADAPTERS) + sorted(_plugin_adapters())
+
+
+def is_adapter(agent: str) -> bool:
+    """Whether an adapter with this name exists (without importing it)."""
+    return agent in BUILTIN_ADAPTERS or agent in _plugin_adapters()
+
+
+def get_adapter_class(agent: str) -> type["AgentAdapter"]:
+    """Import and return the adapter class for an agent."""
+    cls: type[AgentAdapter]
+    if agent in BUILTIN_ADAPTERS:
+        module_name, class_name = BUILTIN_ADAPTERS[agent].split(":")
+        cls = getattr(importlib.import_module(module_name, __name__), class_name)
+        return cls
+    plugin = _plugin_adapters().get(agent)
+    if plugin is None:
+        raise ValueError(f"Unknown agent: {agent}. Available: {available_adapters()}")
+    cls = plugin.load()
+    return cls
+
+
+def get_adapter(agent: str) -> "AgentAdapter":
+    """Get an adapter for the specified agent (in the current cancel scope)."""
+    from .base import cancel_scope
+
+    adapter = get_adapter_class(agent)()
+    scope = cancel_scope.get()
+    if scope is not None:
+        scope.add(adapter)
+    return adapter
+
+
+def __getattr__(name: str) -> Any:
+    # Keep "from hire.adapters import ClaudeAdapter" working without eager imports
+    if name == "AgentAdapter":
+        from .base import AgentAdapter
+
+        return AgentAdapter
+    for agent, target in BUILTIN_ADAPTERS.items():
+        if target.endswith(f":{name}"):
+            return get_adapter_class(agent)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "AgentAdapter",
+    "ClaudeAdapter",
+    "CodexAdapter",
+    "GeminiAdapter",
+    "GrokAdapter",
+    "available_adapters",
+    "get_adapter",
+    "get_adapter_class",
+    "is_adapter",
+]
@@ -1,14 +1,338 @@
 """Base adapter class."""
 
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextvars import ContextVar
 from typing import Any
 
+from ..paths import get_cwd, get_data_dir, get_env
+
+# Stream event types (see AgentAdapter.stream)
+EVENT_TEXT = "text"  # {"type": "text", "text": <delta>}
+EVENT_TOOL = "tool"  # {"type": "tool", "name": <tool/command>, "detail": <str>}
+EVENT_SESSION = "session"  # {"type": "session", "session_id": <CLI session ID>}
+EVENT_USAGE = "usage"  # {"type": "usage", "usage": <make_usage record>}
+EVENT_FINAL = "final"  # {"type": "final", "result": <same dict as ask()>}
+
+# Separates an agent's consecutive messages in one turn (like paragraphs), both
+# in the streamed text and in the final response, so the two stay the same
+MESSAGE_SEPARATOR = "\n\n"
+
+
+COMMANDS_CACHE_FILENAME = "commands.json"
+_COMMANDS_CACHE_MAX_ENTRIES = 64
+
+_resolve_lock = threading.Lock()
+_resolved: dict[str, str] = {}
+
+
+def resolve_command(command: str) -> str:
+    """Resolve a CLI command to its full path (needed for Windows .cmd/.bat files).
+
+    Resolutions are cached in memory and in the data directory, keyed on the
+    command and PATH, so the PATH search runs once rather than on every call.
+    Commands that cannot be found are returned unchanged.
+    """
+    env = get_env()
+    search = env.get("PATH", "") + "\0" + env.get("PATHEXT", "")
+    key = hashlib.sha256(f"{command}\0{search}".encode()).hexdigest()[:32]
+
+    with _resolve_lock:
+        if key in _resolved:
+            return _resolved[key]
+
+        cache_path = get_data_dir() / COMMANDS_CACHE_FILENAME
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                store = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            store = {}
+
+        resolved: str | None = store.get(key)
+        if not (resolved and os.path.isfile(resolved) and os.access(resolved, os.X_OK)):
+            resolved = shutil.which(command, path=env.get("PATH"))
+            if not resolved:
+                return command
+            store.pop(key, None)
+            store[key] = resolved
+            # Keep the most recently added entries
+            store = dict(list(store.items())[-_COMMANDS_CACHE_MAX_ENTRIES:])
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(store, f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+
+        _resolved[key] = resolved
+        return resolved
+
+
+# Agent CLIs get their own process group, so killing one also stops the
+# helper processes it spawned (which would otherwise keep the pipes open)
+_NEW_GROUP = os.name == "posix"
+
+
+# Seconds a timed-out agent gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE = 5
+
+
+def kill_process(proc: subprocess.Popen, grace: float = 0) -> None:
+    """Kill a child process started by this module, with its process group.
+
+    With a grace period, SIGTERM is sent first and SIGKILL follows once the
+    process exits or `grace` seconds pass (whatever is left of its group is
+    killed either way).
+    """
+    if grace:
+        try:
+            if _NEW_GROUP:
+                os.killpg(proc.pid, signal.SIGTERM)
+            else:
+                proc.terminate()
+        except OSError:
+            pass
+        with contextlib.suppress(subprocess.TimeoutExpired):
+            proc.wait(grace)
+    try:
+        if _NEW_GROUP:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass
+
+
+class ProcessTracker:
+    """Child processes of an adapter's running calls, so they can be killed."""
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        # perf_counter() times of the first process start and first output line (for metrics)
+        self.started_at: float | None = None
+        self.first_output_at: float | None = None
+        self._procs: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+        _trackers.add(self)
+
+    def add(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.perf_counter()
+            self._procs.add(proc)
+            if self.cancelled:
+                kill_process(proc)
+
+    def discard(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+
+    def kill_all(self, grace: float = 0) -> None:
+        """Kill running processes, and any started from now on."""
+        with self._lock:
+            self.cancelled = True
+            procs = list(self._procs)
+        for proc in procs:
+            kill_process(proc, grace)
+
+
+_trackers: "weakref.WeakSet[ProcessTracker]" = weakref.WeakSet()
+
+
+def kill_all_processes() -> None:
+    """Kill every running agent process (e.g. on Ctrl-C).
+
+    Agent processes run in their own process groups, so the terminal's
+    SIGINT does not reach them.
+    """
+    for tracker in list(_trackers):
+        tracker.kill_all()
+
+
+class CancelScope:
+    """Adapters created for one request, so they can be cancelled together.
+
+    `hire serve` runs each client request in its own scope (see cancel_scope)
+    and cancels it when the client goes away, e.g. on Ctrl-C.
+    """
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self._adapters: weakref.WeakSet[AgentAdapter] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def add(self, adapter: "AgentAdapter") -> None:
+        with self._lock:
+            if not self.cancelled:
+                self._adapters.add(adapter)
+                return
+        adapter.cancel()
+
+    def cancel(self) -> None:
+        """Cancel the scope's adapters, and any created from now on."""
+        with self._lock:
+            self.cancelled = True
+            adapters = list(self._adapters)
+        for adapter in adapters:
+            adapter.cancel()
+
+
+# Scope of the current request; get_adapter() adds new adapters to it
+cancel_scope: ContextVar[CancelScope | None] = ContextVar("cancel_scope", default=None)
+
+
+def run_process(
+    cmd: list[str],
+    tracker: ProcessTracker | None = None,
+    proc: subprocess.Popen | None = None,
+    input: str | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run a command to completion, capturing its output (like subprocess.run).
+
+    proc is an already started process for cmd (from the warm pool), which
+    is sent input on stdin.
+    """
+    if proc is None:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input is not None else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            cwd=get_cwd(),
+            env=get_env(),
+            start_new_session=_NEW_GROUP,
+        )
+    if tracker:
+        tracker.add(proc)
+    try:
+        stdout, stderr = proc.communicate(input)
+    except BaseException:
+        kill_process(proc)
+        proc.wait()
+        raise
+    finally:
+        if tracker:
+            tracker.discard(proc)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+class ProcessLines:
+    """Run a command and iterate over its stdout lines as they are produced.
+
+    Stderr is collected in the background so the child never blocks on it.
+    After iteration, returncode and stderr are set. As with run_process, proc
+    is an already started process for cmd, which is sent input on stdin.
+    """
+
+    def __init__(
+        self,
+        cmd: list[str],
+        tracker: ProcessTracker | None = None,
+        proc: subprocess.Popen | None = None,
+        input: str | None = None,
+    ):
+        self.cmd = cmd
+        self.tracker = tracker
+        self.proc = proc
+        self.input = input
+        self.returncode: int | None = None
+        self.stderr = ""
+
+    def __iter__(self) -> Iterator[str]:
+        proc = self.proc or subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.DEVNULL if self.input is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            cwd=get_cwd(),
+            env=get_env(),
+            start_new_session=_NEW_GROUP,
+        )
+        if self.tracker:
+            self.tracker.add(proc)
+        if self.input is not None and proc.stdin is not None:
+            try:
+                proc.stdin.write(self.input)
+                proc.stdin.close()
+            except OSError:
+                # Exited early; its returncode and stderr tell why
+                pass
+        # Pipes both here and for warm pool processes
+        stdout, stderr = proc.stdout, proc.stderr
+        assert stdout is not None and stderr is not None
+        stderr_parts: list[str] = []
+        reader = threading.Thread(target=lambda: stderr_parts.append(stderr.read()), daemon=True)
+        reader.start()
+        finished = False
+        try:
+            for line in stdout:
+                if self.tracker and self.tracker.first_output_at is None:
+                    self.tracker.first_output_at = time.perf_counter()
+                yield line
+            finished = True
+        finally:
+            if not finished and proc.poll() is None:
+                # Consumer stopped early: don't leave the agent running
+                kill_process(proc)
+            proc.wait()
+            reader.join()
+            if self.tracker:
+                self.tracker.discard(proc)
+            self.returncode = proc.returncode
+            self.stderr = "".join(stderr_parts)
+
 
 class AgentAdapter(ABC):
     """Abstract base class for agent adapters."""
 
     name: str = "base"
 
+    # Error output of CLI failures worth retrying (rate limits, overload, network)
+    transient_errors = re.compile(
+        r"rate.?limit|too many requests|\b(429|500|502|503|504|529)\b|overloaded"
+        r"|temporarily unavailable|ECONNRESET|ETIMEDOUT|ECONNREFUSED|socket hang up",
+        re.IGNORECASE,
+    )
+
+    def __init__(self) -> None:
+        self.processes = ProcessTracker()
+
+    def cancel(self, grace: float = 0) -> None:
+        """Abort this adapter's running calls from another thread.
+
+        Child processes are killed (after SIGTERM and up to `grace` seconds
+        to exit, if given) and the interrupted ask()/stream() returns an
+        error result. The adapter should not be reused afterwards.
+        """
+        self.processes.kill_all(grace)
+
+    def is_retryable(self, result: dict[str, Any]) -> bool:
+        """Whether a failed result is a transient error worth retrying.
+
+        The default matches the error text against transient_errors.
+        Cancelled calls are never retried.
+        """
+        if self.processes.cancelled:
+            return False
+        return bool(self.transient_errors.search(str(result.get("error") or "")))
+
     @abstractmethod
     def ask(
         self,
@@ -32,6 +356,28 @@ class AgentAdapter(ABC):
         """
         pass
 
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Send a message and yield events as the agent produces output.
+
+        Yields dicts with a "type" key (EVENT_TEXT, EVENT_TOOL, EVENT_SESSION,
+        EVENT_USAGE) and always ends with an EVENT_FINAL event carrying the
+        same result dict ask() would return.
+
+        The default implementation waits for ask() and yields its text at once;
+        adapters that can read incremental output override this.
+        """
+        result = self.ask(message, session_id, model, **kwargs)
+        if result.get("response") and not result.get("error"):
+            yield {"type": EVENT_TEXT, "text": result["response"]}
+        yield {"type": EVENT_FINAL, "result": result}
+
     def build_command(
         self,
         message: str,
@@ -1,12 +1,36 @@
 """Claude CLI adapter."""
 
 import json
-import shutil
-import subprocess
+from collections.abc import Iterator
 from typing import Any
 
 from ..config import get_adapter_config
-from .base import AgentAdapter
+from ..usage import make_usage
+from .base import (
+    EVENT_FINAL,
+    EVENT_SESSION,
+    EVENT_TEXT,
+    EVENT_TOOL,
+    EVENT_USAGE,
+    MESSAGE_SEPARATOR,
+    AgentAdapter,
+    ProcessLines,
+    resolve_command,
+)
+from .pool import take_process
+
+
+def _usage(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Usage record from a Claude result (JSON output or stream-json result event)."""
+    usage = data.get("usage") or {}
+    if not usage and data.get("total_cost_usd") is None:
+        return None
+    cached = usage.get("cache_read_input_tokens") or 0
+    # Claude counts cache reads and writes separately from input_tokens
+    input_tokens = ((usage.get("input_tokens") or 0) + cached
+                    + (usage.get("cache_creation_input_tokens") or 0))
+    return make_usage(input_tokens, usage.get("output_tokens"), cached,
+                      data.get("total_cost_usd"))
 
 
 class ClaudeAdapter(AgentAdapter):
@@ -19,17 +43,19 @@ class ClaudeAdapter(AgentAdapter):
         message: str,
         session_id: str | None = None,
         model: str | None = None,
+        output_format: str = "json",
     ) -> list[str]:
         """Build the claude command."""
         config = get_adapter_config("claude")
         command = config.get("command", "claude")
         # Resolve full path for Windows .cmd/.bat files
-        resolved = shutil.which(command)
-        if resolved:
-            command = resolved
+        command = resolve_command(command)
         args = config.get("args", [])
 
-        cmd = [command, "-p", message, "--output-format", "json"]
+        cmd = [command, "-p", message, "--output-format", output_format]
+        if output_format == "stream-json":
+            # stream-json requires --verbose in print mode
+            cmd.append("--verbose")
         cmd.extend(args)
 
         if session_id:
@@ -40,41 +66,103 @@ class ClaudeAdapter(AgentAdapter):
 
         return cmd
 
+    def build_pool_command(self, model: str | None = None) -> list[str]:
+        """Build the command for a warm pool process, which reads its prompt as stream-json."""
+        config = get_adapter_config("claude")
+        command = resolve_command(config.get("command", "claude"))
+        cmd = [command, "-p", "--input-format", "stream-json",
+               "--output-format", "stream-json", "--verbose"]
+        cmd.extend(config.get("args", []))
+        if model:
+            cmd.extend(["--model", model])
+        return cmd
+
     def ask(
         self,
         message: str,
         session_id: str | None = None,
         model: str | None = None,
     ) -> dict[str, Any]:
-        """Send a message to Claude and get a response."""
-        cmd = self.build_command(message, session_id, model)
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
-
-        if result.returncode != 0:
-            return {
+        """Send a message to Claude and get a response.
+
+        Runs the stream-json output through stream(): the JSON output format
+        only has the turn's last message, while the response (like the
+        streamed text) has all of them.
+        """
+        result: dict[str, Any] = {"response": None, "session_id": session_id,
+                                  "error": "No result from agent", "raw": ""}
+        for event in self.stream(message, session_id, model):
+            if event["type"] == EVENT_FINAL:
+                result = event["result"]
+        return result
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream Claude's output using --output-format stream-json."""
+        pool_cmd = self.build_pool_command(model)
+        warm = None if session_id else take_process(self.name, pool_cmd)
+        if warm:
+            user_message = {"type": "user", "message": {"role": "user", "content": message}}
+            proc = ProcessLines(pool_cmd, self.processes, proc=warm,
+                                input=json.dumps(user_message, ensure_ascii=False) + "\n")
+        else:
+            cmd = self.build_command(message, session_id, model, output_format="stream-json")
+            proc = ProcessLines(cmd, self.processes)
+
+        new_session_id = session_id
+        result_data: dict[str, Any] | None = None
+        response_text = ""
+        raw_lines: list[str] = []
+
+        for line in proc:
+            raw_lines.append(line)
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            event_type = event.get("type")
+
+            if event.get("session_id") and event.get("session_id") != new_session_id:
+                new_session_id = event["session_id"]
+                yield {"type": EVENT_SESSION, "session_id": new_session_id}
+
+            if event_type == "assistant":
+                for block in event.get("message", {}).get("content", []):
+                    if block.get("type") == "text" and block.get("text"):
+                        # Streamed text adds up to the final response
+                        text = (MESSAGE_SEPARATOR if response_text else "") + block["text"]
+                        yield {"type": EVENT_TEXT, "text": text}
+                        response_text += text
+                    elif block.get("type") == "tool_use":
+                        yield {
+                            "type": EVENT_TOOL,
+                            "name": block.get("name", ""),
+                            "detail": json.dumps(block.get("input", {}), ensure_ascii=False),
+                        }
+            elif event_type == "result":
+                result_data = event
+                usage = _usage(event)
+                if usage:
+                    yield {"type": EVENT_USAGE, "usage": usage}
+
+        raw = "".join(raw_lines)
+        if proc.returncode != 0 or (result_data and result_data.get("is_error")):
+            yield {"type": EVENT_FINAL, "result": {
                 "response": None,
                 "session_id": session_id,
-                "error": result.stderr or "Command failed",
-                "raw": result.stdout,
-            }
-
-        try:
-            data = json.loads(result.stdout)
-            return {
-                "response": data.get("result", ""),
-                "session_id": data.get("session_id", session_id),
-                "raw": data,
-            }
-        except json.JSONDecodeError:
-            # If not JSON, return raw output
-            return {
-                "response": result.stdout,
-                "session_id": session_id,
-                "raw": result.stdout,
-            }
+                "error": proc.stderr or (result_data or {}).get("result") or "Command failed",
+                "raw": raw,
+            }}
+            return
+
+        yield {"type": EVENT_FINAL, "result": {
+            "response": response_text or (result_data or {}).get("result", ""),
+            "session_id": new_session_id,
+            "usage": _usage(result_data or {}),
+            "raw": result_data or raw,
+        }}
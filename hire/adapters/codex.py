@@ -1,12 +1,29 @@
 """Codex CLI adapter."""
 
 import json
-import shutil
-import subprocess
+from collections.abc import Iterator
 from typing import Any
 
 from ..config import get_adapter_config
-from .base import AgentAdapter
+from ..usage import add_usage, make_usage
+from .base import (
+    EVENT_FINAL,
+    EVENT_SESSION,
+    EVENT_TEXT,
+    EVENT_TOOL,
+    EVENT_USAGE,
+    MESSAGE_SEPARATOR,
+    AgentAdapter,
+    ProcessLines,
+    resolve_command,
+    run_process,
+)
+
+
+def _usage(usage: dict[str, Any]) -> dict[str, Any]:
+    """Usage record from a turn.completed event's usage."""
+    return make_usage(usage.get("input_tokens"), usage.get("output_tokens"),
+                      usage.get("cached_input_tokens"))
 
 
 class CodexAdapter(AgentAdapter):
@@ -24,9 +41,7 @@ class CodexAdapter(AgentAdapter):
         config = get_adapter_config("codex")
         command = config.get("command", "codex")
         # Resolve full path for Windows .cmd/.bat files
-        resolved = shutil.which(command)
-        if resolved:
-            command = resolved
+        command = resolve_command(command)
         args = config.get("args", [])
 
         # Build command: flags must come before subcommand (resume)
@@ -55,12 +70,7 @@ class CodexAdapter(AgentAdapter):
         """Send a message to Codex and get a response."""
         cmd = self.build_command(message, session_id, model)
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
+        result = run_process(cmd, self.processes)
 
         if result.returncode != 0:
             return {
@@ -71,10 +81,11 @@ class CodexAdapter(AgentAdapter):
             }
 
         # Codex outputs JSONL (one JSON object per line)
-        # Parse all lines and extract the final response
+        # Parse all lines and collect the agent messages
         lines = result.stdout.strip().split("\n")
-        response_text = ""
+        messages: list[str] = []
         new_session_id = session_id
+        usage = None
 
         for line in lines:
             if not line.strip():
@@ -90,18 +101,87 @@ class CodexAdapter(AgentAdapter):
                 # Get response text from item.completed with agent_message
                 if event_type == "item.completed":
                     item = event.get("item", {})
-                    if item.get("type") == "agent_message":
-                        response_text = item.get("text", "")
+                    if item.get("type") == "agent_message" and item.get("text"):
+                        messages.append(item["text"])
+
+                # Usage is reported per turn
+                if event_type == "turn.completed" and event.get("usage"):
+                    usage = add_usage(usage, _usage(event["usage"]))
 
             except json.JSONDecodeError:
                 continue
 
         # If no structured response found, use raw output
-        if not response_text:
-            response_text = result.stdout.strip()
+        response_text = MESSAGE_SEPARATOR.join(messages) or result.stdout.strip()
 
         return {
             "response": response_text,
             "session_id": new_session_id,
+            "usage": usage,
             "raw": result.stdout,
         }
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream Codex's JSONL events as they are printed."""
+        cmd = self.build_command(message, session_id, model)
+
+        response_text = ""
+        new_session_id = session_id
+        usage = None
+        raw_lines: list[str] = []
+
+        proc = ProcessLines(cmd, self.processes)
+        for line in proc:
+            raw_lines.append(line)
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            event_type = event.get("type", "")
+
+            if event_type == "thread.started":
+                new_session_id = event.get("thread_id", new_session_id)
+                yield {"type": EVENT_SESSION, "session_id": new_session_id}
+            elif event_type == "item.completed":
+                item = event.get("item", {})
+                if item.get("type") == "agent_message":
+                    text = item.get("text", "")
+                    if text:
+                        # Streamed text adds up to the final response
+                        separator = MESSAGE_SEPARATOR if response_text else ""
+                        yield {"type": EVENT_TEXT, "text": separator + text}
+                        response_text += separator + text
+                elif item.get("type") == "command_execution":
+                    yield {"type": EVENT_TOOL, "name": "command", "detail": item.get("command", "")}
+                elif item.get("type"):
+                    yield {"type": EVENT_TOOL, "name": item["type"], "detail": ""}
+            elif event_type == "turn.completed" and event.get("usage"):
+                turn_usage = _usage(event["usage"])
+                usage = add_usage(usage, turn_usage)
+                yield {"type": EVENT_USAGE, "usage": turn_usage}
+
+        raw = "".join(raw_lines)
+        result: dict[str, Any]
+        if proc.returncode != 0:
+            result = {
+                "response": None,
+                "session_id": session_id,
+                "error": proc.stderr or "Command failed",
+                "raw": raw,
+            }
+        else:
+            result = {
+                "response": response_text or raw.strip(),
+                "session_id": new_session_id,
+                "usage": usage,
+                "raw": raw,
+            }
+        yield {"type": EVENT_FINAL, "result": result}
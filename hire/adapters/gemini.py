@@ -1,12 +1,26 @@
 """Gemini CLI adapter."""
 
 import json
-import shutil
-import subprocess
 from typing import Any
 
 from ..config import get_adapter_config
-from .base import AgentAdapter
+from ..usage import add_usage, make_usage
+from .base import AgentAdapter, resolve_command, run_process
+from .pool import take_process
+
+
+def _usage(data: dict[str, Any]) -> dict[str, Any] | None:
+    """Usage record from the stats in Gemini's JSON output (summed over models)."""
+    usage = None
+    models = (data.get("stats") or {}).get("models") or {}
+    for model_stats in models.values():
+        tokens = (model_stats or {}).get("tokens") or {}
+        usage = add_usage(usage, make_usage(
+            tokens.get("prompt"),
+            (tokens.get("candidates") or 0) + (tokens.get("thoughts") or 0),
+            tokens.get("cached"),
+        ))
+    return usage
 
 
 class GeminiAdapter(AgentAdapter):
@@ -24,9 +38,7 @@ class GeminiAdapter(AgentAdapter):
         config = get_adapter_config("gemini")
         command = config.get("command", "gemini")
         # Resolve full path for Windows .cmd/.bat files
-        resolved = shutil.which(command)
-        if resolved:
-            command = resolved
+        command = resolve_command(command)
         args = config.get("args", [])
 
         # gemini -p "message" -o json -y
@@ -42,6 +54,16 @@ class GeminiAdapter(AgentAdapter):
 
         return cmd
 
+    def build_pool_command(self, model: str | None = None) -> list[str]:
+        """Build the command for a warm pool process, which reads its prompt from stdin."""
+        config = get_adapter_config("gemini")
+        command = resolve_command(config.get("command", "gemini"))
+        cmd = [command, "-o", "json"]
+        cmd.extend(config.get("args", []))
+        if model:
+            cmd.extend(["-m", model])
+        return cmd
+
     def ask(
         self,
         message: str,
@@ -49,14 +71,13 @@ class GeminiAdapter(AgentAdapter):
         model: str | None = None,
     ) -> dict[str, Any]:
         """Send a message to Gemini and get a response."""
-        cmd = self.build_command(message, session_id, model)
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-        )
+        pool_cmd = self.build_pool_command(model)
+        warm = None if session_id else take_process(self.name, pool_cmd)
+        if warm:
+            result = run_process(pool_cmd, self.processes, proc=warm, input=message)
+        else:
+            cmd = self.build_command(message, session_id, model)
+            result = run_process(cmd, self.processes)
 
         if result.returncode != 0:
             return {
@@ -79,6 +100,7 @@ class GeminiAdapter(AgentAdapter):
             return {
                 "response": response_text,
                 "session_id": new_session_id,
+                "usage": _usage(data),
                 "raw": data,
             }
         except json.JSONDecodeError:
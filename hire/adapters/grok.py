@@ -1,70 +1,338 @@
 """Grok API adapter (direct xAI API call, no CLI dependency)."""
 
+import contextvars
 import json
 import os
+import queue
 import sys
-import urllib.request
-import urllib.error
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 from ..config import get_adapter_config
-from .base import AgentAdapter
+from ..context import estimate_tokens, fit_history, message_bytes, message_tokens, to_api_message
+from ..httpclient import TRANSPORT_ERRORS, AbortSignal, HTTPError, get_pool
+from ..paths import get_env
+from ..retry import parse_retry_after
+from ..uploads import cache_upload, file_digest, get_cached_upload, invalidate_upload
+from ..usage import make_usage
+from .base import EVENT_FINAL, EVENT_TEXT, EVENT_USAGE, AgentAdapter
 
 DEFAULT_BASE_URL = "https://api.x.ai/v1"
 DEFAULT_MODEL = "grok-4-latest"
+# HTTP statuses worth retrying (rate limits, overload and gateway errors)
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+DEFAULT_UPLOAD_WORKERS = 4
 
 
-def _get_api_key() -> str | None:
+def _get_api_key(config: dict[str, Any] | None = None) -> str | None:
     """Get Grok API key from hire config or environment variable."""
-    config = get_adapter_config("grok")
+    if config is None:
+        config = get_adapter_config("grok")
     key = config.get("api_key")
     if key:
         return key
 
-    return os.environ.get("GROK_API_KEY")
+    return get_env().get("GROK_API_KEY")
 
 
-def _upload_file(api_key: str, file_path: str, base_url: str) -> str:
-    """Upload a file to xAI Files API.
+def _multipart_body(
+    file_path: str, boundary: str
+) -> tuple[Callable[[], Iterator[bytes]], int]:
+    """Stream a multipart/form-data body for a file upload.
+
+    The file is read in chunks as the body is consumed, so memory use does
+    not depend on the file size.
 
     Returns:
-        The file ID for use in Responses API.
+        (callable producing the body chunks, total body length for Content-Length)
     """
     filename = os.path.basename(file_path)
-    with open(file_path, "rb") as f:
-        file_data = f.read()
+    head = (
+        # File field
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    tail = (
+        "\r\n"
+        # Purpose field
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="purpose"\r\n\r\n'
+        "assistants\r\n"
+        # End
+        f"--{boundary}--\r\n"
+    ).encode()
+    file_size = os.path.getsize(file_path)
+
+    def chunks() -> Iterator[bytes]:
+        yield head
+        with open(file_path, "rb") as f:
+            while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
+        yield tail
+
+    return chunks, len(head) + file_size + len(tail)
+
 
+def _upload_file(
+    api_key: str, file_path: str, base_url: str, abort: AbortSignal | None = None
+) -> str:
+    """Upload a file to xAI Files API.
+
+    Returns:
+        The file ID for use in Responses API.
+
+    Raises:
+        ValueError: If the response is not JSON with a file ID.
+    """
     # Build multipart/form-data manually (no external deps)
     boundary = f"----hire-ai-{os.urandom(16).hex()}"
+    body, length = _multipart_body(file_path, boundary)
 
-    body = b""
-    # File field
-    body += f"--{boundary}\r\n".encode()
-    body += f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode()
-    body += b"Content-Type: application/octet-stream\r\n\r\n"
-    body += file_data
-    body += b"\r\n"
-    # Purpose field
-    body += f"--{boundary}\r\n".encode()
-    body += b'Content-Disposition: form-data; name="purpose"\r\n\r\n'
-    body += b"assistants\r\n"
-    # End
-    body += f"--{boundary}--\r\n".encode()
-
-    req = urllib.request.Request(
+    resp = get_pool().request(
+        "POST",
         f"{base_url}/files",
-        data=body,
+        body=body,
         headers={
             "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(length),
             "Authorization": f"Bearer {api_key}",
             "User-Agent": "hire-ai",
         },
+        abort=abort,
     )
+    data = resp.json()
+    if not isinstance(data, dict) or not data.get("id"):
+        raise ValueError(f"unexpected response: {json.dumps(data)[:200]}")
+    return data["id"]
 
-    with urllib.request.urlopen(req) as resp:
-        data = json.loads(resp.read().decode("utf-8"))
 
-    return data["id"]
+class _UploadError(Exception):
+    """A file attachment could not be uploaded.
+
+    Carries the HTTP status and Retry-After of the failed upload, or whether
+    it was a connection error, so it is retried like a failed /responses call.
+    """
+
+    def __init__(self, message: str, cause: BaseException | None = None):
+        super().__init__(message)
+        self.fields: dict[str, Any] = {}
+        if isinstance(cause, HTTPError):
+            self.fields = {
+                "status": cause.code,
+                "retry_after": parse_retry_after(cause.headers.get("retry-after")),
+            }
+        elif isinstance(cause, TRANSPORT_ERRORS):
+            self.fields = {"transient": True}
+
+    def result(self) -> dict[str, Any]:
+        """Error result for ask()."""
+        return {"response": None, "session_id": None, "error": str(self), **self.fields,
+                "raw": ""}
+
+
+def _upload_files(
+    api_key: str,
+    files: list[str],
+    base_url: str,
+    config: dict[str, Any],
+    abort: AbortSignal | None = None,
+) -> tuple[list[str], list[str]]:
+    """Upload attachments, reusing cached file IDs for unchanged content.
+
+    Uploads run concurrently on a bounded pool (adapters.grok.upload_workers).
+    The first failure cancels the queued uploads and aborts those in flight.
+
+    Returns:
+        (file_ids in input order, the subset that came from the cache)
+
+    Raises:
+        _UploadError: If any upload fails.
+    """
+    cache_config = config.get("upload_cache") or {}
+    use_cache = cache_config.get("enabled", True)
+    ttl = cache_config.get("ttl")
+    max_entries = cache_config.get("max_entries")
+
+    file_ids: list[str | None] = [None] * len(files)
+    cached_ids: list[str] = []
+    digests: list[str | None] = [None] * len(files)
+    pending: list[int] = []
+
+    for i, file_path in enumerate(files):
+        try:
+            digests[i] = file_digest(file_path) if use_cache else None
+        except OSError as e:
+            raise _UploadError(f"File upload failed for {file_path}: {e}") from e
+        file_id = None
+        digest = digests[i]
+        if digest:
+            file_id = get_cached_upload(digest, base_url, ttl)
+        if file_id:
+            file_ids[i] = file_id
+            cached_ids.append(file_id)
+        else:
+            pending.append(i)
+
+    if pending:
+        workers = max(1, min(len(pending), config.get("upload_workers", DEFAULT_UPLOAD_WORKERS)))
+        names = ", ".join(os.path.basename(files[i]) for i in pending)
+        print(f"Uploading {len(pending)} file(s): {names}", file=sys.stderr)
+
+        # Aborted on the first failure, or with the whole request
+        uploads = abort.child() if abort else AbortSignal()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {
+            executor.submit(_upload_file, api_key, files[i], base_url, uploads): i
+            for i in pending
+        }
+        done = 0
+        try:
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    file_id = future.result()
+                except (HTTPError, ValueError, *TRANSPORT_ERRORS) as e:
+                    uploads.abort()
+                    raise _UploadError(f"File upload failed for {files[i]}: {e}", e) from e
+                file_ids[i] = file_id
+                done += 1
+                print(f"  [{done}/{len(pending)}] {os.path.basename(files[i])}", file=sys.stderr)
+                digest = digests[i]
+                if digest:
+                    cache_upload(
+                        digest, base_url, file_id, os.path.getsize(files[i]), max_entries
+                    )
+        finally:
+            # Fail fast: drop queued uploads instead of waiting for them
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return [fid for fid in file_ids if fid], cached_ids
+
+
+def _build_turn(message: str, file_ids: list[str]) -> dict[str, Any]:
+    """Build the user turn, referencing uploaded files if any."""
+    if not file_ids:
+        return {"role": "user", "content": message}
+    # Use structured content array with file references
+    content: list[dict[str, str]] = [{"type": "input_text", "text": message}]
+    for fid in file_ids:
+        content.append({"type": "input_file", "file_id": fid})
+    return {"role": "user", "content": content}
+
+
+def _post_json(
+    url: str, payload: dict[str, Any], api_key: str, abort: AbortSignal | None = None
+) -> dict[str, Any]:
+    """POST a JSON payload to the xAI API and decode the JSON response."""
+    resp = get_pool().request(
+        "POST",
+        url,
+        body=json.dumps(payload).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+            "User-Agent": "hire-ai",
+        },
+        abort=abort,
+    )
+    data: dict[str, Any] = resp.json()
+    return data
+
+
+class _StreamError(Exception):
+    """The API reported an error inside an event stream."""
+
+
+def _sse_data(lines: Iterable[bytes]) -> Iterator[str]:
+    """Data payloads of the server-sent events in a stream of lines.
+
+    An event ends at a blank line, or at the end of the stream.
+    """
+    data_lines: list[str] = []
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+        elif not line and data_lines:
+            yield "\n".join(data_lines)
+            data_lines = []
+        # "event:"/"id:"/comment lines are ignored; the type is also in the data payload
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
+def _stream_responses(
+    url: str,
+    payload: dict[str, Any],
+    api_key: str,
+    on_text: Callable[[str], None],
+    abort: AbortSignal | None = None,
+) -> dict[str, Any]:
+    """POST a streaming Responses API request and consume its server-sent events.
+
+    Text deltas are passed to on_text as they arrive.
+
+    Returns:
+        The final response object (from the response.completed event).
+    """
+    resp = get_pool().request(
+        "POST",
+        url,
+        body=json.dumps({**payload, "stream": True}).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "Authorization": f"Bearer {api_key}",
+            "User-Agent": "hire-ai",
+        },
+        abort=abort,
+    )
+
+    final: dict[str, Any] | None = None
+    text = ""
+    for data in _sse_data(resp.iter_lines()):
+        if data == "[DONE]":
+            break
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue  # Malformed event; the completion event carries the full text
+        if not isinstance(event, dict):
+            continue
+        event_type = event.get("type", "")
+        if event_type == "response.output_text.delta":
+            delta = event.get("delta", "")
+            text += delta
+            on_text(delta)
+        elif event_type == "response.completed":
+            final = event.get("response") or {}
+        elif event_type in ("response.failed", "error"):
+            error = event.get("error") or (event.get("response") or {}).get("error") or event
+            raise _StreamError(json.dumps(error, ensure_ascii=False))
+    resp.close()
+
+    if final is None:
+        # Stream ended without a completion event; keep what was received
+        final = {"output": [{"type": "message", "content": [
+            {"type": "output_text", "text": text},
+        ]}]}
+    return final
+
+
+def _extract_text(data: dict[str, Any]) -> str:
+    """Extract the response text from Responses API output items."""
+    text = ""
+    for item in data.get("output", []):
+        if item.get("type") == "message":
+            for part in item.get("content", []):
+                if part.get("type") == "output_text":
+                    text += part.get("text", "")
+    return text
 
 
 class GrokAdapter(AgentAdapter):
@@ -72,16 +340,48 @@ class GrokAdapter(AgentAdapter):
 
     name = "grok"
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.abort_signal = AbortSignal()
+
+    def cancel(self, grace: float = 0) -> None:
+        """Abort in-flight API requests (and uploads) from another thread."""
+        self.abort_signal.abort()
+
+    def is_retryable(self, result: dict[str, Any]) -> bool:
+        """Retry retryable HTTP statuses and connection errors (not aborts)."""
+        if self.abort_signal.aborted:
+            return False
+        if result.get("status"):
+            return result["status"] in RETRYABLE_STATUSES
+        return bool(result.get("transient"))
+
     def ask(
         self,
         message: str,
         session_id: str | None = None,
         model: str | None = None,
-        history: list[dict[str, str]] | None = None,
+        history: list[dict[str, Any]] | None = None,
         files: list[str] | None = None,
+        context_tokens: int | None = None,
+        on_text: Callable[[str], None] | None = None,
     ) -> dict[str, Any]:
-        """Send a message to Grok via xAI Responses API."""
-        api_key = _get_api_key()
+        """Send a message to Grok via xAI Responses API.
+
+        With a session_id (the previous response ID), only the new turn is
+        sent and the server-side conversation state is reused. If the stored
+        response is gone, the local history is replayed instead.
+
+        Replayed history is trimmed to the adapter's context_budget; the
+        result's "elided" key reports how many messages were left out.
+        context_tokens is the size of the server-side conversation so far.
+
+        With on_text, the response is streamed (server-sent events) and each
+        text delta is passed to on_text as it arrives; the result still
+        carries the full text. result["timings"] has time to first token.
+        """
+        config = get_adapter_config("grok")
+        api_key = _get_api_key(config)
         if not api_key:
             return {
                 "response": None,
@@ -90,89 +390,191 @@ class GrokAdapter(AgentAdapter):
                 "raw": "",
             }
 
-        config = get_adapter_config("grok")
         base_url = config.get("base_url", DEFAULT_BASE_URL)
         model = model or config.get("model", DEFAULT_MODEL)
 
-        # Upload files if provided
-        file_ids: list[str] = []
-        if files:
-            for file_path in files:
-                try:
-                    print(f"Uploading {os.path.basename(file_path)}...", file=sys.stderr)
-                    file_id = _upload_file(api_key, file_path, base_url)
-                    file_ids.append(file_id)
-                except (urllib.error.HTTPError, urllib.error.URLError, OSError) as e:
-                    return {
-                        "response": None,
-                        "session_id": None,
-                        "error": f"File upload failed for {file_path}: {e}",
-                        "raw": "",
-                    }
-
-        # Build input: history + new message
-        messages = list(history) if history else []
-
-        if file_ids:
-            # Use structured content array with file references
-            content: list[dict[str, str]] = [{"type": "input_text", "text": message}]
-            for fid in file_ids:
-                content.append({"type": "input_file", "file_id": fid})
-            messages.append({"role": "user", "content": content})
-        else:
-            messages.append({"role": "user", "content": message})
+        # Upload files if provided (unchanged files reuse cached file IDs)
+        try:
+            file_ids, cached_ids = _upload_files(
+                api_key, files or [], base_url, config, abort=self.abort_signal
+            )
+        except _UploadError as e:
+            return e.result()
 
-        payload = {
+        payload: dict[str, Any] = {
             "model": model,
-            "input": messages,
             "tools": [
                 {"type": "web_search"},
                 {"type": "x_search"},
             ],
+            "store": True,
         }
 
-        req = urllib.request.Request(
-            f"{base_url}/responses",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-                "User-Agent": "hire-ai",
-            },
-        )
+        # Context budget for replayed history (tokens and/or request bytes)
+        budget = config.get("context_budget") or {}
+        max_tokens = budget.get("tokens")
+        max_bytes = budget.get("bytes")
+        elided: int | None = None
+        replayed_tokens = 0
 
-        try:
-            with urllib.request.urlopen(req) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
+        start = time.perf_counter()
+        first_token: float | None = None
+
+        def on_delta(delta: str) -> None:
+            nonlocal first_token
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            if on_text:
+                on_text(delta)
+
+        def post(body: dict[str, Any]) -> dict[str, Any]:
+            if on_text:
+                return _stream_responses(
+                    f"{base_url}/responses", body, api_key, on_delta, self.abort_signal
+                )
+            return _post_json(f"{base_url}/responses", body, api_key, self.abort_signal)
+
+        def send(turn: dict[str, Any]) -> dict[str, Any]:
+            nonlocal elided, replayed_tokens
+            turn_tokens = message_tokens(turn)
+
+            def replay_input() -> list[dict[str, Any]]:
+                nonlocal elided, replayed_tokens
+                kept, elided = fit_history(
+                    history or [], max_tokens, max_bytes, turn_tokens, message_bytes(turn)
+                )
+                replayed_tokens = sum(message_tokens(m) for m in kept)
+                if elided:
+                    print(f"Context budget exceeded, eliding {elided} oldest message(s)",
+                          file=sys.stderr)
+                return [*(to_api_message(m) for m in kept), turn]
+
+            # Chain onto the stored previous response so only the new turn is sent.
+            # "unknown" is the placeholder used by sessions created before chaining.
+            previous_id = session_id if session_id and session_id != "unknown" else None
 
-            # Responses API: extract text from output items
-            response_text = ""
-            for item in data.get("output", []):
-                if item.get("type") == "message":
-                    for part in item.get("content", []):
-                        if part.get("type") == "output_text":
-                            response_text += part.get("text", "")
+            # Once the server-side context outgrows the token budget, start a new
+            # chain from the trimmed local history instead
+            if previous_id and max_tokens and (context_tokens or 0) + turn_tokens > max_tokens:
+                previous_id = None
 
+            if not previous_id:
+                return post({**payload, "input": replay_input()})
+            try:
+                return post({**payload, "input": [turn], "previous_response_id": previous_id})
+            except HTTPError as e:
+                if e.code not in (400, 404):
+                    raise
+                # Stored response expired or unknown: replay the history
+                print("Previous response expired, resending history...", file=sys.stderr)
+                return post({**payload, "input": replay_input()})
+
+        try:
+            turn = _build_turn(message, file_ids)
+            try:
+                data = send(turn)
+            except HTTPError as e:
+                # A cached file ID deleted server-side: the error names the rejected ID
+                error_body = e.body.decode("utf-8", errors="replace")
+                stale = [fid for fid in cached_ids if fid in error_body]
+                if e.code not in (400, 404) or not stale:
+                    raise
+                print("Cached file upload rejected, re-uploading...", file=sys.stderr)
+                for fid in stale:
+                    invalidate_upload(fid)
+                # Only the files whose IDs were rejected are uploaded again
+                try:
+                    file_ids, _ = _upload_files(
+                        api_key, files or [], base_url, config, abort=self.abort_signal
+                    )
+                except _UploadError as upload_error:
+                    return upload_error.result()
+                turn = _build_turn(message, file_ids)
+                data = send(turn)
+
+            response_text = _extract_text(data)
             if not response_text:
                 response_text = json.dumps(data, ensure_ascii=False)
 
-            return {
+            # Size of the server-side conversation this response ends
+            usage = data.get("usage") or {}
+            if usage.get("input_tokens") is not None:
+                new_context = usage["input_tokens"] + usage.get("output_tokens", 0)
+            else:
+                sent = (context_tokens or 0) if elided is None else replayed_tokens
+                new_context = sent + message_tokens(turn) + estimate_tokens(response_text)
+
+            total = time.perf_counter() - start
+            result: dict[str, Any] = {
                 "response": response_text,
-                "session_id": None,
+                "session_id": data.get("id"),
+                "usage": make_usage(
+                    usage.get("input_tokens"), usage.get("output_tokens"),
+                    (usage.get("input_tokens_details") or {}).get("cached_tokens"),
+                ) if usage else None,
+                "context_tokens": new_context,
+                "timings": {
+                    "first_token": first_token if first_token is not None else total,
+                    "total": total,
+                },
                 "raw": data,
             }
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8", errors="replace")
+            if elided is not None:
+                result["elided"] = elided
+            return result
+        except HTTPError as e:
+            error_body = e.body.decode("utf-8", errors="replace")
             return {
                 "response": None,
                 "session_id": None,
                 "error": f"Grok API error: {e.code} {error_body}",
+                "status": e.code,
+                "retry_after": parse_retry_after(e.headers.get("retry-after")),
                 "raw": error_body,
             }
-        except urllib.error.URLError as e:
+        except _StreamError as e:
             return {
                 "response": None,
                 "session_id": None,
-                "error": f"Connection error: {e.reason}",
+                "error": f"Grok API error: {e}",
                 "raw": "",
             }
+        except TRANSPORT_ERRORS as e:
+            return {
+                "response": None,
+                "session_id": None,
+                "error": f"Connection error: {e}",
+                "transient": True,
+                "raw": "",
+            }
+
+    def stream(
+        self,
+        message: str,
+        session_id: str | None = None,
+        model: str | None = None,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream the response, yielding text deltas as they arrive over SSE."""
+        events: queue.Queue[dict[str, Any]] = queue.Queue()
+
+        def run() -> None:
+            try:
+                result = self.ask(
+                    message, session_id, model,
+                    on_text=lambda delta: events.put({"type": EVENT_TEXT, "text": delta}),
+                    **kwargs,
+                )
+            except Exception as e:
+                result = {"response": None, "session_id": None, "error": str(e), "raw": ""}
+            events.put({"type": EVENT_FINAL, "result": result})
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,), daemon=True).start()
+        while True:
+            event = events.get()
+            if event["type"] == EVENT_FINAL:
+                if event["result"].get("usage"):
+                    yield {"type": EVENT_USAGE, "usage": event["result"]["usage"]}
+                yield event
+                return
+            yield event
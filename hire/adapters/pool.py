@@ -0,0 +1,216 @@
+"""Warm pool of pre-started agent CLI processes (opt-in).
+
+Agent CLIs spend seconds starting up (Node.js, auth checks) before any model
+work begins. In long-lived hire processes (`hire serve`, `hire batch`),
+adapters with a "pool" config keep processes started ahead of time, waiting
+for their prompt on stdin. A fresh conversation takes one, and a
+replacement is started in the background:
+
+    "adapters": {"claude": {"pool": {"size": 2, "idle_timeout": 600, "max_memory_mb": 2048}}}
+
+Processes are keyed on their exact command (which includes the model),
+working directory and environment, so a request never gets a process
+started for another model, config, project or `hire serve` client.
+"""
+
+import atexit
+import contextlib
+import os
+import subprocess
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from ..config import get_adapter_config
+from ..paths import get_cwd, get_env
+from .base import _NEW_GROUP, kill_process
+
+DEFAULT_IDLE_TIMEOUT = 600
+DEFAULT_MAX_MEMORY_MB = 2048
+_REAP_INTERVAL = 5
+
+_enabled = False
+_pool: "WarmPool | None" = None
+_pool_lock = threading.Lock()
+
+# (command, cwd, environment) of interchangeable processes
+_Key = tuple[tuple[str, ...], str, frozenset[tuple[str, str]]]
+
+
+def enable_pool() -> None:
+    """Allow pooling in this process (only worth it for long-lived processes)."""
+    global _enabled
+    _enabled = True
+
+
+def get_pool_settings(agent: str) -> dict[str, Any] | None:
+    """Pool settings for an agent, or None if it is not pooled."""
+    if not _enabled:
+        return None
+    config = get_adapter_config(agent).get("pool") or {}
+    size = int(config.get("size", 0))
+    if size <= 0:
+        return None
+    return {
+        "size": size,
+        "idle_timeout": float(config.get("idle_timeout", DEFAULT_IDLE_TIMEOUT)),
+        "max_memory": int(config.get("max_memory_mb", DEFAULT_MAX_MEMORY_MB)) * 1024 * 1024,
+    }
+
+
+def take_process(agent: str, cmd: list[str]) -> subprocess.Popen | None:
+    """Get a started process for cmd: a warm one if available, else a new one.
+
+    The process waits for its input on stdin. Returns None if the agent is
+    not pooled (the caller then runs its usual one-shot command).
+    """
+    global _pool
+    settings = get_pool_settings(agent)
+    if not settings:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmPool()
+            atexit.register(_pool.close)
+    return _pool.take(cmd, get_cwd(), get_env(), settings)
+
+
+def _rss(pid: int) -> int:
+    """Resident memory of a process in bytes (0 where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _spawn(cmd: list[str], cwd: str, env: Mapping[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        bufsize=1,
+        cwd=cwd,
+        env=env,
+        start_new_session=_NEW_GROUP,
+    )
+
+
+class WarmPool:
+    """Idle started processes per (command, cwd, environment), refilled in the background.
+
+    A reaper thread kills processes idle longer than idle_timeout (the pool
+    is refilled on the next request) and the oldest ones while the pool's
+    total resident memory is over max_memory.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key -> [(process, started at)], oldest first
+        self._idle: dict[_Key, list[tuple[subprocess.Popen, float]]] = {}
+        self._starting: dict[_Key, int] = {}
+        self._settings: dict[_Key, dict[str, Any]] = {}
+        self._closed = threading.Event()
+        self._reaper: threading.Thread | None = None
+
+    def take(
+        self, cmd: list[str], cwd: str, env: Mapping[str, str], settings: dict[str, Any]
+    ) -> subprocess.Popen:
+        key = (tuple(cmd), cwd, frozenset(env.items()))
+        dead = []
+        proc = None
+        with self._lock:
+            self._settings[key] = settings
+            entries = self._idle.setdefault(key, [])
+            while entries:
+                candidate, _ = entries.pop(0)
+                if candidate.poll() is None:
+                    proc = candidate
+                    break
+                dead.append(candidate)
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="hire-pool-reaper",
+                                                daemon=True)
+                self._reaper.start()
+        for candidate in dead:
+            self._discard(candidate)
+
+        threading.Thread(target=self._fill, args=(key,), daemon=True).start()
+        return proc or _spawn(cmd, cwd, env)
+
+    def _memory(self) -> int:
+        return sum(_rss(proc.pid) for entries in self._idle.values() for proc, _ in entries)
+
+    def _fill(self, key: _Key) -> None:
+        """Start processes until the key has `size` idle ones (or memory runs out)."""
+        while not self._closed.is_set():
+            with self._lock:
+                settings = self._settings[key]
+                have = len(self._idle.get(key, [])) + self._starting.get(key, 0)
+                if have >= settings["size"] or self._memory() >= settings["max_memory"]:
+                    return
+                self._starting[key] = self._starting.get(key, 0) + 1
+            try:
+                proc = _spawn(list(key[0]), key[1], dict(key[2]))
+            except OSError:
+                with self._lock:
+                    self._starting[key] -= 1
+                return
+            with self._lock:
+                self._starting[key] -= 1
+                if not self._closed.is_set():
+                    self._idle.setdefault(key, []).append((proc, time.monotonic()))
+                    continue
+            self._discard(proc)
+
+    def _reap(self) -> None:
+        while not self._closed.wait(_REAP_INTERVAL):
+            now = time.monotonic()
+            expired = []
+            with self._lock:
+                for key, entries in self._idle.items():
+                    timeout = self._settings[key]["idle_timeout"]
+                    keep = []
+                    for proc, started in entries:
+                        if proc.poll() is not None or now - started > timeout:
+                            expired.append(proc)
+                        else:
+                            keep.append((proc, started))
+                    self._idle[key] = keep
+
+                # Over the memory cap: drop the oldest idle processes first
+                limit = min((s["max_memory"] for s in self._settings.values()), default=0)
+                if limit:
+                    oldest = sorted(
+                        ((started, key, proc) for key, items in self._idle.items()
+                         for proc, started in items),
+                        key=lambda e: e[0],
+                    )
+                    total = sum(_rss(proc.pid) for _, _, proc in oldest)
+                    for started, key, proc in oldest:
+                        if total <= limit:
+                            break
+                        total -= _rss(proc.pid)
+                        self._idle[key].remove((proc, started))
+                        expired.append(proc)
+            for proc in expired:
+                self._discard(proc)
+
+    @staticmethod
+    def _discard(proc: subprocess.Popen) -> None:
+        kill_process(proc)
+        with contextlib.suppress(OSError, ValueError, subprocess.TimeoutExpired):
+            proc.communicate(timeout=5)
+
+    def close(self) -> None:
+        """Kill all idle processes (at exit)."""
+        self._closed.set()
+        with self._lock:
+            procs = [proc for entries in self._idle.values() for proc, _ in entries]
+            self._idle.clear()
+        for proc in procs:
+            self._discard(proc)
@@ -0,0 +1,163 @@
+"""Local response cache (opt-in).
+
+Maps a hash of (agent, model, message, attachment contents) to the agent's
+answer, so repeated identical prompts (e.g. from CI) return instantly.
+Only fresh conversations are cached; continued sessions always go to the
+agent.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .paths import get_data_dir
+
+CACHE_FILENAME = "responses.db"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    model TEXT,
+    result TEXT NOT NULL,
+    size INTEGER,
+    created_at REAL,
+    last_used REAL,
+    hits INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+# Result fields worth keeping; raw CLI output and the agent-side session are dropped
+_CACHED_FIELDS = ("response", "context_tokens")
+
+_lock = threading.RLock()
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_data_dir() / CACHE_FILENAME
+    with _lock:
+        conn = _connections.get(path)
+        if conn is None:
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _connections[path] = conn
+        return conn
+
+
+def _count(conn: sqlite3.Connection, name: str) -> None:
+    conn.execute(
+        "INSERT INTO counters (name, value) VALUES (?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+        (name,),
+    )
+
+
+def cache_key(agent: str, model: str | None, message: str, file_digests: list[str]) -> str:
+    """Key for a prompt: agent, model, final message text and attachment hashes."""
+    data = json.dumps([agent, model or "", message, file_digests], ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str, ttl: float | None = None) -> dict[str, Any] | None:
+    """Get a cached result, if present and not expired."""
+    if ttl is None:
+        ttl = DEFAULT_TTL
+    conn = _connect()
+    now = time.time()
+    with _lock, conn:
+        row = conn.execute(
+            "SELECT result, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row and ttl and now - row[1] > ttl:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            row = None
+        if not row:
+            _count(conn, "misses")
+            return None
+        conn.execute(
+            "UPDATE responses SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+        )
+        _count(conn, "hits")
+    cached: dict[str, Any] = json.loads(row[0])
+    return cached
+
+
+def cache_response(
+    key: str,
+    agent: str,
+    model: str | None,
+    result: dict[str, Any],
+    max_entries: int | None = None,
+) -> None:
+    """Store a successful result, evicting least recently used entries."""
+    if max_entries is None:
+        max_entries = DEFAULT_MAX_ENTRIES
+    data = json.dumps(
+        {k: result[k] for k in _CACHED_FIELDS if result.get(k) is not None},
+        ensure_ascii=False,
+    )
+    conn = _connect()
+    now = time.time()
+    with _lock, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, agent, model, result, size, created_at, last_used, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, agent, model, data, len(data.encode("utf-8")), now, now),
+        )
+        conn.execute(
+            "DELETE FROM responses WHERE rowid IN ("
+            "SELECT rowid FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (max_entries,),
+        )
+
+
+def cache_stats() -> dict[str, Any]:
+    """Summary of the cache: entries, size, hit/miss counts and per-agent entries."""
+    conn = _connect()
+    with _lock:
+        entries, size, oldest = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at) FROM responses"
+        ).fetchone()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        agents = dict(conn.execute(
+            "SELECT agent, COUNT(*) FROM responses GROUP BY agent ORDER BY agent"
+        ).fetchall())
+    return {
+        "path": str(get_data_dir() / CACHE_FILENAME),
+        "entries": entries,
+        "size": size,
+        "oldest": oldest,
+        "hits": counters.get("hits", 0),
+        "misses": counters.get("misses", 0),
+        "agents": agents,
+    }
+
+
+def clear_cache(agent: str | None = None) -> int:
+    """Remove cached responses (for one agent, or all) and reset counters.
+
+    Returns:
+        Number of entries removed.
+    """
+    conn = _connect()
+    with _lock, conn:
+        if agent:
+            removed = conn.execute("DELETE FROM responses WHERE agent = ?", (agent,)).rowcount
+        else:
+            removed = conn.execute("DELETE FROM responses").rowcount
+            conn.execute("DELETE FROM counters")
+    return removed
@@ -3,24 +3,57 @@
 import argparse
 import sys
 
-from . import __version__
-from .commands import run_ask, run_delete, run_doctor, run_sessions, run_show
+from . import __version__, commands
 
 
-SUBCOMMANDS = {"sessions", "show", "delete", "doctor", "help", "--help", "-h", "--version"}
+SUBCOMMANDS = {
+    "batch", "cache", "sessions", "show", "delete", "doctor", "serve", "stats",
+    "help", "--help", "-h", "--version",
+}
 
+# Subcommands forwarded to a running `hire serve` (delete may prompt, the rest are local by nature)
+DAEMON_SUBCOMMANDS = {"batch", "cache", "sessions", "show", "stats"}
 
-def main() -> int:
+
+def main(argv: list[str] | None = None) -> int:
     """Main entry point."""
     # Ensure UTF-8 output on Windows
     if sys.platform == "win32" and hasattr(sys.stdout, "reconfigure"):
         sys.stdout.reconfigure(encoding="utf-8", errors="replace")
         sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
+    if argv is None:
+        argv = sys.argv[1:]
+
+    is_ask = bool(argv) and argv[0] not in SUBCOMMANDS
+    if is_ask or (argv and argv[0] in DAEMON_SUBCOMMANDS):
+        from .daemon import forward
+
+        code = forward(argv, send_stdin=is_ask)
+        if code is not None:
+            return code
+
+    return run(argv)
+
+
+def run(argv: list[str]) -> int:
+    """Run a CLI call in this process (also used by hire serve for each request)."""
+    try:
+        return _main(argv)
+    except KeyboardInterrupt:
+        from .adapters.base import kill_all_processes
+
+        kill_all_processes()
+        print("\nInterrupted", file=sys.stderr)
+        return 130
+
+
+def _main(argv: list[str]) -> int:
+    """Parse arguments and dispatch to a command."""
     # Check if first arg is a subcommand, if not, treat as default (hire) action
-    if len(sys.argv) > 1 and sys.argv[1] not in SUBCOMMANDS:
+    if argv and argv[0] not in SUBCOMMANDS:
         # Default action: hire an agent
-        return run_default()
+        return run_default(argv)
 
     # Subcommand mode
     parser = argparse.ArgumentParser(
@@ -40,14 +73,48 @@ def main() -> int:
     sessions_parser.add_argument(
         "target",
         nargs="?",
-        choices=["claude", "codex", "gemini", "grok"],
+        type=agent_arg,
+        metavar="AGENT",
         help="Filter by agent",
     )
+    sessions_parser.add_argument(
+        "--agent",
+        type=agent_arg,
+        metavar="AGENT",
+        help="Filter by agent (same as the positional target)",
+    )
     sessions_parser.add_argument(
         "--json",
         action="store_true",
         help="Output in JSON format",
     )
+    sessions_parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream sessions as newline-delimited JSON",
+    )
+    sessions_parser.add_argument(
+        "--limit",
+        type=int,
+        metavar="N",
+        help="Show only the N most recently updated sessions",
+    )
+    sessions_parser.add_argument(
+        "--since",
+        type=since_arg,
+        metavar="WHEN",
+        help="Only sessions updated since WHEN (e.g. 7d, 12h, 2025-01-31)",
+    )
+    sessions_parser.add_argument(
+        "--name-glob",
+        metavar="PATTERN",
+        help="Only sessions whose name matches PATTERN (e.g. 'ci-*')",
+    )
+    sessions_parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="Rebuild the session index from session files",
+    )
 
     # show command
     show_parser = subparsers.add_parser("show", help="Show session details")
@@ -73,16 +140,116 @@ def main() -> int:
         action="store_true",
         help="Delete all sessions",
     )
+    delete_parser.add_argument(
+        "--agent",
+        type=agent_arg,
+        metavar="AGENT",
+        help="Delete all sessions for an agent",
+    )
+    delete_parser.add_argument(
+        "--older-than",
+        type=since_arg,
+        metavar="AGE",
+        help="Delete sessions not updated since AGE (e.g. 30d, 2025-01-31)",
+    )
     delete_parser.add_argument(
         "-f", "--force",
         action="store_true",
         help="Delete without confirmation",
     )
 
+    # batch command
+    batch_parser = subparsers.add_parser("batch", help="Run a JSONL file of prompts")
+    batch_parser.add_argument(
+        "file",
+        help="JSONL file, one job per line (target, message, model, session, name, files, id)",
+    )
+    batch_parser.add_argument(
+        "-o", "--out",
+        metavar="FILE",
+        help="Write results as JSONL to FILE (default: stdout)",
+    )
+    batch_parser.add_argument(
+        "-j", "--concurrency",
+        type=int,
+        metavar="N",
+        help="Maximum concurrent jobs per agent (default: 4)",
+    )
+    batch_parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Stop a job's agent after SECONDS (default: the adapter's timeout config)",
+    )
+    batch_parser.add_argument(
+        "--max-cost",
+        type=float,
+        metavar="USD",
+        help="Cancel queued jobs once the batch has cost more than USD",
+    )
+    batch_parser.add_argument(
+        "--max-tokens",
+        type=int,
+        metavar="N",
+        help="Cancel queued jobs once the batch has used more than N tokens",
+    )
+    batch_parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Checkpoint file of finished job IDs (default: <file>.checkpoint)",
+    )
+    batch_parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint and run every job again",
+    )
+
+    # cache command
+    cache_parser = subparsers.add_parser("cache", help="Inspect or clear the response cache")
+    cache_parser.add_argument(
+        "action",
+        choices=["stats", "clear"],
+        help="stats: show cache statistics, clear: remove cached responses",
+    )
+    cache_parser.add_argument(
+        "--agent",
+        type=agent_arg,
+        metavar="AGENT",
+        help="Only clear responses from this agent",
+    )
+    cache_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output stats in JSON format",
+    )
+
+    # stats command
+    stats_parser = subparsers.add_parser("stats", help="Show call latency and error statistics")
+    stats_parser.add_argument(
+        "--since",
+        type=since_arg,
+        metavar="WHEN",
+        help="Only calls since WHEN (e.g. 1h, 7d, 2025-01-31)",
+    )
+    stats_parser.add_argument(
+        "--agent",
+        type=agent_arg,
+        metavar="AGENT",
+        help="Only calls to this agent",
+    )
+    stats_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output in JSON format",
+    )
+
     # doctor command
     subparsers.add_parser("doctor", help="Check environment and agent availability")
 
-    args = parser.parse_args()
+    # serve command
+    subparsers.add_parser("serve", help="Run a background daemon that keeps hire warm")
+
+    args = parser.parse_args(argv)
 
     if args.command is None:
         print_usage()
@@ -90,19 +257,50 @@ def main() -> int:
 
     # Dispatch to command handlers
     if args.command == "sessions":
-        return run_sessions(args)
+        return commands.run_sessions(args)
     elif args.command == "show":
-        return run_show(args)
+        return commands.run_show(args)
     elif args.command == "delete":
-        return run_delete(args)
+        return commands.run_delete(args)
+    elif args.command == "batch":
+        return commands.run_batch(args)
+    elif args.command == "cache":
+        return commands.run_cache(args)
+    elif args.command == "stats":
+        return commands.run_stats(args)
     elif args.command == "doctor":
-        return run_doctor(args)
+        return commands.run_doctor(args)
+    elif args.command == "serve":
+        return commands.run_serve(args)
     else:
         print_usage()
         return 1
 
 
-def run_default() -> int:
+def agent_arg(value: str) -> str:
+    """argparse type for agent names (built-in or installed adapters)."""
+    from .adapters import available_adapters, is_adapter
+
+    if not is_adapter(value):
+        raise argparse.ArgumentTypeError(
+            f"unknown agent: {value!r} (choose from {', '.join(available_adapters())})"
+        )
+    return value
+
+
+def since_arg(value: str) -> str:
+    """argparse type for --since style time values."""
+    from .session import parse_since
+
+    try:
+        return parse_since(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid time: {value!r} (use e.g. 30m, 12h, 7d, 2w or an ISO date)"
+        ) from None
+
+
+def run_default(argv: list[str]) -> int:
     """Run the default hire action."""
     parser = argparse.ArgumentParser(
         prog="hire",
@@ -112,7 +310,7 @@ def run_default() -> int:
     parser.add_argument(
         "target",
         nargs="?",
-        help="Target agent: claude, codex, gemini, or grok",
+        help="Target agent: claude, codex, gemini, or grok (comma-separated to ask several)",
     )
     parser.add_argument(
         "message",
@@ -152,9 +350,41 @@ def run_default() -> int:
         metavar="FILE",
         help="Write output to file",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the response as it is generated",
+    )
+    parser.add_argument(
+        "--race",
+        action="store_true",
+        help="With several targets, use the first successful response and cancel the rest",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't use the response cache for this call",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore a cached response and cache the new one",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the agent after SECONDS and exit with code 124 "
+             "(default: the adapter's timeout config)",
+    )
+    parser.add_argument(
+        "--pin",
+        action="store_true",
+        help="Pin this turn so context budget trimming keeps it (grok)",
+    )
 
-    args = parser.parse_args()
-    return run_ask(args)
+    args = parser.parse_args(argv)
+    return commands.run_ask(args)
 
 
 def print_usage():
@@ -163,12 +393,20 @@ def print_usage():
 
 Usage:
   hire <target> <message>      Hire an agent to do a task
+  hire <t1>,<t2> <message>     Ask several agents concurrently
+  hire --race <t1>,<t2> <msg>  First successful agent wins, the rest are cancelled
   hire -s <session> <message>  Continue a specific session
-  hire sessions [target]       List sessions
+  hire sessions [target]       List sessions (--limit, --since, --name-glob, --ndjson)
   hire show <name-or-id>       Show session details
   hire delete <name-or-id>     Delete a session
   hire delete --all            Delete all sessions
+  hire delete --agent <target> Delete all sessions for an agent
+  hire delete --older-than 30d Delete sessions not updated in 30 days
+  hire batch <file.jsonl>      Run a JSONL file of prompts (-o, -j, --max-cost)
+  hire cache stats|clear       Show or clear the response cache
+  hire stats [--since 24h]     Latency percentiles, error rate and throughput
   hire doctor                  Check environment
+  hire serve                   Run a daemon that later hire calls go through
 
 Targets:
   claude, codex, gemini, grok
@@ -181,9 +419,16 @@ Options:
   --json             Output in JSON format
   --clip             Copy output to clipboard
   -o, --out FILE     Write output to file
+  --stream           Print the response as it is generated
+  --race             First successful target wins (with several targets)
+  --no-cache         Bypass the response cache
+  --refresh          Ignore a cached response and store the new one
+  --pin              Keep this turn when trimming history (grok)
+  --timeout SECONDS  Stop the agent after SECONDS (exit code 124)
 
 Examples:
   hire codex "Design a REST API"
+  hire claude,codex,gemini "Compare these designs"
   hire gemini "Research React 19 features" --json
   hire -s abc123 "Tell me more"
   hire sessions codex
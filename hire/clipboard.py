@@ -3,6 +3,8 @@
 import platform
 import subprocess
 
+from .paths import get_env
+
 
 def _copy_to_clipboard_windows(text: str) -> bool:
     """Copy text to clipboard using Windows API via ctypes."""
@@ -87,12 +89,14 @@ def copy_to_clipboard(text: str) -> bool:
                 subprocess.run(
                     ["xclip", "-selection", "clipboard"],
                     input=text.encode("utf-8"),
+                    env=get_env(),
                     check=True,
                 )
             except FileNotFoundError:
                 subprocess.run(
                     ["xsel", "--clipboard", "--input"],
                     input=text.encode("utf-8"),
+                    env=get_env(),
                     check=True,
                 )
         elif system == "Windows":
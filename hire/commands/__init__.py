@@ -1,9 +1,51 @@
-"""CLI commands."""
+"""CLI commands.
 
-from .ask import run_ask
-from .sessions import run_sessions
-from .show import run_show
-from .delete import run_delete
-from .doctor import run_doctor
+Each command module is imported only when its run_* function is first
+accessed, so a subcommand does not pay for the others' imports.
+"""
 
-__all__ = ["run_ask", "run_sessions", "run_show", "run_delete", "run_doctor"]
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ask import run_ask
+    from .batch import run_batch
+    from .cache import run_cache
+    from .delete import run_delete
+    from .doctor import run_doctor
+    from .serve import run_serve
+    from .sessions import run_sessions
+    from .show import run_show
+    from .stats import run_stats
+
+# run_* function -> module defining it
+_COMMANDS = {
+    "run_ask": ".ask",
+    "run_batch": ".batch",
+    "run_cache": ".cache",
+    "run_sessions": ".sessions",
+    "run_show": ".show",
+    "run_delete": ".delete",
+    "run_doctor": ".doctor",
+    "run_serve": ".serve",
+    "run_stats": ".stats",
+}
+
+
+def __getattr__(name: str) -> object:
+    if name in _COMMANDS:
+        return getattr(importlib.import_module(_COMMANDS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "run_ask",
+    "run_batch",
+    "run_cache",
+    "run_sessions",
+    "run_show",
+    "run_delete",
+    "run_doctor",
+    "run_serve",
+    "run_stats",
+]
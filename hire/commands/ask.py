@@ -1,18 +1,41 @@
 """Ask command implementation."""
 
+import contextlib
 import json
 import sys
+import threading
+import time
 from argparse import Namespace
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
 
-from ..adapters import get_adapter
+from ..adapters import get_adapter, is_adapter
+from ..adapters.base import (
+    EVENT_FINAL,
+    EVENT_TEXT,
+    EVENT_TOOL,
+    TERMINATE_GRACE,
+    AgentAdapter,
+    cancel_scope,
+)
 from ..clipboard import copy_to_clipboard
+from ..config import get_adapter_config, load_config
+from ..metrics import record_call
+from ..paths import get_data_dir, resolve_path
 from ..session import (
+    append_transcript,
     create_session,
     find_session,
     get_latest_session,
     list_sessions,
+    load_transcript,
     save_session,
 )
+from ..usage import add_usage, price_usage
+
+# Exit code when an agent call hits its timeout (as with timeout(1))
+EXIT_TIMEOUT = 124
 
 
 def read_stdin() -> str | None:
@@ -33,7 +56,660 @@ def build_message(message: str | None, stdin: str | None) -> str | None:
         return message
 
 
-VALID_TARGETS = {"claude", "codex", "gemini", "grok"}
+def parse_targets(target: str | None) -> list[str] | None:
+    """Split a comma-separated target list (e.g. "claude,codex").
+
+    Returns:
+        The targets in order without duplicates, or None if any is unknown.
+    """
+    if not target:
+        return None
+    targets = list(dict.fromkeys(t.strip() for t in target.split(",") if t.strip()))
+    if not targets or not all(is_adapter(t) for t in targets):
+        return None
+    return targets
+
+
+def _update_context(session: dict[str, Any], result: dict[str, Any]) -> None:
+    """Record context size and budget trimming from a Grok result."""
+    if result.get("context_tokens") is not None:
+        session["context_tokens"] = result["context_tokens"]
+    # Only set when history was replayed; chained turns keep the last value
+    if "elided" in result:
+        session["elided_messages"] = result["elided"]
+
+
+def _response_cache_key(
+    target: str, model: str | None, message: str, files: list[str] | None = None
+) -> str | None:
+    """Response cache key for a fresh prompt, or None if a file can't be read."""
+    from ..cache import cache_key
+    from ..files import extract_file_refs
+    from ..uploads import file_digest
+
+    _, file_paths = extract_file_refs(message)
+    file_paths += files or []
+    try:
+        digests = [file_digest(path) for path in file_paths]
+    except OSError:
+        return None
+    model = model or get_adapter_config(target).get("model")
+    return cache_key(target, model, message, digests)
+
+
+def _call_with_retries(
+    target: str,
+    model: str | None,
+    adapter: AgentAdapter,
+    attempt: Callable[[], dict[str, Any]],
+    streamed_text: list[str],
+    timed_out: threading.Event,
+) -> tuple[dict[str, Any], int, bool]:
+    """Run attempt() under the agent's retry policy, circuit breaker and rate limit.
+
+    A streamed call is not retried once it has printed text. Time spent
+    waiting for the rate limit is added to the result as "rate_limit_wait".
+
+    Returns:
+        (result, number of retries, whether the final failure was transient)
+    """
+    from ..ratelimit import acquire_slot, release_slot
+    from ..retry import backoff_delay, breaker_wait, end_trial, get_retry_policy, record_outcome
+
+    policy = get_retry_policy(target)
+    wait, trial = breaker_wait(target)
+    if wait:
+        return {
+            "response": None,
+            "session_id": None,
+            "error": f"Circuit open for {target} after repeated failures, "
+                     f"try again in {wait:.0f}s",
+            "circuit_open": True,
+            "raw": "",
+        }, 0, False
+
+    retries = 0
+    waited = 0.0
+    # Breaker outcome of the last call that reached the agent (None: says nothing)
+    outcome: bool | None = None
+    try:
+        while True:
+            # Shared with other hire processes; each retry takes its own slot
+            slot, wait = acquire_slot(target, model, timed_out)
+            waited += wait
+            if wait >= 1:
+                print(f"{target}: waited {wait:.1f}s for the rate limit", file=sys.stderr)
+            if timed_out.is_set():
+                # The agent was never called, so the breaker learns nothing from this
+                release_slot(slot)
+                result: dict[str, Any] = {"response": None, "session_id": None,
+                                          "error": "Timed out waiting for the rate limit",
+                                          "raw": ""}
+                transient = True
+                break
+            try:
+                result = attempt()
+            finally:
+                release_slot(slot)
+            transient = bool(result.get("error")) and (
+                timed_out.is_set() or adapter.is_retryable(result)
+            )
+            outcome = True if not result.get("error") else (False if transient else None)
+            if (not transient or timed_out.is_set() or streamed_text
+                    or retries + 1 >= policy["attempts"]):
+                break
+            delay = backoff_delay(retries, policy, result.get("retry_after"))
+            retries += 1
+            print(f"{target}: {result['error'].strip()[:200]}; "
+                  f"retry {retries}/{policy['attempts'] - 1} in {delay:.1f}s", file=sys.stderr)
+            if timed_out.wait(delay):
+                break
+
+        if waited:
+            result["rate_limit_wait"] = round(waited, 3)
+        if outcome is not None:
+            record_outcome(target, outcome, policy)
+    finally:
+        if trial:
+            end_trial(target)
+    return result, retries, transient
+
+
+def _file_ref(path: str) -> str:
+    """@path reference for an agent CLI, quoted if the path contains whitespace."""
+    return f'@"{path}"' if any(c.isspace() for c in path) else f"@{path}"
+
+
+def call_agent(
+    target: str,
+    message: str,
+    model: str | None = None,
+    existing_session: dict[str, Any] | None = None,
+    cli_session_id: str | None = None,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+    adapter: AgentAdapter | None = None,
+    no_cache: bool = False,
+    refresh: bool = False,
+    timeout: float | None = None,
+    files: list[str] | None = None,
+) -> dict[str, Any]:
+    """Send a message to one agent.
+
+    Fresh conversations go through the response cache when it is enabled
+    in the config ("cache": {"enabled": true}).
+
+    When the timeout expires the call is cancelled (agent processes get
+    SIGTERM, then SIGKILL) and an error result with "timed_out": True and
+    the output received so far in "partial" is returned.
+
+    Args:
+        target: Agent name
+        message: Message to send (@filepath references are attached for Grok)
+        model: Optional model to use
+        existing_session: Session whose history is sent (Grok)
+        cli_session_id: CLI session ID to continue
+        on_event: If given, the adapter's stream() is used and every event
+            before the final one is passed to it
+        adapter: Adapter instance to use (e.g. to cancel() it from elsewhere)
+        no_cache: Bypass the response cache
+        refresh: Ignore a cached response but store the new one
+        timeout: Seconds before the call is cancelled (default: the
+            adapter's "timeout" config, no limit if unset)
+        files: Absolute paths of files to attach besides the message's
+            @filepath references (uploaded for Grok, referenced as @path for
+            the CLI agents)
+
+    Returns:
+        The adapter's result dict (with "cached": True for cache hits), plus
+        "phases": seconds from the start of the call to the first agent
+        process start ("spawn") and first output ("first_byte"), and in total.
+
+    Raises:
+        ValueError: If the agent is unknown.
+    """
+    start = time.perf_counter()
+    if adapter is None:
+        adapter = get_adapter(target)
+    if files and target != "grok":
+        message += "".join(f" {_file_ref(path)}" for path in files)
+
+    # Only prompts without prior conversation state are cacheable
+    cache_config = load_config().get("cache") or {}
+    key = None
+    fresh = not cli_session_id and not (target == "grok" and existing_session)
+    if cache_config.get("enabled") and not no_cache and fresh:
+        from ..cache import cache_response, get_cached_response
+
+        key = _response_cache_key(target, model, message, files)
+        if key and not refresh:
+            cached = get_cached_response(key, cache_config.get("ttl"))
+            if cached is not None:
+                if on_event and cached.get("response"):
+                    on_event({"type": EVENT_TEXT, "text": cached["response"]})
+                # No agent-side conversation to resume: sharing the original call's
+                # would fork it (entries from older versions still have one)
+                cached.pop("session_id", None)
+                return {**cached, "session_id": None, "raw": "", "cached": True,
+                        "phases": {"total": time.perf_counter() - start}}
+
+    if cli_session_id == "unknown" and target != "grok":
+        # Placeholder of a session with no agent-side conversation (e.g. it was
+        # answered from the cache); Grok replays its transcript instead
+        print(f"Note: this session has no {target} conversation to resume, "
+              "starting a new one", file=sys.stderr)
+        cli_session_id = None
+
+    kwargs: dict[str, Any] = {}
+    if target == "grok":
+        from ..files import extract_file_refs
+        message, file_paths = extract_file_refs(message)
+        file_paths += files or []
+        kwargs = {
+            "history": load_transcript(existing_session) if existing_session else None,
+            "files": file_paths or None,
+            "context_tokens": (existing_session.get("context_tokens")
+                               if existing_session and cli_session_id else None),
+        }
+
+    if timeout is None:
+        timeout = get_adapter_config(target).get("timeout")
+    timer = None
+    timed_out = threading.Event()
+    if timeout:
+        def expire() -> None:
+            timed_out.set()
+            adapter.cancel(grace=TERMINATE_GRACE)
+
+        timer = threading.Timer(timeout, expire)
+        timer.daemon = True
+        timer.start()
+
+    text: list[str] = []
+    first_event: float | None = None
+
+    def attempt() -> dict[str, Any]:
+        nonlocal first_event
+        if on_event is None:
+            return adapter.ask(message, session_id=cli_session_id, model=model, **kwargs)
+        result = {"response": None, "session_id": cli_session_id,
+                  "error": "No result from agent", "raw": ""}
+        for event in adapter.stream(message, session_id=cli_session_id, model=model, **kwargs):
+            if event["type"] == EVENT_FINAL:
+                result = event["result"]
+            else:
+                if first_event is None:
+                    first_event = time.perf_counter()
+                if event["type"] == EVENT_TEXT:
+                    text.append(event["text"])
+                on_event(event)
+        return result
+
+    try:
+        result, retries, transient = _call_with_retries(target, model, adapter, attempt, text,
+                                                        timed_out)
+    finally:
+        if timer:
+            timer.cancel()
+    if retries:
+        result["retries"] = retries
+    if result.get("usage"):
+        result["usage"] = price_usage(target, result["usage"])
+
+    # Phase timings for metrics
+    tracker = adapter.processes
+    first_byte = first_event or tracker.first_output_at
+    phases = {
+        "spawn": tracker.started_at - start if tracker.started_at else None,
+        "first_byte": first_byte - start if first_byte else
+        (result.get("timings") or {}).get("first_token"),
+        "total": time.perf_counter() - start,
+    }
+    result["phases"] = phases
+
+    if timed_out.is_set() and result.get("error"):
+        raw = result.get("raw")
+        return {
+            "response": None,
+            "session_id": cli_session_id,
+            "error": f"Timed out after {timeout:g}s",
+            "timed_out": True,
+            # Streamed text, or whatever the CLI printed before it was stopped
+            "partial": "".join(text) if on_event else (raw if isinstance(raw, str) else ""),
+            "raw": raw,
+            **({"retries": retries} if retries else {}),
+            "phases": phases,
+        }
+
+    scope = cancel_scope.get()
+    if scope is not None and scope.cancelled:
+        # The hire serve client went away: nothing to save or cache
+        return {"response": None, "session_id": cli_session_id, "error": "Cancelled",
+                "cancelled": True, "raw": result.get("raw"), "phases": phases}
+
+    if key and not result.get("error"):
+        cache_response(key, target, model, result, cache_config.get("max_entries"))
+    return result
+
+
+def save_turn(
+    target: str,
+    message: str,
+    result: dict[str, Any],
+    existing_session: dict[str, Any] | None = None,
+    cli_session_id: str | None = None,
+    name: str | None = None,
+    pin: bool = False,
+) -> dict[str, Any]:
+    """Persist a successful turn.
+
+    Updates the continued session, or creates a new one.
+
+    Returns:
+        The saved session.
+    """
+    # Get the new session ID from the response
+    new_cli_session_id = result.get("session_id")
+
+    # Messages to append to the Grok transcript for this turn
+    new_messages: list[dict[str, Any]] = []
+    if target == "grok":
+        from ..files import extract_file_refs
+        message, _ = extract_file_refs(message)
+        new_messages = [{"role": "user", "content": message}]
+        if result.get("response"):
+            new_messages.append({"role": "assistant", "content": result["response"]})
+        if pin:
+            # Pinned turns survive context budget trimming
+            for m in new_messages:
+                m["pinned"] = True
+
+    if existing_session and cli_session_id:
+        # Update existing session
+        existing_session["cli_session_id"] = new_cli_session_id or cli_session_id
+        if result.get("usage"):
+            existing_session["usage"] = add_usage(existing_session.get("usage"), result["usage"])
+        if name:
+            existing_session["name"] = name
+        if target == "grok":
+            append_transcript(existing_session, new_messages)
+            _update_context(existing_session, result)
+        save_session(existing_session)
+        return existing_session
+
+    # Create new session
+    session = create_session(
+        agent=target,
+        cli_session_id=new_cli_session_id or "unknown",
+        name=name,
+    )
+    if result.get("usage"):
+        # Cumulative token usage and cost of the session
+        session["usage"] = result["usage"]
+    if target == "grok":
+        # History from a replaced named session was sent too, so keep it
+        history = load_transcript(existing_session) if existing_session else []
+        append_transcript(session, history + new_messages)
+        _update_context(session, result)
+    if target == "grok" or result.get("usage"):
+        save_session(session)
+    return session
+
+
+def _print_event(event: dict[str, Any], out: Any = None) -> None:
+    """Show a stream event: text on stdout (teed to out), tool calls on stderr."""
+    if event["type"] == EVENT_TEXT:
+        sys.stdout.write(event["text"])
+        sys.stdout.flush()
+        if out:
+            out.write(event["text"])
+            out.flush()
+    elif event["type"] == EVENT_TOOL:
+        detail = f": {event['detail']}" if event.get("detail") else ""
+        print(f"[{event['name']}{detail}]", file=sys.stderr)
+
+
+def _deliver(output_text: str, copy_clip: bool, out_file: str | None) -> None:
+    """Copy output to the clipboard and/or write it to a file, as requested."""
+    if copy_clip:
+        if copy_to_clipboard(output_text):
+            print("\n(Copied to clipboard)", file=sys.stderr)
+        else:
+            print("\n(Failed to copy to clipboard)", file=sys.stderr)
+
+    if out_file:
+        try:
+            with open(out_file, "w", encoding="utf-8") as f:
+                f.write(output_text)
+            print(f"\n(Written to {out_file})", file=sys.stderr)
+        except OSError as e:
+            print(f"\n(Failed to write to {out_file}: {e})", file=sys.stderr)
+
+
+def run_fanout(
+    targets: list[str],
+    message: str,
+    model: str | None = None,
+    name: str | None = None,
+    pin: bool = False,
+    no_cache: bool = False,
+    refresh: bool = False,
+    timeout: float | None = None,
+) -> list[dict[str, Any]]:
+    """Send the same message to several agents concurrently.
+
+    Each agent gets its own new session (named "<name>-<agent>" if a name
+    is given). Wall time is that of the slowest agent.
+
+    Returns:
+        One entry per target, in completion order, with agent, response,
+        session_id, cli_session_id, name, elapsed and (on failure) error,
+        plus timed_out and partial when an agent hit the timeout.
+    """
+
+    adapters = {target: get_adapter(target) for target in targets}
+
+    def run_one(target: str) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            result = call_agent(target, message, model=model, adapter=adapters[target],
+                                no_cache=no_cache, refresh=refresh, timeout=timeout)
+        except Exception as e:
+            # e.g. a missing agent CLI: the other agents' answers still count
+            result = {"response": None, "error": str(e)}
+        entry: dict[str, Any] = {"agent": target, "response": result.get("response")}
+        if result.get("cached"):
+            entry["cached"] = True
+        if result.get("retries"):
+            entry["retries"] = result["retries"]
+        if result.get("rate_limit_wait"):
+            entry["rate_limit_wait"] = result["rate_limit_wait"]
+        if result.get("usage"):
+            entry["usage"] = result["usage"]
+        save = None
+        if result.get("error"):
+            entry["error"] = result["error"]
+            if result.get("timed_out"):
+                entry.update(timed_out=True, partial=result.get("partial", ""))
+        else:
+            save_start = time.perf_counter()
+            session = save_turn(target, message, result,
+                                name=f"{name}-{target}" if name else None, pin=pin)
+            save = time.perf_counter() - save_start
+            entry.update(session_id=session["id"], cli_session_id=session["cli_session_id"],
+                         name=session.get("name"))
+        record_call(target, model, "fanout", message, result, {"save": save})
+        entry["elapsed"] = round(time.perf_counter() - start, 3)
+        return entry
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from contextvars import copy_context
+
+    pool = ThreadPoolExecutor(max_workers=len(targets))
+    try:
+        # Each job runs in a copy of the caller's context (cwd and output under hire serve)
+        futures = [pool.submit(copy_context().run, run_one, t) for t in targets]
+        return [future.result() for future in as_completed(futures)]
+    except KeyboardInterrupt:
+        # Don't wait for the agents to finish on their own
+        for adapter in adapters.values():
+            adapter.cancel()
+        raise
+    finally:
+        pool.shutdown(wait=True)
+
+
+def _run_fanout_command(
+    targets: list[str],
+    message: str,
+    model: str | None,
+    name: str | None,
+    pin: bool,
+    output_json: bool,
+    copy_clip: bool,
+    out_file: str | None,
+    no_cache: bool = False,
+    refresh: bool = False,
+    timeout: float | None = None,
+) -> int:
+    """Run a fan-out and print labelled sections or a combined JSON document."""
+    start = time.perf_counter()
+    results = run_fanout(targets, message, model=model, name=name, pin=pin,
+                         no_cache=no_cache, refresh=refresh, timeout=timeout)
+    elapsed = round(time.perf_counter() - start, 3)
+
+    # Report in the order the targets were given
+    results.sort(key=lambda r: targets.index(r["agent"]))
+
+    if output_json:
+        output_text = json.dumps({"results": results, "elapsed": elapsed},
+                                 indent=2, ensure_ascii=False)
+    else:
+        sections = []
+        for r in results:
+            if r.get("timed_out"):
+                sections.append(f"=== {r['agent']} (timed out, {r['elapsed']:.1f}s) ===\n"
+                                f"{r['partial']}".rstrip())
+            elif r.get("error"):
+                sections.append(f"=== {r['agent']} (error, {r['elapsed']:.1f}s) ===\n"
+                                f"Error: {r['error']}")
+            else:
+                sections.append(f"=== {r['agent']} ({r['elapsed']:.1f}s) ===\n{r['response']}")
+        output_text = "\n\n".join(sections)
+
+    print(output_text)
+    _deliver(output_text, copy_clip, out_file)
+    return _exit_code([r for r in results if r.get("error")])
+
+
+def _exit_code(failures: list[dict[str, Any]]) -> int:
+    """Exit code for failed calls: EXIT_TIMEOUT if they all timed out."""
+    if not failures:
+        return 0
+    return EXIT_TIMEOUT if all(f.get("timed_out") for f in failures) else 1
+
+
+RACE_LOG_FILENAME = "races.jsonl"
+
+
+def run_race(
+    targets: list[str],
+    message: str,
+    model: str | None = None,
+    no_cache: bool = False,
+    refresh: bool = False,
+    timeout: float | None = None,
+) -> tuple[str | None, dict[str, Any], list[dict[str, Any]]]:
+    """Send a message to several agents at once; the first success wins.
+
+    As soon as one agent returns a non-error response, the others are
+    cancelled (subprocesses killed, HTTP requests aborted). Nothing is
+    persisted here; the caller saves the winner's turn.
+
+    Every call is recorded in the metrics, losers with status "cancelled"
+    and their time until they stopped.
+
+    Returns:
+        (winner target or None, winner's result or the last error result,
+        one entry per target with agent, status and elapsed seconds)
+    """
+    adapters = {target: get_adapter(target) for target in targets}
+
+    start = time.perf_counter()
+    attempts: dict[str, dict[str, Any]] = {}
+    winner: str | None = None
+    winning_result: dict[str, Any] = {"response": None, "error": "No agent responded"}
+
+    def run_one(target: str) -> dict[str, Any]:
+        return call_agent(target, message, model=model, adapter=adapters[target],
+                          no_cache=no_cache, refresh=refresh, timeout=timeout)
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from contextvars import copy_context
+
+    pool = ThreadPoolExecutor(max_workers=len(targets))
+    futures = {pool.submit(copy_context().run, run_one, t): t for t in targets}
+    try:
+        for future in as_completed(futures):
+            target = futures[future]
+            elapsed = round(time.perf_counter() - start, 3)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"response": None, "error": str(e)}
+            if winner:
+                # A loser stopping after the cancel: record how long it really ran
+                attempts[target]["elapsed"] = elapsed
+                record_call(target, model, "race", message, {**result, "cancelled": True})
+                continue
+            record_call(target, model, "race", message, result)
+            if result.get("error"):
+                status = "timeout" if result.get("timed_out") else "error"
+                attempts[target] = {"agent": target, "status": status, "elapsed": elapsed,
+                                    "error": result["error"], "retries": result.get("retries", 0)}
+                winning_result = result
+                continue
+
+            winner, winning_result = target, result
+            attempts[target] = {"agent": target, "status": "won", "elapsed": elapsed,
+                                "retries": result.get("retries", 0)}
+            for other, adapter in adapters.items():
+                if other not in attempts:
+                    attempts[other] = {"agent": other, "status": "cancelled", "elapsed": elapsed}
+                    adapter.cancel()
+    except KeyboardInterrupt:
+        for adapter in adapters.values():
+            adapter.cancel()
+        raise
+    finally:
+        pool.shutdown(wait=True)
+
+    return winner, winning_result, [attempts[t] for t in targets if t in attempts]
+
+
+def _log_race(targets: list[str], winner: str | None, attempts: list[dict[str, Any]]) -> None:
+    """Append a race outcome to the race log in the data directory."""
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "targets": targets,
+        "winner": winner,
+        "attempts": attempts,
+    }
+    try:
+        with open(get_data_dir() / RACE_LOG_FILENAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+
+def _run_race_command(
+    targets: list[str],
+    message: str,
+    model: str | None,
+    name: str | None,
+    pin: bool,
+    output_json: bool,
+    copy_clip: bool,
+    out_file: str | None,
+    no_cache: bool = False,
+    refresh: bool = False,
+    timeout: float | None = None,
+) -> int:
+    """Race agents, save the winner's session and print its response."""
+    winner, result, attempts = run_race(targets, message, model=model,
+                                        no_cache=no_cache, refresh=refresh, timeout=timeout)
+    _log_race(targets, winner, attempts)
+
+    summary = ", ".join(
+        f"{a['agent']} {a['status']} {a['elapsed']:.1f}s" for a in attempts
+    )
+    print(f"(Race: {summary})", file=sys.stderr)
+
+    if not winner:
+        for a in attempts:
+            print(f"Error ({a['agent']}): {a.get('error')}", file=sys.stderr)
+        return _exit_code([{**a, "timed_out": a["status"] == "timeout"} for a in attempts])
+
+    session = save_turn(winner, message, result, name=name, pin=pin)
+
+    if output_json:
+        output = {
+            "response": result.get("response"),
+            "session_id": session["id"],
+            "cli_session_id": session["cli_session_id"],
+            "agent": winner,
+            "name": session.get("name"),
+            "cached": bool(result.get("cached")),
+            "retries": result.get("retries", 0),
+            "usage": result.get("usage"),
+            "race": attempts,
+        }
+        output_text = json.dumps(output, indent=2, ensure_ascii=False)
+    else:
+        output_text = result.get("response", "")
+
+    print(output_text)
+    _deliver(output_text, copy_clip, out_file)
+    return 0
 
 
 def run_ask(args: Namespace) -> int:
@@ -48,18 +724,48 @@ def run_ask(args: Namespace) -> int:
     output_json = args.json
     copy_clip = getattr(args, "clip", False)
     out_file = getattr(args, "out", None)
+    if out_file:
+        out_file = resolve_path(out_file)
+    pin = getattr(args, "pin", False)
+    stream = getattr(args, "stream", False)
+    race = getattr(args, "race", False)
+    no_cache = getattr(args, "no_cache", False)
+    refresh = getattr(args, "refresh", False)
+    timeout = getattr(args, "timeout", None)
 
     # Handle case where target is actually the message (when target is omitted)
     # e.g., "hire 'message'" -> target='message', message=None
-    if target and target not in VALID_TARGETS and arg_message is None:
+    targets = parse_targets(target)
+    if target and targets is None and arg_message is None:
         arg_message = target
         target = None
+    elif targets and len(targets) == 1:
+        target = targets[0]
 
     # Build final message from args and stdin
     message = build_message(arg_message, stdin_content)
 
+    # Several targets: ask them all at once (or race them)
+    if targets and len(targets) > 1:
+        if session_id or continue_session:
+            print("Error: --session/--continue cannot be used with multiple targets",
+                  file=sys.stderr)
+            return 1
+        if not message:
+            print("Error: Message is required", file=sys.stderr)
+            return 1
+        if stream:
+            print("Warning: --stream is ignored with multiple targets", file=sys.stderr)
+        if race:
+            return _run_race_command(targets, message, model, name, pin, output_json,
+                                     copy_clip, out_file, no_cache, refresh, timeout)
+        return _run_fanout_command(targets, message, model, name, pin, output_json,
+                                   copy_clip, out_file, no_cache, refresh, timeout)
+    if race:
+        print("Warning: --race needs several targets (e.g. claude,gemini)", file=sys.stderr)
+
     # Load config for defaults
-    from ..config import load_config
+    lookup_start = time.perf_counter()
     config = load_config()
 
     # Determine which session to use
@@ -99,13 +805,13 @@ def run_ask(args: Namespace) -> int:
         # Continue latest session
         if not target:
             # Try to find latest session across all agents
-            sessions = list_sessions()
+            sessions = list_sessions(limit=1)
             if sessions:
                 existing_session = sessions[0]
                 target = existing_session.get("agent")
         else:
             existing_session = get_latest_session(target)
-        
+
         if existing_session:
             cli_session_id = existing_session.get("cli_session_id")
         else:
@@ -126,67 +832,65 @@ def run_ask(args: Namespace) -> int:
         print("Usage: hire <target> <message>", file=sys.stderr)
         return 1
 
-    # Get the adapter for the target agent
+    lookup = time.perf_counter() - lookup_start
+
+    # Print streamed text as it arrives (not with --json, which prints one document)
+    streamed = stream and not output_json
+
+    # Call the agent
     try:
-        adapter = get_adapter(target)
+        with contextlib.ExitStack() as stack:
+            out = None
+            if streamed and out_file:
+                # Tee the streamed text to the output file as it arrives
+                try:
+                    out = stack.enter_context(open(out_file, "w", encoding="utf-8"))
+                except OSError as e:
+                    print(f"(Failed to write to {out_file}: {e})", file=sys.stderr)
+
+            on_event = None
+            if stream:
+                on_event = ((lambda event: _print_event(event, out)) if streamed
+                            else (lambda event: None))
+            result = call_agent(target, message, model=model,
+                                existing_session=existing_session,
+                                cli_session_id=cli_session_id, on_event=on_event,
+                                no_cache=no_cache, refresh=refresh, timeout=timeout)
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
-    # Load conversation history for Grok sessions
-    history = None
-    if target == "grok" and existing_session:
-        history = existing_session.get("messages", [])
-
-    # For Grok, parse @filepath references and extract files
-    file_paths = None
-    if target == "grok":
-        from ..files import extract_file_refs
-        message, file_paths = extract_file_refs(message)
+    def record(exit_code: int, save: float | None = None) -> None:
+        record_call(target, model, "ask", message, result,
+                    {"lookup": lookup, "save": save}, exit=exit_code)
 
-    # Call the agent
-    if target == "grok":
-        result = adapter.ask(message, session_id=cli_session_id, model=model,
-                             history=history, files=file_paths or None)
-    else:
-        result = adapter.ask(message, session_id=cli_session_id, model=model)
+    if result.get("timed_out"):
+        record(EXIT_TIMEOUT)
+        # Hand back what the agent produced before it was stopped
+        if output_json:
+            print(json.dumps({"response": None, "partial": result["partial"], "agent": target,
+                              "error": result["error"], "timed_out": True,
+                              "retries": result.get("retries", 0)},
+                             indent=2, ensure_ascii=False))
+        elif streamed:
+            print()
+        elif result["partial"]:
+            print(result["partial"])
+        print(f"Error: {result['error']}", file=sys.stderr)
+        return EXIT_TIMEOUT
 
     if result.get("error"):
+        record(1)
         print(f"Error: {result['error']}", file=sys.stderr)
         if result.get("raw"):
             print(f"Raw output: {result['raw']}", file=sys.stderr)
         return 1
 
-    # Get the new session ID from the response
-    new_cli_session_id = result.get("session_id")
-
-    # Build updated message history for Grok
-    if target == "grok":
-        updated_messages = list(history) if history else []
-        updated_messages.append({"role": "user", "content": message})
-        if result.get("response"):
-            updated_messages.append({"role": "assistant", "content": result["response"]})
-
     # Save or update session
-    if existing_session and cli_session_id:
-        # Update existing session
-        existing_session["cli_session_id"] = new_cli_session_id or cli_session_id
-        if name:
-            existing_session["name"] = name
-        if target == "grok":
-            existing_session["messages"] = updated_messages
-        save_session(existing_session)
-        session = existing_session
-    else:
-        # Create new session
-        session = create_session(
-            agent=target,
-            cli_session_id=new_cli_session_id or "unknown",
-            name=name,
-        )
-        if target == "grok":
-            session["messages"] = updated_messages
-            save_session(session)
+    save_start = time.perf_counter()
+    session = save_turn(target, message, result, existing_session=existing_session,
+                        cli_session_id=cli_session_id, name=name, pin=pin)
+    record(0, time.perf_counter() - save_start)
 
     # Output
     if output_json:
@@ -196,27 +900,26 @@ def run_ask(args: Namespace) -> int:
             "cli_session_id": session["cli_session_id"],
             "agent": target,
             "name": session.get("name"),
+            "cached": bool(result.get("cached")),
+            "retries": result.get("retries", 0),
+            "usage": result.get("usage"),
         }
+        if result.get("rate_limit_wait"):
+            output["rate_limit_wait"] = result["rate_limit_wait"]
+        if result.get("timings"):
+            output["timings"] = result["timings"]
         output_text = json.dumps(output, indent=2, ensure_ascii=False)
     else:
         output_text = result.get("response", "")
 
-    print(output_text)
-
-    # Copy to clipboard if requested
-    if copy_clip:
-        if copy_to_clipboard(output_text):
-            print("\n(Copied to clipboard)", file=sys.stderr)
-        else:
-            print("\n(Failed to copy to clipboard)", file=sys.stderr)
-
-    # Write to file if requested
-    if out_file:
-        try:
-            with open(out_file, "w", encoding="utf-8") as f:
-                f.write(output_text)
+    if streamed:
+        # Text was already printed (and written to --out) while streaming
+        print()
+        if out:
             print(f"\n(Written to {out_file})", file=sys.stderr)
-        except OSError as e:
-            print(f"\n(Failed to write to {out_file}: {e})", file=sys.stderr)
+        _deliver(output_text, copy_clip, None)
+    else:
+        print(output_text)
+        _deliver(output_text, copy_clip, out_file)
 
     return 0
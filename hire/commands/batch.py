@@ -0,0 +1,358 @@
+"""Batch command implementation.
+
+A batch can be given a budget, from --max-cost / --max-tokens or the config:
+
+    "budget": {"max_cost_usd": 5.0, "max_tokens": 2000000}
+
+Once the jobs finished so far have used more than that, queued jobs are
+cancelled and left out of the checkpoint; jobs already running finish.
+Costs come from result["usage"] (see hire.usage), so jobs whose agent
+reports no cost and has no pricing config don't count towards max_cost_usd.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import time
+from argparse import Namespace
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextvars import copy_context
+from typing import Any
+
+from ..adapters import is_adapter
+from ..adapters.base import kill_all_processes
+from ..adapters.pool import enable_pool
+from ..config import get_adapter_config, load_config
+from ..metrics import percentile, record_call
+from ..paths import resolve_path
+from ..session import find_session
+from ..usage import add_usage, format_usage
+from .ask import call_agent, save_turn
+
+DEFAULT_CONCURRENCY = 4
+
+
+def load_jobs(path: str) -> list[dict[str, Any]]:
+    """Read jobs from a JSONL file.
+
+    Each line is an object with "message" and optionally "target", "model",
+    "session" (name or ID to continue), "name", "files" (relative to the
+    JSONL file), "timeout" and "id". Jobs without an "id" are identified by
+    their line number.
+
+    Raises:
+        ValueError: On a line that is not a JSON object.
+    """
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON: {e}") from None
+            if not isinstance(job, dict):
+                raise ValueError(f"{path}:{lineno}: expected a JSON object")
+            job["id"] = str(job.get("id", lineno))
+            job["line"] = lineno
+            jobs.append(job)
+    return jobs
+
+
+def load_checkpoint(path: str) -> set[str]:
+    """IDs of jobs already completed by a previous run."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def _prepare(
+    job: dict[str, Any], default_agent: str | None, base_dir: str, chain_agents: dict[str, str]
+) -> str:
+    """Resolve a job's target, files and session chain before it is queued.
+
+    Sets job["agent"] and job["file_paths"], and job["chain"] for jobs that
+    continue or name a session: jobs with the same chain run one after
+    another in file order. Sessions are looked up again when the job runs,
+    so a job can continue a session named by an earlier job in the file.
+
+    Returns:
+        An error message, or "" if the job can run.
+    """
+    if not job.get("message"):
+        return "Message is required"
+
+    # Relative paths are relative to the JSONL file
+    job["file_paths"] = []
+    for path in job.get("files") or []:
+        resolved = os.path.abspath(os.path.join(base_dir, os.path.expanduser(path)))
+        if not os.path.exists(resolved):
+            return f"File not found: {path}"
+        job["file_paths"].append(resolved)
+
+    target = job.get("target")
+    ref = job.get("session") or job.get("name")
+    if ref:
+        try:
+            session = find_session(ref)
+        except ValueError as e:
+            return str(e)
+        job["chain"] = session["id"] if session else ref
+        if job.get("session") and session:
+            target = target or session.get("agent")
+        target = target or chain_agents.get(job["chain"])
+
+    target = target or default_agent
+    if not target:
+        return "Target agent is required"
+    if not is_adapter(target):
+        return f"Unknown agent: {target}"
+    job["agent"] = target
+    if ref:
+        chain_agents.setdefault(job["chain"], target)
+    return ""
+
+
+def _run_job(job: dict[str, Any], timeout: float | None = None) -> dict[str, Any]:
+    """Run one job and return its output record."""
+    message = job["message"]
+    start = time.perf_counter()
+
+    existing_session = None
+    if job.get("session"):
+        # Looked up now, so earlier jobs on this session are taken into account
+        existing_session = find_session(job["session"])
+        if not existing_session:
+            return {"id": job["id"], "line": job["line"], "agent": job["agent"],
+                    "response": None, "error": f"Session not found: {job['session']}"}
+    cli_session_id = existing_session.get("cli_session_id") if existing_session else None
+    result = call_agent(job["agent"], message, model=job.get("model"),
+                        existing_session=existing_session, cli_session_id=cli_session_id,
+                        timeout=job.get("timeout", timeout), files=job["file_paths"])
+    record: dict[str, Any] = {"id": job["id"], "line": job["line"], "agent": job["agent"],
+                              "response": result.get("response")}
+    if result.get("retries"):
+        record["retries"] = result["retries"]
+    if result.get("rate_limit_wait"):
+        record["rate_limit_wait"] = result["rate_limit_wait"]
+    if result.get("usage"):
+        record["usage"] = result["usage"]
+    save = None
+    if result.get("error"):
+        record["error"] = result["error"]
+        if result.get("timed_out"):
+            record.update(timed_out=True, partial=result.get("partial", ""))
+    else:
+        save_start = time.perf_counter()
+        session = save_turn(job["agent"], message, result,
+                            existing_session=existing_session,
+                            cli_session_id=cli_session_id, name=job.get("name"))
+        save = time.perf_counter() - save_start
+        record["session_id"] = session["id"]
+        record["cli_session_id"] = session["cli_session_id"]
+    record_call(job["agent"], job.get("model"), "batch", message, result, {"save": save})
+
+    record["elapsed"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def _run_chain(
+    chain: list[tuple["Future[dict[str, Any]]", dict[str, Any]]], timeout: float | None
+) -> None:
+    """Run jobs one after another, completing each job's future.
+
+    Jobs whose future was cancelled (by the budget) are skipped.
+    """
+    for future, job in chain:
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(_run_job(job, timeout))
+        except Exception as e:
+            future.set_exception(e)
+
+
+def _compact_output(path: str) -> None:
+    """Rewrite a resumed run's output with only the last record of each job."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return
+    last: dict[str, str] = {}
+    for line in lines:
+        try:
+            job_id = str(json.loads(line)["id"])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+        last.pop(job_id, None)
+        last[job_id] = line
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(last.values())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"(Failed to rewrite {path}: {e})", file=sys.stderr)
+
+
+def run_batch(args: Namespace) -> int:
+    """Run the batch command."""
+    input_path = resolve_path(args.file)
+    out_path = getattr(args, "out", None)
+    if out_path:
+        out_path = resolve_path(out_path)
+    checkpoint_path = getattr(args, "checkpoint", None)
+    if checkpoint_path:
+        checkpoint_path = resolve_path(checkpoint_path)
+    else:
+        checkpoint_path = f"{input_path}.checkpoint"
+    concurrency = getattr(args, "concurrency", None)
+    timeout = getattr(args, "timeout", None)
+    budget = load_config().get("budget") or {}
+    max_cost = getattr(args, "max_cost", None) or budget.get("max_cost_usd")
+    max_tokens = getattr(args, "max_tokens", None) or budget.get("max_tokens")
+
+    try:
+        jobs = load_jobs(input_path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if getattr(args, "restart", False):
+        done: set[str] = set()
+        open(checkpoint_path, "w").close()
+    else:
+        done = load_checkpoint(checkpoint_path)
+    pending = [job for job in jobs if job["id"] not in done]
+    skipped = len(jobs) - len(pending)
+    if skipped:
+        print(f"Resuming: {skipped} of {len(jobs)} job(s) already done", file=sys.stderr)
+
+    # Jobs can use warm agent processes started while earlier jobs run
+    enable_pool()
+    default_agent = load_config().get("defaults", {}).get("agent")
+    executors: dict[str, ThreadPoolExecutor] = {}
+    futures: dict[Future[dict[str, Any]], dict[str, Any]] = {}
+    latencies: list[float] = []
+    ok = failed = 0
+    spent: dict[str, Any] | None = None
+    over_budget = False
+    start = time.perf_counter()
+
+    def emit(record: dict[str, Any]) -> None:
+        nonlocal ok, failed, spent
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        if record.get("error"):
+            # Failed jobs are left out of the checkpoint so a rerun retries them
+            failed += 1
+            print(f"[{record['id']}] error: {record['error']}", file=sys.stderr)
+        else:
+            ok += 1
+            checkpoint.write(record["id"] + "\n")
+            checkpoint.flush()
+        if "elapsed" in record:
+            latencies.append(record["elapsed"])
+        spent = add_usage(spent, record.get("usage"))
+
+    def budget_exceeded() -> bool:
+        if not spent:
+            return False
+        if max_tokens and spent["total_tokens"] > max_tokens:
+            return True
+        return bool(max_cost and (spent["cost_usd"] or 0) > max_cost)
+
+    interrupted = False
+    with contextlib.ExitStack() as stack:
+        # Resuming appends to the previous output (compacted at the end)
+        out = (stack.enter_context(open(out_path, "a" if skipped else "w", encoding="utf-8"))
+               if out_path else sys.stdout)
+        checkpoint = stack.enter_context(open(checkpoint_path, "a", encoding="utf-8"))
+        try:
+            # Jobs on the same session form one chain, run in file order by one worker
+            base_dir = os.path.dirname(input_path)
+            chain_agents: dict[str, str] = {}
+            chains: dict[str, list[tuple[Future[dict[str, Any]], dict[str, Any]]]] = {}
+            tasks: list[tuple[str, list[tuple[Future[dict[str, Any]], dict[str, Any]]]]] = []
+            for job in pending:
+                error = _prepare(job, default_agent, base_dir, chain_agents)
+                if error:
+                    emit({"id": job["id"], "line": job["line"], "agent": job.get("target"),
+                          "response": None, "error": error})
+                    continue
+                future: Future[dict[str, Any]] = Future()
+                futures[future] = job
+                if job.get("chain") in chains:
+                    chains[job["chain"]].append((future, job))
+                    continue
+                chain = [(future, job)]
+                if job.get("chain"):
+                    chains[job["chain"]] = chain
+                tasks.append((job["agent"], chain))
+
+            for agent, chain in tasks:
+                if agent not in executors:
+                    limit = concurrency or get_adapter_config(agent).get(
+                        "concurrency", DEFAULT_CONCURRENCY)
+                    executors[agent] = ThreadPoolExecutor(max_workers=limit,
+                                                          thread_name_prefix=f"batch-{agent}")
+                # Jobs keep the caller's context (cwd and output under hire serve)
+                executors[agent].submit(copy_context().run, _run_chain, chain, timeout)
+
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                job = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    record = {"id": job["id"], "line": job["line"], "agent": job["agent"],
+                              "response": None, "error": str(e)}
+                emit(record)
+                if not over_budget and spent and budget_exceeded():
+                    over_budget = True
+                    print(f"Budget exceeded ({format_usage(spent)}), "
+                          "cancelling queued jobs", file=sys.stderr)
+                    for queued in futures:
+                        queued.cancel()
+        except KeyboardInterrupt:
+            interrupted = True
+            # Stop the chains from starting their next jobs
+            for queued in futures:
+                queued.cancel()
+            kill_all_processes()
+            print("\nInterrupted, finished jobs are checkpointed", file=sys.stderr)
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=not interrupted, cancel_futures=True)
+
+    if out_path and skipped:
+        _compact_output(out_path)
+
+    elapsed = time.perf_counter() - start
+    total = ok + failed
+    summary = f"{total} job(s) in {elapsed:.1f}s: {ok} ok, {failed} failed"
+    if skipped:
+        summary += f", {skipped} skipped"
+    if over_budget:
+        summary += f", {len(pending) - total} cancelled by budget"
+    if total and elapsed > 0:
+        summary += f" ({total / elapsed:.2f} jobs/s)"
+    print(summary, file=sys.stderr)
+    if latencies:
+        print(
+            f"Latency: p50 {percentile(latencies, 0.5):.2f}s, "
+            f"p95 {percentile(latencies, 0.95):.2f}s, max {max(latencies):.2f}s",
+            file=sys.stderr,
+        )
+    if spent:
+        print(f"Usage: {format_usage(spent)}", file=sys.stderr)
+
+    if interrupted:
+        return 130
+    return 1 if failed or over_budget else 0
@@ -0,0 +1,50 @@
+"""Cache command implementation."""
+
+import json
+from argparse import Namespace
+from datetime import datetime
+
+from ..cache import cache_stats, clear_cache
+from ..config import load_config
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def run_cache(args: Namespace) -> int:
+    """Run the cache command (stats or clear)."""
+    action = args.action
+    agent = getattr(args, "agent", None)
+
+    if action == "clear":
+        removed = clear_cache(agent)
+        scope = f" for {agent}" if agent else ""
+        print(f"Removed {removed} cached response(s){scope}")
+        return 0
+
+    stats = cache_stats()
+    stats["enabled"] = bool((load_config().get("cache") or {}).get("enabled"))
+
+    if getattr(args, "json", False):
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+        return 0
+
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f" ({stats['hits'] / lookups:.0%} hit rate)" if lookups else ""
+    oldest = (
+        datetime.fromtimestamp(stats["oldest"]).strftime("%Y-%m-%d %H:%M:%S")
+        if stats["oldest"] else "-"
+    )
+    print(f"Enabled: {'yes' if stats['enabled'] else 'no'}")
+    print(f"Path:    {stats['path']}")
+    print(f"Entries: {stats['entries']} ({_format_size(stats['size'])})")
+    for name, count in stats["agents"].items():
+        print(f"  {name}: {count}")
+    print(f"Oldest:  {oldest}")
+    print(f"Hits:    {stats['hits']}, misses: {stats['misses']}{hit_rate}")
+    return 0
@@ -1,9 +1,11 @@
 """Delete command implementation."""
 
 import sys
+import time
 from argparse import Namespace
 
-from ..session import delete_session, find_session, list_sessions
+from ..index import count_sessions
+from ..session import delete_session, delete_sessions, find_session
 
 
 def run_delete(args: Namespace) -> int:
@@ -11,33 +13,46 @@ def run_delete(args: Namespace) -> int:
     name_or_id = getattr(args, "name_or_id", None)
     delete_all = getattr(args, "all", False)
     force = getattr(args, "force", False)
+    agent = getattr(args, "agent", None)
+    older_than = getattr(args, "older_than", None)
 
-    # Delete all sessions
-    if delete_all:
-        sessions = list_sessions()
-        if not sessions:
+    # Bulk delete (all, by agent and/or by age)
+    if delete_all or agent or older_than:
+        if name_or_id:
+            # Otherwise `hire delete my-session --agent codex` would delete every codex session
+            print(
+                "Error: Give either a session name or ID, or --all/--agent/--older-than",
+                file=sys.stderr,
+            )
+            return 1
+        count = count_sessions(agent=agent, before=older_than)
+        if not count:
             print("No sessions to delete")
             return 0
 
         # Confirm deletion unless --force
         if not force:
-            print(f"Delete all {len(sessions)} session(s)?")
+            scope = "all " if delete_all and not (agent or older_than) else ""
+            print(f"Delete {scope}{count} session(s)?")
             response = input("Type 'yes' to confirm: ")
             if response.lower() != "yes":
                 print("Cancelled")
                 return 0
 
-        deleted = 0
-        for session in sessions:
-            if delete_session(session):
-                deleted += 1
+        start = time.perf_counter()
+        deleted = delete_sessions(agent=agent, before=older_than)
+        elapsed = time.perf_counter() - start
 
-        print(f"Deleted {deleted} session(s)")
+        rate = f", {deleted / elapsed:.0f}/s" if elapsed > 0 else ""
+        print(f"Deleted {deleted} session(s) in {elapsed:.2f}s{rate}")
         return 0
 
     # Delete single session
     if not name_or_id:
-        print("Error: Session name or ID required (or use --all)", file=sys.stderr)
+        print(
+            "Error: Session name or ID required (or use --all, --agent, --older-than)",
+            file=sys.stderr,
+        )
         return 1
 
     try:
@@ -0,0 +1,10 @@
+"""Serve command implementation."""
+
+from argparse import Namespace
+
+from ..daemon import serve
+
+
+def run_serve(args: Namespace) -> int:
+    """Run the serve command."""
+    return serve()
@@ -1,38 +1,62 @@
 """Sessions command implementation."""
 
 import json
+import sys
 from argparse import Namespace
+from typing import Any
 
-from ..session import list_sessions
+from ..index import query_sessions, rebuild_index
+from ..session import iter_sessions
 
 
 def run_sessions(args: Namespace) -> int:
     """Run the sessions command."""
-    target = args.target
+    target = args.target or getattr(args, "agent", None)
     output_json = getattr(args, "json", False)
-
-    sessions = list_sessions(agent=target)
+    output_ndjson = getattr(args, "ndjson", False)
+    filters: dict[str, Any] = {
+        "agent": target,
+        "limit": getattr(args, "limit", None),
+        "since": getattr(args, "since", None),
+        "name_glob": getattr(args, "name_glob", None),
+    }
+
+    if getattr(args, "reindex", False):
+        count = rebuild_index()
+        print(f"Indexed {count} session(s)", file=sys.stderr)
+
+    if output_ndjson:
+        # Stream one session per line as it is read
+        for session in iter_sessions(**filters):
+            sys.stdout.write(json.dumps(session, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+        return 0
 
     if output_json:
+        sessions = list(iter_sessions(**filters))
         print(json.dumps(sessions, indent=2, ensure_ascii=False))
-    else:
-        if not sessions:
-            if target:
-                print(f"No sessions found for {target}")
-            else:
-                print("No sessions found")
-            return 0
-
-        # Print table header
-        print(f"{'AGENT':<10} {'NAME':<20} {'ID':<10} {'UPDATED':<20}")
-        print("-" * 62)
-
-        for session in sessions:
-            agent = session.get("agent", "")
-            name = session.get("name", "-") or "-"
-            session_id = session.get("id", "")[:8]
-            updated = session.get("updated_at", "")[:19].replace("T", " ")
-
-            print(f"{agent:<10} {name:<20} {session_id:<10} {updated:<20}")
+        return 0
+
+    # The table only needs indexed fields, so session files are never opened
+    printed = False
+    for session in query_sessions(**filters):
+        if not printed:
+            # Print table header
+            print(f"{'AGENT':<10} {'NAME':<20} {'ID':<10} {'UPDATED':<20}")
+            print("-" * 62)
+            printed = True
+
+        agent = session.get("agent", "")
+        name = session.get("name", "-") or "-"
+        session_id = session.get("id", "")[:8]
+        updated = session.get("updated_at", "")[:19].replace("T", " ")
+
+        print(f"{agent:<10} {name:<20} {session_id:<10} {updated:<20}")
+
+    if not printed:
+        if target:
+            print(f"No sessions found for {target}")
+        else:
+            print("No sessions found")
 
     return 0
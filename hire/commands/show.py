@@ -5,6 +5,7 @@ import sys
 from argparse import Namespace
 
 from ..session import find_session
+from ..usage import format_usage
 
 
 def run_show(args: Namespace) -> int:
@@ -29,6 +30,13 @@ def run_show(args: Namespace) -> int:
         print(f"Agent:   {session.get('agent')}")
         print(f"Name:    {session.get('name', '-')}")
         print(f"CLI ID:  {session.get('cli_session_id')}")
+        if "turns" in session:
+            print(f"Turns:   {session['turns']}")
+        if session.get("usage"):
+            print(f"Usage:   {format_usage(session['usage'])}")
+        if session.get("elided_messages"):
+            print(f"Elided:  {session['elided_messages']} message(s) "
+                  "(oldest dropped by context budget)")
         print(f"Created: {session.get('created_at')}")
         print(f"Updated: {session.get('updated_at')}")
 
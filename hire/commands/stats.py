@@ -0,0 +1,37 @@
+"""Stats command implementation."""
+
+import json
+from argparse import Namespace
+
+from ..metrics import read_metrics, summarize
+
+
+def _seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def run_stats(args: Namespace) -> int:
+    """Run the stats command."""
+    since = getattr(args, "since", None)
+    rows = read_metrics(since=since, agent=getattr(args, "agent", None))
+    summary = summarize(rows, since=since)
+
+    if getattr(args, "json", False):
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return 0
+
+    if not summary:
+        print("No calls recorded" + (" in this window" if since else ""))
+        return 0
+
+    print(f"{'AGENT':<8} {'MODEL':<22} {'CALLS':>6} {'ERRORS':>7} {'P50':>8} {'P95':>8} "
+          f"{'P99':>8} {'1ST BYTE':>9} {'CALLS/MIN':>10}")
+    print("-" * 94)
+    for s in summary:
+        print(
+            f"{s['agent']:<8} {(s['model'] or '(default)')[:22]:<22} {s['calls']:>6} "
+            f"{s['error_rate']:>7.1%} {_seconds(s.get('p50')):>8} {_seconds(s.get('p95')):>8} "
+            f"{_seconds(s.get('p99')):>8} {_seconds(s.get('first_byte_p50')):>9} "
+            f"{s['calls_per_minute']:>10.2f}"
+        )
+    return 0
@@ -2,6 +2,7 @@
 
 import copy
 import json
+import threading
 from typing import Any
 
 from .paths import get_config_path
@@ -45,17 +46,43 @@ def _deep_merge(base: dict, override: dict) -> dict:
     return result
 
 
+# Process-wide cache of the merged config, keyed by the file's identity
+_cache_lock = threading.Lock()
+_cached_key: tuple[str, int, int] | None = None
+_cached_config: dict[str, Any] | None = None
+
+
 def load_config() -> dict[str, Any]:
-    """Load configuration from file, merged with defaults."""
+    """Load configuration from file, merged with defaults.
+
+    The result is cached for the process and reloaded when the config file
+    changes (by mtime/size), so repeated calls only cost a stat(). Callers
+    must not modify the returned dict; deep-copy it first if needed.
+    """
+    global _cached_key, _cached_config
     config_path = get_config_path()
-    if config_path.exists():
+    try:
+        st = config_path.stat()
+        key = (str(config_path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = (str(config_path), 0, -1)
+
+    with _cache_lock:
+        if _cached_config is not None and _cached_key == key:
+            return _cached_config
+
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if key[2] >= 0:
         try:
             with open(config_path, encoding="utf-8") as f:
                 user_config = json.load(f)
-            return _deep_merge(DEFAULT_CONFIG, user_config)
+            config = _deep_merge(DEFAULT_CONFIG, user_config)
         except (OSError, json.JSONDecodeError):
             pass
-    return copy.deepcopy(DEFAULT_CONFIG)
+
+    with _cache_lock:
+        _cached_key, _cached_config = key, config
+    return config
 
 
 def save_config(config: dict[str, Any]) -> None:
@@ -63,6 +90,14 @@ def save_config(config: dict[str, Any]) -> None:
     config_path = get_config_path()
     with open(config_path, "w", encoding="utf-8") as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
+    clear_config_cache()
+
+
+def clear_config_cache() -> None:
+    """Forget the cached config so the next load_config() rereads the file."""
+    global _cached_key, _cached_config
+    with _cache_lock:
+        _cached_key, _cached_config = None, None
 
 
 def get_adapter_config(agent: str) -> dict[str, Any]:
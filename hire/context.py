@@ -0,0 +1,96 @@
+"""Conversation context budgeting for history-replaying adapters."""
+
+import json
+from typing import Any
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheaply estimate the token count of a text.
+
+    Roughly 4 ASCII characters per token; non-ASCII characters (CJK etc.)
+    are counted as one token each.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def _content_text(message: dict[str, Any]) -> str:
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, ensure_ascii=False)
+
+
+def message_tokens(message: dict[str, Any]) -> int:
+    """Estimate the tokens a message contributes to the context."""
+    # A few tokens of per-message overhead for role/formatting
+    return estimate_tokens(_content_text(message)) + 4
+
+
+def message_bytes(message: dict[str, Any]) -> int:
+    """Size of a message once serialized into the request."""
+    return len(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+def to_api_message(message: dict[str, Any]) -> dict[str, Any]:
+    """Strip local-only fields (e.g. "pinned") from a transcript message."""
+    return {"role": message["role"], "content": message["content"]}
+
+
+def fit_history(
+    messages: list[dict[str, Any]],
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+    reserve_tokens: int = 0,
+    reserve_bytes: int = 0,
+) -> tuple[list[dict[str, Any]], int]:
+    """Trim history to fit a context budget.
+
+    Keeps pinned messages and the most recent messages; the oldest unpinned
+    messages are dropped first.
+
+    Args:
+        messages: Conversation history, oldest first
+        max_tokens: Token budget for history plus reserve (None = unlimited)
+        max_bytes: Byte budget for history plus reserve (None = unlimited)
+        reserve_tokens: Tokens already used by the new turn
+        reserve_bytes: Bytes already used by the new turn
+
+    Returns:
+        (kept_messages, elided_count)
+    """
+    if not max_tokens and not max_bytes:
+        return list(messages), 0
+
+    tokens = reserve_tokens
+    size = reserve_bytes
+    keep = [False] * len(messages)
+
+    # Pinned messages are always kept
+    for i, message in enumerate(messages):
+        if message.get("pinned"):
+            keep[i] = True
+            tokens += message_tokens(message)
+            size += message_bytes(message)
+
+    # Fill the remaining budget from the newest message backwards
+    for i in range(len(messages) - 1, -1, -1):
+        if keep[i]:
+            continue
+        t = message_tokens(messages[i])
+        b = message_bytes(messages[i])
+        if (max_tokens and tokens + t > max_tokens) or (max_bytes and size + b > max_bytes):
+            break
+        keep[i] = True
+        tokens += t
+        size += b
+
+    # Don't keep assistant replies whose user message was dropped
+    for i, message in enumerate(messages):
+        if (keep[i] and message.get("role") == "assistant" and not message.get("pinned")
+                and (i == 0 or not keep[i - 1])):
+            keep[i] = False
+
+    kept = [m for i, m in enumerate(messages) if keep[i]]
+
+    return kept, len(messages) - len(kept)
@@ -0,0 +1,314 @@
+"""`hire serve` daemon and the client that forwards CLI calls to it.
+
+The daemon runs each request in a thread of one long-lived process, so the
+config, session index, resolved agent binaries and HTTP connection pool
+stay warm between calls. Requests and replies are JSON lines over a Unix
+socket in the data directory:
+
+    client -> server  {"argv": [...], "cwd": "...", "env": {...},
+                       "stdin": "..." | null, "isatty": bool}
+    server -> client  {"fd": 1 | 2, "data": "..."}  (repeated, as output is written)
+                      {"exit": <code>}
+
+Output is routed per request (see _RoutedStream), so concurrent clients
+each get only their own stdout/stderr. The request runs with the client's
+working directory and environment (paths.get_cwd/get_env), and is cancelled
+when the client closes the connection early (e.g. on Ctrl-C).
+"""
+
+import contextlib
+import json
+import os
+import socket
+import sys
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    import threading
+
+    from .adapters.base import CancelScope
+
+SOCKET_FILENAME = "serve.sock"
+
+
+def get_socket_path() -> Path:
+    """Socket path: $HIRE_SOCKET, or serve.sock in the data directory."""
+    if os.environ.get("HIRE_SOCKET"):
+        return Path(os.environ["HIRE_SOCKET"])
+
+    from .paths import get_data_dir
+
+    return get_data_dir() / SOCKET_FILENAME
+
+
+# Client
+
+def forward(argv: list[str], send_stdin: bool) -> int | None:
+    """Run a CLI call through a running daemon.
+
+    Args:
+        argv: CLI arguments (without the program name)
+        send_stdin: Whether the command reads piped stdin (the ask action)
+
+    Returns:
+        The exit code, or None if no daemon is running (run locally instead).
+    """
+    if os.environ.get("HIRE_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = get_socket_path()
+    if not path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        # Stale socket file from a daemon that is gone
+        sock.close()
+        return None
+
+    with sock:
+        isatty = sys.stdin is None or sys.stdin.isatty()
+        stdin = sys.stdin.read() if send_stdin and not isatty else None
+        request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ),
+                   "stdin": stdin, "isatty": isatty}
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            for line in sock.makefile("r", encoding="utf-8"):
+                message = json.loads(line)
+                if "exit" in message:
+                    return int(message["exit"])
+                stream = sys.stdout if message.get("fd") == 1 else sys.stderr
+                stream.write(message.get("data", ""))
+                stream.flush()
+        except KeyboardInterrupt:
+            # Closing the connection makes the daemon cancel the request
+            print("\nInterrupted", file=sys.stderr)
+            return 130
+        except OSError as e:
+            print(f"Error: connection to hire serve failed: {e}", file=sys.stderr)
+            return 1
+
+    print("Error: hire serve closed the connection", file=sys.stderr)
+    return 1
+
+
+# Server
+
+class _DisconnectedError(Exception):
+    """The client went away while its output was being sent."""
+
+
+class _Client:
+    """Sends a request's output frames back over its connection."""
+
+    def __init__(self, conn: socket.socket):
+        self._conn = conn
+        import threading
+
+        self._lock = threading.Lock()
+
+    def send(self, message: dict[str, Any]) -> None:
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            try:
+                self._conn.sendall(data)
+            except OSError as e:
+                # Aborts the request (not an OSError, so commands don't handle it)
+                raise _DisconnectedError(str(e)) from e
+
+
+_client: ContextVar[_Client | None] = ContextVar("client", default=None)
+_stdin: ContextVar[tuple[str | None, bool] | None] = ContextVar("stdin", default=None)
+
+
+class _RoutedStream:
+    """sys.stdout/sys.stderr replacement that writes to the current request's client."""
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, fd: int, fallback: TextIO):
+        self.fd = fd
+        self._fallback = fallback
+
+    def write(self, data: str) -> int:
+        client = _client.get()
+        if client is None:
+            return self._fallback.write(data)
+        if data:
+            client.send({"fd": self.fd, "data": data})
+        return len(data)
+
+    def flush(self) -> None:
+        if _client.get() is None:
+            self._fallback.flush()
+
+    def isatty(self) -> bool:
+        return False if _client.get() else self._fallback.isatty()
+
+    def fileno(self) -> int:
+        return self._fallback.fileno()
+
+
+class _RoutedStdin:
+    """sys.stdin replacement serving the stdin content sent by the client."""
+
+    def __init__(self, fallback: TextIO):
+        self._fallback = fallback
+
+    def isatty(self) -> bool:
+        request = _stdin.get()
+        return self._fallback.isatty() if request is None else request[1]
+
+    def read(self, size: int = -1) -> str:
+        request = _stdin.get()
+        if request is None:
+            return self._fallback.read(size)
+        return request[0] or ""
+
+    def readline(self, size: int = -1) -> str:
+        # Interactive prompts are not supported through the daemon
+        return "" if _stdin.get() is not None else self._fallback.readline(size)
+
+
+def _watch_disconnect(
+    conn: socket.socket, scope: "CancelScope", done: "threading.Event"
+) -> None:
+    """Cancel the request if the client closes the connection before it is done."""
+    # Clients send nothing after the request, so recv() returns b"" at EOF
+    with contextlib.suppress(OSError):
+        while conn.recv(4096):
+            pass
+    if not done.is_set():
+        scope.cancel()
+
+
+def _handle(conn: socket.socket) -> None:
+    """Run one client request."""
+    import threading
+
+    from .adapters.base import CancelScope, cancel_scope
+    from .cli import run
+    from .paths import request_cwd, request_env
+
+    reader = conn.makefile("r", encoding="utf-8")
+    line = reader.readline()
+    if not line:
+        return
+    request = json.loads(line)
+    client = _Client(conn)
+
+    _client.set(client)
+    _stdin.set((request.get("stdin"), bool(request.get("isatty", True))))
+    request_cwd.set(request.get("cwd") or None)
+    env = request.get("env")
+    request_env.set(env if isinstance(env, dict) else None)
+    scope = CancelScope()
+    cancel_scope.set(scope)
+    done = threading.Event()
+    threading.Thread(target=_watch_disconnect, args=(conn, scope, done), daemon=True).start()
+
+    try:
+        code = run(request.get("argv") or [])
+    except SystemExit as e:
+        # argparse errors and --help
+        if isinstance(e.code, str):
+            print(e.code, file=sys.stderr)
+            code = 1
+        else:
+            code = e.code or 0
+    except _DisconnectedError:
+        return
+    except Exception as e:
+        if scope.cancelled:
+            # Fallout of the client going away: there is no one to report to
+            return
+        import traceback
+
+        traceback.print_exc()
+        print(f"Error: {e}", file=sys.stderr)
+        code = 1
+    finally:
+        done.set()
+
+    with contextlib.suppress(_DisconnectedError):
+        client.send({"exit": code})
+
+
+def _warm_up() -> None:
+    """Load what every request needs before the first client arrives."""
+    from . import commands
+    from .adapters import BUILTIN_ADAPTERS, get_adapter_class
+    from .adapters.base import resolve_command
+    from .config import load_config
+    from .index import count_sessions
+
+    config = load_config()
+    count_sessions()
+    commands.run_ask  # noqa: B018 - imports the ask command and its dependencies
+    for agent in BUILTIN_ADAPTERS:
+        get_adapter_class(agent)
+        command = config.get("adapters", {}).get(agent, {}).get("command")
+        if command:
+            resolve_command(command)
+
+
+def serve() -> int:
+    """Run the daemon in the foreground until interrupted."""
+    import signal
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: hire serve needs Unix domain sockets", file=sys.stderr)
+        return 1
+
+    path = get_socket_path()
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+            print(f"Error: hire serve is already running on {path}", file=sys.stderr)
+            return 1
+        except OSError:
+            path.unlink()
+        finally:
+            probe.close()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            _handle(self.request)
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    from .adapters.pool import enable_pool
+
+    _warm_up()
+    enable_pool()
+    sys.stdout = _RoutedStream(1, sys.stdout)
+    sys.stderr = _RoutedStream(2, sys.stderr)
+    sys.stdin = _RoutedStdin(sys.stdin)
+
+    old_umask = os.umask(0o077)  # The socket runs agents as this user: owner only
+    try:
+        server = Server(str(path), Handler)
+    finally:
+        os.umask(old_umask)
+
+    def stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"hire serve listening on {path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping", file=sys.stderr)
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            path.unlink()
+    return 0
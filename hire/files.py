@@ -3,6 +3,8 @@
 import os
 import re
 
+from .paths import resolve_path
+
 
 def extract_file_refs(message: str) -> tuple[str, list[str]]:
     """Extract @filepath references from a message.
@@ -26,7 +28,7 @@ def extract_file_refs(message: str) -> tuple[str, list[str]]:
     removals: list[tuple[int, int]] = []
     for match in tokens:
         candidate = match.group(1)
-        resolved = os.path.abspath(candidate)
+        resolved = resolve_path(candidate)
         if os.path.exists(resolved):
             file_paths.append(resolved)
             removals.append((match.start(), match.end()))
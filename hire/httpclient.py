@@ -0,0 +1,298 @@
+"""Small HTTP client with per-host keep-alive connection pooling.
+
+All API calls in a process share one pool (see get_pool), so a request with
+several attachments, or many requests from batch/concurrent use, reuse
+established TCP/TLS connections instead of handshaking every time.
+"""
+
+import contextlib
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+from urllib.parse import urlsplit
+
+# Errors raised for network/protocol failures (as opposed to HTTP error statuses)
+TRANSPORT_ERRORS = (OSError, http.client.HTTPException)
+
+# Failures that mean a reused keep-alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+Body = bytes | Callable[[], Iterable[bytes]] | None
+
+
+class HTTPError(Exception):
+    """An HTTP response with an error status (>= 400)."""
+
+    def __init__(self, status: int, reason: str, body: bytes, headers: dict[str, str]):
+        super().__init__(f"HTTP {status} {reason}")
+        self.code = status
+        self.reason = reason
+        self.body = body
+        self.headers = headers
+
+
+class AbortedError(OSError):
+    """The request was aborted through an AbortSignal."""
+
+
+class AbortSignal:
+    """Lets another thread abort in-flight requests (e.g. the losers of a race).
+
+    Pass the same signal to every request that should be aborted together;
+    after abort(), their sockets are shut down and new requests fail at once.
+    """
+
+    def __init__(self) -> None:
+        self.aborted = False
+        self._conns: set[http.client.HTTPConnection] = set()
+        self._children: weakref.WeakSet[AbortSignal] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def child(self) -> "AbortSignal":
+        """A signal that is aborted with this one, but can also be aborted on its own."""
+        signal = AbortSignal()
+        with self._lock:
+            if not self.aborted:
+                self._children.add(signal)
+                return signal
+        signal.abort()
+        return signal
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            conns = list(self._conns)
+            children = list(self._children)
+        for child in children:
+            child.abort()
+        for conn in conns:
+            if conn.sock is not None:
+                # Wakes up a thread blocked reading from this socket
+                with contextlib.suppress(OSError):
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+
+    def _add(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if self.aborted:
+                raise AbortedError("Request aborted")
+            self._conns.add(conn)
+
+    def _discard(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._conns.discard(conn)
+
+
+class Response:
+    """A response whose connection returns to the pool once fully read."""
+
+    def __init__(
+        self,
+        pool: "ConnectionPool",
+        key: tuple[str, str, int],
+        conn: http.client.HTTPConnection,
+        resp: http.client.HTTPResponse,
+        ttfb: float,
+        abort: AbortSignal | None = None,
+    ):
+        self.status = resp.status
+        self.reason = resp.reason
+        self.headers = {k.lower(): v for k, v in resp.getheaders()}
+        self.ttfb = ttfb
+        self._pool = pool
+        self._key = key
+        self._conn: http.client.HTTPConnection | None = conn
+        self._resp = resp
+        self._abort = abort
+
+    def read(self) -> bytes:
+        """Read the whole body and release the connection."""
+        try:
+            data = self._resp.read()
+        except BaseException:
+            self.close(reuse=False)
+            raise
+        self.close()
+        return data
+
+    def json(self) -> Any:
+        return json.loads(self.read().decode("utf-8"))
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """Yield body lines as they arrive (for streaming responses)."""
+        try:
+            while line := self._resp.readline():
+                yield line
+            if self._abort and self._abort.aborted:
+                raise AbortedError("Request aborted")
+        except BaseException:
+            self.close(reuse=False)
+            raise
+        self.close()
+
+    def close(self, reuse: bool = True) -> None:
+        """Release the connection (to the pool if the body was fully read)."""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        if self._abort:
+            self._abort._discard(conn)
+            reuse = reuse and not self._abort.aborted
+        if reuse and self._resp.isclosed() and not self._resp.will_close:
+            self._pool._release(self._key, conn)
+        else:
+            self._resp.close()
+            conn.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close(reuse=not exc[0])
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, pooled per (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host: int = 8):
+        self.max_idle_per_host = max_idle_per_host
+        self.connections_opened = 0
+        self.requests = 0
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: ssl.SSLContext | None = None
+
+    def _new_connection(
+        self, key: tuple[str, str, int], timeout: float | None
+    ) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        with self._lock:
+            self.connections_opened += 1
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(self, key: tuple[str, str, int]) -> http.client.HTTPConnection | None:
+        with self._lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Body = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        abort: AbortSignal | None = None,
+    ) -> Response:
+        """Send a request and return the response once headers arrive.
+
+        Args:
+            body: Bytes, or a zero-argument callable returning an iterable of
+                byte chunks (called again if the request has to be resent)
+            timeout: Socket timeout in seconds
+            abort: Signal that can abort the request from another thread
+
+        Raises:
+            HTTPError: For responses with status >= 400 (body already read).
+            OSError, http.client.HTTPException: On network failures
+                (AbortedError if the abort signal fired).
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        with self._lock:
+            self.requests += 1
+
+        conn = self._acquire(key)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._new_connection(key, timeout)
+            else:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+            start = time.perf_counter()
+            try:
+                if abort:
+                    # Connect first so abort() has a socket to shut down
+                    if conn.sock is None:
+                        conn.connect()
+                    abort._add(conn)
+                conn.request(
+                    method,
+                    path,
+                    body=body() if callable(body) else body,
+                    headers=headers or {},
+                )
+                resp = conn.getresponse()
+                break
+            except _STALE_CONNECTION_ERRORS:
+                conn.close()
+                if abort:
+                    abort._discard(conn)
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection: retry once fresh
+                conn, reused = None, False
+            except BaseException:
+                conn.close()
+                if abort:
+                    abort._discard(conn)
+                raise
+
+        response = Response(self, key, conn, resp, time.perf_counter() - start, abort)
+        if response.status >= 400:
+            raise HTTPError(response.status, response.reason, response.read(), response.headers)
+        return response
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Get the process-wide shared connection pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
@@ -0,0 +1,262 @@
+"""Persistent session index (SQLite).
+
+Session bodies live in ``sessions/<agent>/<id>.json``. The index keeps the
+small set of fields needed to resolve and order sessions (id, agent, name,
+timestamps) so lookups never have to open the session files.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .paths import get_sessions_dir
+
+INDEX_FILENAME = "index.db"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    name TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_name ON sessions(name);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated_at);
+CREATE INDEX IF NOT EXISTS sessions_agent_updated ON sessions(agent, updated_at);
+"""
+
+# One connection per index file, shared across threads (guarded by _lock)
+_lock = threading.RLock()
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    """Get a connection to the index, creating and populating it if needed."""
+    path = get_sessions_dir() / INDEX_FILENAME
+    with _lock:
+        conn = _connections.get(path)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        _connections[path] = conn
+
+        if version != SCHEMA_VERSION:
+            # New or outdated index: (re)create it from the session files
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS sessions")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            rebuild_index()
+        return conn
+
+
+def _row(session: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        session["id"],
+        session["agent"],
+        session.get("name"),
+        session.get("created_at") or "",
+        session.get("updated_at") or "",
+    )
+
+
+def add_to_index(session: dict[str, Any]) -> None:
+    """Insert or update a session in the index."""
+    conn = _connect()
+    with _lock, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (id, agent, name, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            _row(session),
+        )
+
+
+def remove_from_index(session_id: str) -> None:
+    """Remove a session from the index."""
+    conn = _connect()
+    with _lock, conn:
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+
+def remove_many_from_index(session_ids: list[str]) -> None:
+    """Remove several sessions from the index in one transaction."""
+    conn = _connect()
+    with _lock, conn:
+        conn.executemany("DELETE FROM sessions WHERE id = ?", [(sid,) for sid in session_ids])
+
+
+def find_by_id(session_id: str) -> list[tuple[str, str]]:
+    """Find sessions by exact ID or ID prefix.
+
+    Returns:
+        List of (id, agent). An exact match is returned alone.
+    """
+    if not session_id:
+        return []
+
+    conn = _connect()
+    with _lock:
+        row = conn.execute(
+            "SELECT id, agent FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row:
+            return [(row["id"], row["agent"])]
+
+        # Prefix match as a range scan on the primary key
+        upper = session_id[:-1] + chr(ord(session_id[-1]) + 1)
+        rows = conn.execute(
+            "SELECT id, agent FROM sessions WHERE id >= ? AND id < ?",
+            (session_id, upper),
+        ).fetchall()
+    return [(r["id"], r["agent"]) for r in rows]
+
+
+def find_by_name(name: str) -> tuple[str, str] | None:
+    """Find the most recently updated session with this name.
+
+    Returns:
+        (id, agent) or None.
+    """
+    conn = _connect()
+    with _lock:
+        row = conn.execute(
+            "SELECT id, agent FROM sessions WHERE name = ? ORDER BY updated_at DESC LIMIT 1",
+            (name,),
+        ).fetchone()
+    return (row["id"], row["agent"]) if row else None
+
+
+def _filters(
+    agent: str | None = None,
+    since: str | None = None,
+    name_glob: str | None = None,
+    before: str | None = None,
+) -> tuple[list[str], list[Any]]:
+    """Build WHERE clauses and parameters for session filters."""
+    where: list[str] = []
+    params: list[Any] = []
+    if agent:
+        where.append("agent = ?")
+        params.append(agent)
+    if since:
+        where.append("updated_at >= ?")
+        params.append(since)
+    if before:
+        where.append("updated_at < ?")
+        params.append(before)
+    if name_glob:
+        where.append("name GLOB ?")
+        params.append(name_glob)
+    return where, params
+
+
+def count_sessions(
+    agent: str | None = None,
+    since: str | None = None,
+    name_glob: str | None = None,
+    before: str | None = None,
+) -> int:
+    """Count indexed sessions matching the filters."""
+    where, params = _filters(agent=agent, since=since, name_glob=name_glob, before=before)
+    sql = "SELECT COUNT(*) FROM sessions"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    conn = _connect()
+    with _lock:
+        return int(conn.execute(sql, params).fetchone()[0])
+
+
+def query_sessions(
+    agent: str | None = None,
+    since: str | None = None,
+    name_glob: str | None = None,
+    limit: int | None = None,
+    before: str | None = None,
+    page_size: int = 500,
+) -> Iterator[dict[str, Any]]:
+    """Yield indexed sessions, most recently updated first.
+
+    Rows are fetched in keyset-paginated pages, so iterating the whole
+    index runs in constant memory and the first rows arrive immediately.
+
+    Args:
+        agent: Only sessions for this agent
+        since: Only sessions updated at or after this ISO timestamp
+        name_glob: Only sessions whose name matches this glob pattern
+        limit: Maximum number of rows to yield
+        before: Only sessions updated before this ISO timestamp
+        page_size: Rows fetched per query
+
+    Yields:
+        dicts with id, agent, name, created_at and updated_at.
+    """
+    where, params = _filters(agent=agent, since=since, name_glob=name_glob, before=before)
+    conn = _connect()
+    remaining = limit
+    cursor: tuple[str, str] | None = None
+
+    while remaining is None or remaining > 0:
+        page_where = list(where)
+        page_params = list(params)
+        if cursor:
+            page_where.append("(updated_at, id) < (?, ?)")
+            page_params.extend(cursor)
+        size = page_size if remaining is None else min(page_size, remaining)
+
+        sql = "SELECT id, agent, name, created_at, updated_at FROM sessions"
+        if page_where:
+            sql += " WHERE " + " AND ".join(page_where)
+        sql += " ORDER BY updated_at DESC, id DESC LIMIT ?"
+
+        with _lock:
+            rows = conn.execute(sql, (*page_params, size)).fetchall()
+
+        for row in rows:
+            yield dict(row)
+        if len(rows) < size:
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+        cursor = (rows[-1]["updated_at"], rows[-1]["id"])
+
+
+def rebuild_index() -> int:
+    """Rebuild the index from the session files on disk.
+
+    Returns:
+        Number of sessions indexed.
+    """
+    sessions_base = get_sessions_dir()
+    rows: list[tuple[Any, ...]] = []
+
+    for agent_dir in sessions_base.iterdir():
+        if not agent_dir.is_dir():
+            continue
+        for session_file in agent_dir.glob("*.json"):
+            if session_file.name == "latest.json":
+                continue
+            try:
+                with open(session_file, encoding="utf-8") as f:
+                    rows.append(_row(json.load(f)))
+            except (OSError, json.JSONDecodeError, KeyError):
+                continue
+
+    conn = _connect()
+    with _lock, conn:
+        conn.execute("DELETE FROM sessions")
+        conn.executemany(
+            "INSERT OR REPLACE INTO sessions (id, agent, name, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
@@ -0,0 +1,135 @@
+"""Per-call metrics, appended to metrics.jsonl in the data directory.
+
+One JSON line per agent call: agent, model, where it came from (ask,
+fanout, race, batch), status, phase timings in seconds (lookup, spawn,
+first_byte, total, save; missing when they don't apply), request and
+response sizes and token usage. Writing is a single append; once the file passes
+MAX_METRICS_SIZE it is rotated to metrics.jsonl.1. Disable with
+"metrics": {"enabled": false}.
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+from typing import Any
+
+from .config import get_adapter_config, load_config
+from .paths import get_data_dir
+
+METRICS_FILENAME = "metrics.jsonl"
+MAX_METRICS_SIZE = 10 * 1024 * 1024
+
+
+def call_status(result: dict[str, Any]) -> str:
+    """"ok", "timeout", "cancelled" (a race loser or abandoned request) or "error"."""
+    if result.get("cancelled"):
+        return "cancelled"
+    if not result.get("error"):
+        return "ok"
+    return "timeout" if result.get("timed_out") else "error"
+
+
+def record_call(
+    agent: str,
+    model: str | None,
+    source: str,
+    message: str,
+    result: dict[str, Any],
+    timings: dict[str, float | None] | None = None,
+    **extra: Any,
+) -> None:
+    """Append a metrics row for one agent call (never raises)."""
+    if (load_config().get("metrics") or {}).get("enabled", True) is False:
+        return
+    timings = {**(result.get("phases") or {}), **(timings or {})}
+    row = {
+        "timestamp": datetime.now().isoformat(),
+        "agent": agent,
+        "model": model or get_adapter_config(agent).get("model"),
+        "source": source,
+        "status": call_status(result),
+        "cached": bool(result.get("cached")),
+        "retries": result.get("retries", 0),
+        "timings": {k: round(v, 4) for k, v in timings.items() if v is not None},
+        "request_bytes": len(message.encode("utf-8")),
+        "response_bytes": len((result.get("response") or "").encode("utf-8")),
+        "usage": result.get("usage"),
+        **extra,
+    }
+    path = get_data_dir() / METRICS_FILENAME
+    try:
+        if path.exists() and path.stat().st_size > MAX_METRICS_SIZE:
+            os.replace(path, path.with_name(METRICS_FILENAME + ".1"))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    except OSError:
+        pass
+
+
+def read_metrics(since: str | None = None, agent: str | None = None) -> list[dict[str, Any]]:
+    """Metrics rows (oldest first, including the rotated file), optionally filtered."""
+    rows = []
+    for name in (METRICS_FILENAME + ".1", METRICS_FILENAME):
+        try:
+            with open(get_data_dir() / name, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partly written line
+                    if since and row.get("timestamp", "") < since:
+                        continue
+                    if agent and row.get("agent") != agent:
+                        continue
+                    rows.append(row)
+        except OSError:
+            continue
+    return rows
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (pct between 0 and 1) of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * pct) - 1)]
+
+
+def summarize(rows: list[dict[str, Any]], since: str | None = None) -> list[dict[str, Any]]:
+    """Latency percentiles, error rate and throughput per agent and model.
+
+    Throughput is calls per minute over the window: from `since` (or the
+    first row) to now. Cancelled calls (race losers, abandoned requests)
+    count towards calls but not errors or latency, since they were cut short.
+    """
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault((row.get("agent", "?"), row.get("model") or ""), []).append(row)
+
+    now = datetime.now()
+    summary = []
+    for (agent, model), items in sorted(groups.items()):
+        start = datetime.fromisoformat(since or items[0]["timestamp"])
+        minutes = max((now - start).total_seconds() / 60, 1 / 60)
+        finished = [r for r in items if r.get("status") != "cancelled"]
+        totals = [r["timings"]["total"] for r in finished if "total" in r.get("timings", {})]
+        first_bytes = [r["timings"]["first_byte"] for r in finished
+                       if "first_byte" in r.get("timings", {})]
+        errors = sum(1 for r in finished if r.get("status") != "ok")
+        entry: dict[str, Any] = {
+            "agent": agent,
+            "model": model or None,
+            "calls": len(items),
+            "errors": errors,
+            "timeouts": sum(1 for r in items if r.get("status") == "timeout"),
+            "cancelled": len(items) - len(finished),
+            "error_rate": errors / len(finished) if finished else 0.0,
+            "cached": sum(1 for r in items if r.get("cached")),
+            "calls_per_minute": len(items) / minutes,
+        }
+        if totals:
+            entry.update(p50=percentile(totals, 0.5), p95=percentile(totals, 0.95),
+                         p99=percentile(totals, 0.99))
+        if first_bytes:
+            entry["first_byte_p50"] = percentile(first_bytes, 0.5)
+        summary.append(entry)
+    return summary
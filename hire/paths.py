@@ -1,14 +1,32 @@
 """XDG-compliant path management for hire CLI."""
 
 import os
+from collections.abc import Mapping
+from contextvars import ContextVar
 from pathlib import Path
 
 APP_NAME = "hire"
 
+# Working directory of the current request when running inside `hire serve`
+request_cwd: ContextVar[str | None] = ContextVar("request_cwd", default=None)
+
+# Environment of the current request when running inside `hire serve`
+request_env: ContextVar[dict[str, str] | None] = ContextVar("request_env", default=None)
+
+
+def get_env() -> Mapping[str, str]:
+    """Environment for reading settings and running agents.
+
+    This is the client's environment for requests served by `hire serve`,
+    and the process's own environment otherwise.
+    """
+    env = request_env.get()
+    return os.environ if env is None else env
+
 
 def get_config_dir() -> Path:
     """Get XDG config directory (~/.config/hire/)."""
-    xdg_config = os.environ.get("XDG_CONFIG_HOME", "")
+    xdg_config = get_env().get("XDG_CONFIG_HOME", "")
     if xdg_config:
         base = Path(xdg_config)
     else:
@@ -21,7 +39,7 @@ def get_config_dir() -> Path:
 
 def get_data_dir() -> Path:
     """Get XDG data directory (~/.local/share/hire/)."""
-    xdg_data = os.environ.get("XDG_DATA_HOME", "")
+    xdg_data = get_env().get("XDG_DATA_HOME", "")
     if xdg_data:
         base = Path(xdg_data)
     else:
@@ -51,3 +69,17 @@ def get_sessions_dir(agent: str | None = None) -> Path:
         sessions_dir = sessions_dir / agent
     sessions_dir.mkdir(parents=True, exist_ok=True)
     return sessions_dir
+
+
+def get_cwd() -> str:
+    """Working directory for resolving user paths and running agents.
+
+    This is the client's directory for requests served by `hire serve`,
+    and the process's own working directory otherwise.
+    """
+    return request_cwd.get() or os.getcwd()
+
+
+def resolve_path(path: str) -> str:
+    """Resolve a user-supplied path against get_cwd()."""
+    return os.path.abspath(os.path.join(get_cwd(), os.path.expanduser(path)))
@@ -0,0 +1,172 @@
+"""Cross-process rate limiting per agent and model (opt-in).
+
+    "adapters": {"grok": {"rate_limit": {"per_minute": 60, "burst": 10, "max_in_flight": 4}}}
+
+Each (agent, model) pair gets a token bucket refilled at per_minute / 60
+tokens per second up to burst, plus a cap on calls in flight. The state is
+kept in an SQLite database in the data directory, whose write lock
+serialises updates from every hire process on the host, so parallel CI jobs
+or `xargs -P` invocations share one budget. Slots held by processes that
+died are reclaimed.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .config import get_adapter_config
+from .paths import get_data_dir
+
+RATELIMIT_FILENAME = "ratelimit.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS slots_key ON slots(key);
+"""
+
+# Longest sleep between attempts to take a slot
+_POLL_INTERVAL = 0.25
+# In-flight slots older than this are assumed leaked
+_STALE_SLOT = 6 * 3600
+
+_lock = threading.Lock()
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def get_rate_limit(agent: str) -> dict[str, Any] | None:
+    """Rate limit settings for an agent, or None if it is not limited."""
+    config = get_adapter_config(agent).get("rate_limit") or {}
+    per_minute = config.get("per_minute")
+    max_in_flight = config.get("max_in_flight")
+    if not per_minute and not max_in_flight:
+        return None
+    rate = float(per_minute) / 60 if per_minute else None
+    return {
+        "rate": rate,
+        "burst": float(config.get("burst", max(1.0, rate or 0))),
+        "max_in_flight": int(max_in_flight) if max_in_flight else None,
+    }
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_data_dir() / RATELIMIT_FILENAME
+    with _lock:
+        conn = _connections.get(path)
+        if conn is None:
+            # Autocommit mode, so transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _connections[path] = conn
+        return conn
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _try_acquire(
+    conn: sqlite3.Connection, key: str, limits: dict[str, Any]
+) -> tuple[int | None, float]:
+    """Take a token and an in-flight slot if both are available.
+
+    Returns:
+        (slot ID, 0) on success, else (None, seconds until it is worth trying again).
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if limits["max_in_flight"]:
+            rows = conn.execute("SELECT id, pid, started FROM slots WHERE key = ?",
+                                (key,)).fetchall()
+            leaked = [(id_,) for id_, pid, started in rows
+                      if now - started > _STALE_SLOT or not _pid_alive(pid)]
+            conn.executemany("DELETE FROM slots WHERE id = ?", leaked)
+            if len(rows) - len(leaked) >= limits["max_in_flight"]:
+                conn.execute("COMMIT")
+                return None, _POLL_INTERVAL
+
+        if limits["rate"]:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?",
+                               (key,)).fetchone()
+            tokens = limits["burst"] if row is None else min(
+                limits["burst"], row[0] + max(0.0, now - row[1]) * limits["rate"])
+            if tokens < 1:
+                conn.execute("COMMIT")
+                return None, (1 - tokens) / limits["rate"]
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                          (key, tokens - 1, now))
+
+        cursor = conn.execute("INSERT INTO slots (key, pid, started) VALUES (?, ?, ?)",
+                              (key, os.getpid(), now))
+        conn.execute("COMMIT")
+        return cursor.lastrowid, 0.0
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def acquire_slot(
+    agent: str, model: str | None, stop: threading.Event | None = None
+) -> tuple[int | None, float]:
+    """Wait until a call to the agent and model may start.
+
+    Args:
+        agent: Agent name
+        model: Model the call uses (each model has its own budget)
+        stop: Stop waiting once this is set (e.g. the call timed out)
+
+    Returns:
+        (slot ID to release_slot() afterwards, or None if the agent is not
+        limited or stop was set; seconds spent waiting)
+    """
+    limits = get_rate_limit(agent)
+    if not limits:
+        return None, 0.0
+    model = model or get_adapter_config(agent).get("model") or ""
+    key = f"{agent}:{model}"
+
+    conn = _connect()
+    start = time.perf_counter()
+    while True:
+        with _lock:
+            slot, wait = _try_acquire(conn, key, limits)
+        if slot is not None:
+            return slot, time.perf_counter() - start
+        delay = min(wait, _POLL_INTERVAL)
+        if stop is not None:
+            if stop.wait(delay):
+                return None, time.perf_counter() - start
+        else:
+            time.sleep(delay)
+
+
+def release_slot(slot: int | None) -> None:
+    """Release an in-flight slot taken by acquire_slot()."""
+    if slot is None:
+        return
+    conn = _connect()
+    with _lock:
+        conn.execute("DELETE FROM slots WHERE id = ?", (slot,))
@@ -0,0 +1,129 @@
+"""Retry policy and per-agent circuit breaker for agent calls.
+
+Failed calls that the adapter classifies as transient (rate limits,
+overload, 5xx, connection errors; see AgentAdapter.is_retryable) are
+retried with jittered exponential backoff, waiting at least as long as a
+Retry-After header asks. After `threshold` consecutive transient failures
+an agent's circuit opens: calls fail at once for `cooldown` seconds, then a
+single trial call decides whether it closes again.
+
+    "retry": {"attempts": 3, "base_delay": 1, "max_delay": 30},
+    "circuit_breaker": {"threshold": 5, "cooldown": 30}
+
+Both can be set at the top level of the config or per adapter. Breaker
+state is kept in memory, so it spans the jobs of one `hire batch` run or
+the requests of `hire serve`.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from .config import get_adapter_config, load_config
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+_lock = threading.Lock()
+# agent -> {"failures": consecutive failures, "open_until": time, "trial": bool}
+_breakers: dict[str, dict[str, Any]] = {}
+
+
+def get_retry_policy(agent: str) -> dict[str, Any]:
+    """Retry and breaker settings for an agent (adapter config over top level)."""
+    config = load_config()
+    adapter_config = get_adapter_config(agent)
+    retry = {**(config.get("retry") or {}), **(adapter_config.get("retry") or {})}
+    breaker = {
+        **(config.get("circuit_breaker") or {}),
+        **(adapter_config.get("circuit_breaker") or {}),
+    }
+    return {
+        "attempts": max(1, int(retry.get("attempts", DEFAULT_ATTEMPTS))),
+        "base_delay": float(retry.get("base_delay", DEFAULT_BASE_DELAY)),
+        "max_delay": float(retry.get("max_delay", DEFAULT_MAX_DELAY)),
+        "threshold": int(breaker.get("threshold", DEFAULT_BREAKER_THRESHOLD)),
+        "cooldown": float(breaker.get("cooldown", DEFAULT_BREAKER_COOLDOWN)),
+    }
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(retry: int, policy: dict[str, Any], retry_after: float | None = None) -> float:
+    """Delay before retry number `retry` (0-based): full jitter, or Retry-After.
+
+    Both are capped at the policy's max_delay.
+    """
+    if retry_after is not None:
+        return min(retry_after, float(policy["max_delay"]))
+    ceiling = min(policy["max_delay"], policy["base_delay"] * 2 ** retry)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def breaker_wait(agent: str) -> tuple[float, bool]:
+    """Whether a call to the agent may go ahead.
+
+    Once the cooldown is over, one caller makes the trial call and the
+    others keep failing fast until it ends (see end_trial()).
+
+    Returns:
+        (seconds until the circuit closes, or 0 if the call may go ahead;
+        whether this caller makes the trial call)
+    """
+    with _lock:
+        state = _breakers.get(agent)
+        if not state or not state["open_until"]:
+            return 0, False
+        remaining = state["open_until"] - time.monotonic()
+        if remaining > 0:
+            return remaining, False
+        if state["trial"]:
+            return 1.0, False
+        state["trial"] = True
+        return 0, True
+
+
+def end_trial(agent: str) -> None:
+    """Let the next caller make a trial call if this one ended without an outcome.
+
+    A trial that succeeds or fails transiently goes through record_outcome();
+    one that fails otherwise (e.g. bad credentials, or it was cancelled)
+    says nothing about the agent's health, so the circuit stays half-open.
+    """
+    with _lock:
+        state = _breakers.get(agent)
+        if state:
+            state["trial"] = False
+
+
+def record_outcome(agent: str, ok: bool, policy: dict[str, Any]) -> None:
+    """Update the agent's breaker after a call (ok, or a transient failure)."""
+    with _lock:
+        if ok:
+            _breakers.pop(agent, None)
+            return
+        state = _breakers.setdefault(agent, {"failures": 0, "open_until": 0.0, "trial": False})
+        state["failures"] += 1
+        state["trial"] = False
+        # A failed trial call (circuit half-open) opens it again at once
+        if state["open_until"] or (
+            policy["threshold"] > 0 and state["failures"] >= policy["threshold"]
+        ):
+            state["open_until"] = time.monotonic() + policy["cooldown"]
@@ -2,9 +2,19 @@
 
 import json
 import uuid
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
+from .index import (
+    add_to_index,
+    find_by_id,
+    find_by_name,
+    query_sessions,
+    remove_from_index,
+    remove_many_from_index,
+)
 from .paths import get_data_dir, get_sessions_dir
 
 
@@ -39,6 +49,69 @@ def save_session(session: dict[str, Any]) -> None:
     with open(latest_path, "w", encoding="utf-8") as f:
         json.dump({"session_id": session["id"], "filename": filename}, f)
 
+    add_to_index(session)
+
+
+def _load_session(agent: str, session_id: str) -> dict[str, Any] | None:
+    """Load a session file directly from its known path.
+
+    Drops the index entry if the file has gone missing.
+    """
+    filepath = get_sessions_dir(agent) / f"{session_id}.json"
+    try:
+        with open(filepath, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        remove_from_index(session_id)
+        return None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _transcript_path(session: dict[str, Any]) -> Path:
+    """Path of a session's append-only transcript (one JSON message per line)."""
+    return get_sessions_dir(session["agent"]) / f"{session['id']}.jsonl"
+
+
+def load_transcript(session: dict[str, Any]) -> list[dict[str, Any]]:
+    """Load a session's conversation messages.
+
+    Sessions saved before transcripts existed keep their messages inline.
+    """
+    if "messages" in session:
+        return list(session["messages"])
+
+    messages: list[dict[str, Any]] = []
+    try:
+        with open(_transcript_path(session), encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    messages.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return messages
+
+
+def append_transcript(session: dict[str, Any], messages: list[dict[str, Any]]) -> None:
+    """Append messages to a session's transcript and update its turn count.
+
+    The session record itself is not written; call save_session afterwards.
+    """
+    # Move inline messages from older sessions into the transcript first
+    inline = session.pop("messages", None)
+    if inline:
+        messages = list(inline) + list(messages)
+        session["turns"] = 0
+
+    with open(_transcript_path(session), "a", encoding="utf-8") as f:
+        for message in messages:
+            f.write(json.dumps(message, ensure_ascii=False) + "\n")
+
+    # A turn is one exchange, started by the user's message
+    session["turns"] = session.get("turns", 0) + sum(
+        1 for message in messages if message.get("role") == "user"
+    )
+
 
 def get_latest_session(agent: str) -> dict[str, Any] | None:
     """Get the latest session for an agent."""
@@ -67,33 +140,11 @@ def get_session_by_id(session_id: str) -> dict[str, Any] | None:
 
     Supports prefix matching but raises ValueError if multiple sessions match.
     """
-    sessions_base = get_sessions_dir()
-
-    if not sessions_base.exists():
-        return None
-
-    matches: list[dict[str, Any]] = []
-
-    for agent_dir in sessions_base.iterdir():
-        if not agent_dir.is_dir():
-            continue
-        for session_file in agent_dir.glob("*.json"):
-            if session_file.name == "latest.json":
-                continue
-            try:
-                with open(session_file, encoding="utf-8") as f:
-                    session = json.load(f)
-                    # Exact match takes priority
-                    if session["id"] == session_id:
-                        return session
-                    # Prefix match
-                    if session["id"].startswith(session_id):
-                        matches.append(session)
-            except (OSError, json.JSONDecodeError, KeyError):
-                continue
+    matches = find_by_id(session_id)
 
     if len(matches) == 1:
-        return matches[0]
+        sid, agent = matches[0]
+        return _load_session(agent, sid)
     elif len(matches) > 1:
         raise ValueError(f"Ambiguous session ID '{session_id}' matches {len(matches)} sessions")
     return None
@@ -101,25 +152,11 @@ def get_session_by_id(session_id: str) -> dict[str, Any] | None:
 
 def get_session_by_name(name: str) -> dict[str, Any] | None:
     """Get a session by its name (searches all agents)."""
-    sessions_base = get_sessions_dir()
-
-    if not sessions_base.exists():
+    match = find_by_name(name)
+    if not match:
         return None
-
-    for agent_dir in sessions_base.iterdir():
-        if not agent_dir.is_dir():
-            continue
-        for session_file in agent_dir.glob("*.json"):
-            if session_file.name == "latest.json":
-                continue
-            try:
-                with open(session_file, encoding="utf-8") as f:
-                    session = json.load(f)
-                    if session.get("name") == name:
-                        return session
-            except (OSError, json.JSONDecodeError):
-                continue
-    return None
+    sid, agent = match
+    return _load_session(agent, sid)
 
 
 def find_session(name_or_id: str) -> dict[str, Any] | None:
@@ -133,77 +170,124 @@ def find_session(name_or_id: str) -> dict[str, Any] | None:
     return get_session_by_id(name_or_id)
 
 
-def list_sessions(agent: str | None = None) -> list[dict[str, Any]]:
-    """List all sessions, optionally filtered by agent."""
-    sessions_base = get_sessions_dir()
-
-    if not sessions_base.exists():
-        return []
+def parse_since(value: str) -> str:
+    """Parse a --since style value into an ISO timestamp.
 
-    sessions = []
+    Accepts relative ages ("30m", "12h", "7d", "2w") or an ISO date/datetime.
 
-    if agent:
-        agent_dirs = [sessions_base / agent]
+    Raises:
+        ValueError: If the value cannot be parsed.
+    """
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    value = value.strip()
+    if len(value) > 1 and value[-1] in units and value[:-1].isdigit():
+        delta = timedelta(**{units[value[-1]]: int(value[:-1])})
+        return (datetime.now() - delta).isoformat()
+    return datetime.fromisoformat(value).isoformat()
+
+
+def iter_sessions(
+    agent: str | None = None,
+    limit: int | None = None,
+    since: str | None = None,
+    name_glob: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield sessions, most recently updated first.
+
+    Selection and ordering come from the index; only the session files that
+    are actually yielded get opened.
+    """
+    for row in query_sessions(agent=agent, since=since, name_glob=name_glob, limit=limit):
+        session = _load_session(row["agent"], row["id"])
+        if session is not None:
+            yield session
+
+
+def list_sessions(
+    agent: str | None = None,
+    limit: int | None = None,
+    since: str | None = None,
+    name_glob: str | None = None,
+) -> list[dict[str, Any]]:
+    """List sessions (most recent first), optionally filtered."""
+    return list(iter_sessions(agent=agent, limit=limit, since=since, name_glob=name_glob))
+
+
+def _update_latest(agent: str) -> None:
+    """Point latest.json at the most recently updated session for an agent."""
+    latest_path = get_sessions_dir(agent) / "latest.json"
+    rows = list(query_sessions(agent=agent, limit=1))
+    if rows:
+        with open(latest_path, "w", encoding="utf-8") as f:
+            json.dump({"session_id": rows[0]["id"], "filename": f"{rows[0]['id']}.json"}, f)
     else:
-        agent_dirs = [d for d in sessions_base.iterdir() if d.is_dir()]
+        # No sessions left, remove latest.json
+        latest_path.unlink(missing_ok=True)
 
-    for agent_dir in agent_dirs:
-        if not agent_dir.exists():
-            continue
-        for session_file in agent_dir.glob("*.json"):
-            if session_file.name == "latest.json":
-                continue
-            try:
-                with open(session_file, encoding="utf-8") as f:
-                    sessions.append(json.load(f))
-            except (OSError, json.JSONDecodeError):
-                continue
 
-    # Sort by updated_at descending
-    sessions.sort(key=lambda s: s.get("updated_at", ""), reverse=True)
-    return sessions
+def _is_latest(agent: str, session_id: str) -> bool:
+    """Check whether latest.json points at a session."""
+    latest_path = get_sessions_dir(agent) / "latest.json"
+    try:
+        with open(latest_path, encoding="utf-8") as f:
+            return bool(json.load(f)["session_id"] == session_id)
+    except FileNotFoundError:
+        return False
+    except (OSError, json.JSONDecodeError, KeyError):
+        # Unreadable pointer: treat as stale so it gets rewritten
+        return True
 
 
 def delete_session(session: dict[str, Any]) -> bool:
     """Delete a session."""
-    sessions_dir = get_sessions_dir(session["agent"])
+    agent = session["agent"]
+    session_file = get_sessions_dir(agent) / f"{session['id']}.json"
 
-    # Find and delete the session file
-    for session_file in sessions_dir.glob("*.json"):
-        if session_file.name == "latest.json":
-            continue
+    try:
+        session_file.unlink()
+    except FileNotFoundError:
+        remove_from_index(session["id"])
+        return False
+
+    remove_from_index(session["id"])
+    _transcript_path(session).unlink(missing_ok=True)
+
+    # Update latest if needed
+    if _is_latest(agent, session["id"]):
+        _update_latest(agent)
+
+    return True
+
+
+def delete_sessions(agent: str | None = None, before: str | None = None) -> int:
+    """Delete sessions in bulk.
+
+    Args:
+        agent: Only delete sessions for this agent
+        before: Only delete sessions last updated before this ISO timestamp
+
+    Returns:
+        Number of sessions deleted.
+    """
+    deleted: list[str] = []
+    agents: set[str] = set()
+
+    for row in query_sessions(agent=agent, before=before):
+        session_file = get_sessions_dir(row["agent"]) / f"{row['id']}.json"
         try:
-            with open(session_file, encoding="utf-8") as f:
-                s = json.load(f)
-        except (OSError, json.JSONDecodeError):
+            session_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError:
             continue
+        _transcript_path(row).unlink(missing_ok=True)
+        deleted.append(row["id"])
+        agents.add(row["agent"])
 
-        if s["id"] == session["id"]:
-            session_file.unlink()
+    remove_many_from_index(deleted)
+
+    # Repoint each affected agent's latest.json once
+    for name in agents:
+        _update_latest(name)
 
-            # Update latest if needed
-            latest_path = sessions_dir / "latest.json"
-            if latest_path.exists():
-                try:
-                    with open(latest_path, encoding="utf-8") as f:
-                        latest = json.load(f)
-                    if latest["session_id"] == session["id"]:
-                        # Find next most recent session for this agent
-                        remaining = list_sessions(session["agent"])
-                        if remaining:
-                            # Update latest to point to most recent remaining
-                            next_session = remaining[0]
-                            with open(latest_path, "w", encoding="utf-8") as f:
-                                json.dump({
-                                    "session_id": next_session["id"],
-                                    "filename": f"{next_session['id']}.json"
-                                }, f)
-                        else:
-                            # No sessions left, remove latest.json
-                            latest_path.unlink()
-                except (OSError, json.JSONDecodeError, KeyError):
-                    # If we can't read latest.json, just try to delete it
-                    latest_path.unlink(missing_ok=True)
-
-            return True
-    return False
+    return len(deleted)
@@ -0,0 +1,136 @@
+"""Local cache of uploaded file IDs (xAI Files API).
+
+Maps file content hashes to the file ID returned by the API, so unchanged
+attachments are not uploaded again. A (path, size, mtime) table lets
+unchanged files skip re-hashing as well.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .paths import get_data_dir
+
+CACHE_FILENAME = "uploads.db"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    sha256 TEXT NOT NULL,
+    base_url TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    size INTEGER,
+    uploaded_at REAL,
+    last_used REAL,
+    PRIMARY KEY (sha256, base_url)
+);
+CREATE INDEX IF NOT EXISTS uploads_last_used ON uploads(last_used);
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT
+);
+"""
+
+_lock = threading.RLock()
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    path = get_data_dir() / CACHE_FILENAME
+    with _lock:
+        conn = _connections.get(path)
+        if conn is None:
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _connections[path] = conn
+        return conn
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's contents, reusing the stored hash if size/mtime match."""
+    st = os.stat(file_path)
+    conn = _connect()
+    with _lock:
+        row = conn.execute(
+            "SELECT size, mtime_ns, sha256 FROM hashes WHERE path = ?", (file_path,)
+        ).fetchone()
+    if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+        return str(row[2])
+
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    with _lock, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+            (file_path, st.st_size, st.st_mtime_ns, digest),
+        )
+    return digest
+
+
+def get_cached_upload(digest: str, base_url: str, ttl: float | None = None) -> str | None:
+    """Get the cached file ID for a content hash, if present and not expired."""
+    if ttl is None:
+        ttl = DEFAULT_TTL
+    conn = _connect()
+    now = time.time()
+    with _lock, conn:
+        row = conn.execute(
+            "SELECT file_id, uploaded_at FROM uploads WHERE sha256 = ? AND base_url = ?",
+            (digest, base_url),
+        ).fetchone()
+        if not row:
+            return None
+        if ttl and now - row[1] > ttl:
+            conn.execute(
+                "DELETE FROM uploads WHERE sha256 = ? AND base_url = ?", (digest, base_url)
+            )
+            return None
+        conn.execute(
+            "UPDATE uploads SET last_used = ? WHERE sha256 = ? AND base_url = ?",
+            (now, digest, base_url),
+        )
+    return str(row[0])
+
+
+def cache_upload(
+    digest: str,
+    base_url: str,
+    file_id: str,
+    size: int,
+    max_entries: int | None = None,
+) -> None:
+    """Record an uploaded file ID, evicting least recently used entries."""
+    if max_entries is None:
+        max_entries = DEFAULT_MAX_ENTRIES
+    conn = _connect()
+    now = time.time()
+    with _lock, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO uploads "
+            "(sha256, base_url, file_id, size, uploaded_at, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (digest, base_url, file_id, size, now, now),
+        )
+        conn.execute(
+            "DELETE FROM uploads WHERE rowid IN ("
+            "SELECT rowid FROM uploads ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (max_entries,),
+        )
+
+
+def invalidate_upload(file_id: str) -> None:
+    """Forget a cached file ID (e.g. after the API rejected it)."""
+    conn = _connect()
+    with _lock, conn:
+        conn.execute("DELETE FROM uploads WHERE file_id = ?", (file_id,))
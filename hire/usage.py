@@ -0,0 +1,80 @@
+"""Token usage and cost records.
+
+Every adapter returns result["usage"] in the same shape, whatever its CLI
+or API reports:
+
+    {"input_tokens": 1200, "output_tokens": 300, "cached_tokens": 1000,
+     "total_tokens": 1500, "cost_usd": 0.0042}
+
+input_tokens includes cached_tokens. cost_usd is what the agent reported
+(Claude), or an estimate from the adapter's "pricing" config in USD per
+million tokens, or None if neither is available:
+
+    "adapters": {"grok": {"pricing": {"input": 3.0, "cached_input": 0.75, "output": 15.0}}}
+"""
+
+from typing import Any
+
+from .config import get_adapter_config
+
+
+def make_usage(
+    input_tokens: int | None = 0,
+    output_tokens: int | None = 0,
+    cached_tokens: int | None = 0,
+    cost_usd: float | None = None,
+) -> dict[str, Any]:
+    """Build a usage record (None counts are treated as 0)."""
+    input_tokens = int(input_tokens or 0)
+    output_tokens = int(output_tokens or 0)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cached_tokens": int(cached_tokens or 0),
+        "total_tokens": input_tokens + output_tokens,
+        "cost_usd": cost_usd,
+    }
+
+
+def add_usage(
+    total: dict[str, Any] | None, usage: dict[str, Any] | None
+) -> dict[str, Any] | None:
+    """Sum two usage records. The cost stays None only if neither has one."""
+    if not usage:
+        return total
+    if not total:
+        return dict(usage)
+    costs = [u["cost_usd"] for u in (total, usage) if u.get("cost_usd") is not None]
+    return make_usage(
+        total.get("input_tokens", 0) + usage.get("input_tokens", 0),
+        total.get("output_tokens", 0) + usage.get("output_tokens", 0),
+        total.get("cached_tokens", 0) + usage.get("cached_tokens", 0),
+        round(sum(costs), 6) if costs else None,
+    )
+
+
+def price_usage(agent: str, usage: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Fill in cost_usd from the adapter's pricing config if the agent didn't report it."""
+    if not usage or usage.get("cost_usd") is not None:
+        return usage
+    pricing = get_adapter_config(agent).get("pricing")
+    if not pricing:
+        return usage
+    uncached = usage["input_tokens"] - usage["cached_tokens"]
+    cost = (
+        uncached * pricing.get("input", 0)
+        + usage["cached_tokens"] * pricing.get("cached_input", pricing.get("input", 0))
+        + usage["output_tokens"] * pricing.get("output", 0)
+    ) / 1_000_000
+    return {**usage, "cost_usd": round(cost, 6)}
+
+
+def format_usage(usage: dict[str, Any]) -> str:
+    """One-line summary, e.g. "1,500 tokens (1,200 in, 1,000 cached; 300 out), $0.0042"."""
+    text = (
+        f"{usage['total_tokens']:,} tokens ({usage['input_tokens']:,} in, "
+        f"{usage['cached_tokens']:,} cached; {usage['output_tokens']:,} out)"
+    )
+    if usage.get("cost_usd") is not None:
+        text += f", ${usage['cost_usd']:.4f}"
+    return text
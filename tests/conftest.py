@@ -0,0 +1,122 @@
+"""Shared fixtures: every test gets its own hire config and data directories."""
+
+import json
+import threading
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hire import httpclient
+from hire.config import clear_config_cache
+
+
+@pytest.fixture(autouse=True)
+def hire_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Point XDG_CONFIG_HOME and XDG_DATA_HOME at a temporary directory."""
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    clear_config_cache()
+    yield tmp_path
+    clear_config_cache()
+
+
+@pytest.fixture
+def write_config(hire_home: Path) -> Callable[[dict[str, Any]], None]:
+    """Write ~/.config/hire/config.json for the test."""
+
+    def write(config: dict[str, Any]) -> None:
+        path = hire_home / "config" / "hire" / "config.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(config), encoding="utf-8")
+        clear_config_cache()
+
+    return write
+
+
+class _FakeXAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "FakeXAI"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests.append(
+            {"path": self.path, "body": body, "port": self.client_address[1]}
+        )
+        handler = self.server.handlers.get(self.path)
+        if handler is None:
+            self.send_json(404, {"error": f"No handler for {self.path}"})
+        else:
+            handler(self, body)
+
+    def send_json(self, status: int, obj: Any, headers: dict[str, str] | None = None) -> None:
+        self.send_raw(status, json.dumps(obj).encode(), headers)
+
+    def send_raw(self, status: int, data: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_sse(self, chunks: list[str]) -> None:
+        """Send a chunked text/event-stream response, one HTTP chunk per item."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            data = chunk.encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class FakeXAI(ThreadingHTTPServer):
+    """Local stand-in for the xAI API.
+
+    Tests register a handler per path, e.g. server.handlers["/v1/responses"],
+    called with the request handler (send_json/send_raw/send_sse) and body.
+    Every request is recorded in server.requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeXAIHandler)
+        self.handlers: dict[str, Callable[[_FakeXAIHandler, bytes], None]] = {}
+        self.requests: list[dict[str, Any]] = []
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        pass  # Clients hanging up mid-response (aborted requests) are expected
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    @property
+    def grok_config(self) -> dict[str, Any]:
+        """Grok adapter config pointing at this server."""
+        return {"api_key": "test-key", "base_url": self.base_url}
+
+
+@pytest.fixture
+def xai_server(write_config: Callable[[dict[str, Any]], None]) -> Iterator[FakeXAI]:
+    """A running FakeXAI that the Grok adapter is configured to use."""
+    server = FakeXAI()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    write_config({"adapters": {"grok": server.grok_config}})
+    # Start every test with a fresh connection pool
+    httpclient._pool = None
+    yield server
+    server.shutdown()
+    server.server_close()
+    httpclient._pool = None
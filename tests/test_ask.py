@@ -0,0 +1,32 @@
+"""Asking several agents at once (fan-out) with fake agent CLIs."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from hire.commands.ask import run_fanout
+from hire.metrics import read_metrics
+from hire.session import find_session
+
+
+def test_fanout_keeps_answers_when_one_agent_fails(
+    tmp_path: Path, write_config: Callable[[dict[str, Any]], None]
+) -> None:
+    claude = tmp_path / "claude"
+    claude.write_text("#!/bin/sh\necho '{\"type\":\"result\",\"session_id\":\"c-1\","
+                      "\"result\":\"from claude\",\"is_error\":false}'\n")
+    claude.chmod(0o755)
+    write_config({"adapters": {
+        "claude": {"command": str(claude), "args": []},
+        # Not installed: starting it raises FileNotFoundError
+        "codex": {"command": str(tmp_path / "missing-codex"), "args": []},
+    }})
+
+    entries = {e["agent"]: e for e in run_fanout(["claude", "codex"], "hi", name="both")}
+
+    assert entries["claude"]["response"] == "from claude"
+    assert find_session("both-claude")["id"] == entries["claude"]["session_id"]
+    assert entries["codex"]["response"] is None
+    assert "missing-codex" in entries["codex"]["error"]
+    statuses = {row["agent"]: row["status"] for row in read_metrics()}
+    assert statuses == {"claude": "ok", "codex": "error"}
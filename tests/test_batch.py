@@ -0,0 +1,95 @@
+"""hire batch against a fake claude CLI that logs its calls."""
+
+import json
+from argparse import Namespace
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hire.commands.batch import run_batch
+
+# Logs "<message>|<resumed session>" and answers with a new session ID;
+# messages starting with "slow" take a while, so later jobs would overtake them
+FAKE_CLAUDE = """#!/bin/sh
+message="$2"
+resume=""
+while [ $# -gt 0 ]; do
+    [ "$1" = "--resume" ] && resume="$2"
+    shift
+done
+case "$message" in slow*) sleep 0.5 ;; esac
+echo "$message|$resume" >> {log}
+echo '{{"type":"result","session_id":"cli-'$$'","result":"ok","is_error":false}}'
+"""
+
+
+@pytest.fixture
+def fake_claude(tmp_path: Path, write_config: Callable[[dict[str, Any]], None]) -> Path:
+    """Install the fake claude; returns its call log."""
+    log = tmp_path / "calls.log"
+    script = tmp_path / "claude"
+    script.write_text(FAKE_CLAUDE.format(log=log))
+    script.chmod(0o755)
+    write_config({"adapters": {"claude": {"command": str(script), "args": []}},
+                  "defaults": {"agent": "claude"}})
+    return log
+
+
+def batch(jobs_path: Path, jobs: list[dict[str, Any]], **options: Any) -> list[dict[str, Any]]:
+    """Run hire batch on the jobs; returns the output records."""
+    jobs_path.write_text("".join(json.dumps(job) + "\n" for job in jobs))
+    out = jobs_path.with_suffix(".out.jsonl")
+    args = Namespace(file=str(jobs_path), out=str(out), checkpoint=None, concurrency=4,
+                     timeout=None, max_cost=None, max_tokens=None, **options)
+    run_batch(args)
+    return [json.loads(line) for line in out.read_text().splitlines()]
+
+
+def test_jobs_on_a_session_run_in_file_order(tmp_path: Path, fake_claude: Path) -> None:
+    records = batch(tmp_path / "jobs.jsonl", [
+        {"id": "first", "name": "x", "message": "slow first"},
+        {"id": "second", "session": "x", "message": "second"},
+        {"id": "other", "message": "unrelated"},
+        {"id": "third", "session": "x", "message": "third"},
+    ])
+    assert all("error" not in r for r in records), records
+
+    calls = [line.split("|") for line in fake_claude.read_text().splitlines()]
+    chain = [c for c in calls if c[0] != "unrelated"]
+    assert [c[0] for c in chain] == ["slow first", "second", "third"]
+    # Each job resumes the conversation the previous one left behind
+    by_id = {r["id"]: r for r in records}
+    assert chain[1][1] == by_id["first"]["cli_session_id"]
+    assert chain[2][1] == by_id["second"]["cli_session_id"]
+    # The unrelated job did not wait for the chain
+    assert calls[0][0] == "unrelated"
+
+
+def test_files_are_relative_to_the_jobs_file(tmp_path: Path, fake_claude: Path) -> None:
+    jobs_dir = tmp_path / "jobs"
+    jobs_dir.mkdir()
+    (jobs_dir / "my notes.txt").write_text("notes")
+    records = batch(jobs_dir / "jobs.jsonl", [
+        {"id": "1", "message": "read", "files": ["my notes.txt"]},
+        {"id": "2", "message": "read", "files": ["missing.txt"]},
+    ])
+    by_id = {r["id"]: r for r in records}
+    assert "error" not in by_id["1"]
+    assert by_id["2"]["error"] == "File not found: missing.txt"
+    call = fake_claude.read_text().splitlines()[0]
+    assert call == f'read @"{jobs_dir / "my notes.txt"}"|'
+
+
+def test_resume_keeps_one_record_per_job(tmp_path: Path, fake_claude: Path) -> None:
+    jobs_path = tmp_path / "jobs.jsonl"
+    jobs = [{"id": "1", "message": "one"}, {"id": "2", "session": "nope", "message": "two"}]
+    first = batch(jobs_path, jobs)
+    assert {r["id"] for r in first} == {"1", "2"}
+
+    # The failed job is retried; its old error record is replaced
+    jobs[1] = {"id": "2", "message": "two"}
+    second = batch(jobs_path, jobs)
+    assert [r["id"] for r in second] == ["1", "2"]
+    assert "error" not in second[1]
@@ -0,0 +1,57 @@
+"""Response cache: hits, and sessions created from them."""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hire.commands.ask import call_agent, save_turn
+
+
+@pytest.fixture
+def codex_calls(tmp_path: Path, write_config: Callable[[dict[str, Any]], None]) -> Path:
+    """A fake codex that logs its arguments; returns the log path."""
+    log = tmp_path / "calls.log"
+    script = tmp_path / "codex"
+    events = [
+        {"type": "thread.started", "thread_id": "th-1"},
+        {"type": "item.completed", "item": {"type": "agent_message", "text": "answer"}},
+    ]
+    lines = "\n".join(f"echo '{json.dumps(e)}'" for e in events)
+    script.write_text(f'#!/bin/sh\necho "$*" >> {log}\n{lines}\n')
+    script.chmod(0o755)
+    write_config({"cache": {"enabled": True},
+                  "adapters": {"codex": {"command": str(script), "args": []}}})
+    return log
+
+
+def test_cache_hit_does_not_share_the_agent_session(codex_calls: Path) -> None:
+    first = call_agent("codex", "question")
+    assert first["session_id"] == "th-1" and not first.get("cached")
+
+    hit = call_agent("codex", "question")
+    assert hit["cached"] is True
+    assert hit["response"] == "answer"
+    assert hit["session_id"] is None
+    assert len(codex_calls.read_text().splitlines()) == 1
+
+    session = save_turn("codex", "question", hit)
+    assert session["cli_session_id"] == "unknown"
+
+    # Following up starts a new agent conversation instead of resuming th-1
+    follow_up = call_agent("codex", "and then?", existing_session=session,
+                           cli_session_id=session["cli_session_id"])
+    args = codex_calls.read_text().splitlines()[-1]
+    assert "resume" not in args
+    session = save_turn("codex", "and then?", follow_up, existing_session=session,
+                        cli_session_id="unknown")
+    assert session["cli_session_id"] == "th-1"
+
+
+def test_continued_sessions_bypass_the_cache(codex_calls: Path) -> None:
+    call_agent("codex", "question")
+    result = call_agent("codex", "question", cli_session_id="th-1")
+    assert not result.get("cached")
+    assert "resume th-1" in codex_calls.read_text().splitlines()[-1]
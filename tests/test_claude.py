@@ -0,0 +1,52 @@
+"""Claude adapter against a fake claude CLI printing stream-json events."""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hire.adapters import get_adapter
+
+
+def assistant(*content: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "assistant", "session_id": "cl-1",
+            "message": {"role": "assistant", "content": list(content)}}
+
+
+EVENTS = [
+    {"type": "system", "subtype": "init", "session_id": "cl-1"},
+    assistant({"type": "text", "text": "Let me check the file."}),
+    assistant({"type": "tool_use", "name": "Read", "input": {"file_path": "a.py"}}),
+    {"type": "user", "session_id": "cl-1",
+     "message": {"role": "user", "content": [{"type": "tool_result", "content": "x = 42"}]}},
+    assistant({"type": "text", "text": "The answer is 42."}),
+    {"type": "result", "subtype": "success", "session_id": "cl-1", "is_error": False,
+     "result": "The answer is 42.", "total_cost_usd": 0.01,
+     "usage": {"input_tokens": 10, "cache_read_input_tokens": 20, "output_tokens": 5}},
+]
+
+
+@pytest.fixture
+def fake_claude(tmp_path: Path, write_config: Callable[[dict[str, Any]], None]) -> None:
+    script = tmp_path / "claude"
+    lines = "\n".join(f"echo '{json.dumps(e)}'" for e in EVENTS)
+    script.write_text(f"#!/bin/sh\n{lines}\n")
+    script.chmod(0o755)
+    write_config({"adapters": {"claude": {"command": str(script), "args": []}}})
+
+
+def test_ask_and_stream_return_the_same_response(fake_claude: None) -> None:
+    adapter = get_adapter("claude")
+    result = adapter.ask("hi")
+    assert result["response"] == "Let me check the file.\n\nThe answer is 42."
+    assert result["session_id"] == "cl-1"
+
+    events = list(adapter.stream("hi"))
+    streamed = "".join(e["text"] for e in events if e["type"] == "text")
+    final = events[-1]["result"]
+    assert streamed == final["response"] == result["response"]
+    assert final["usage"] == result["usage"]
+    assert result["usage"]["cached_tokens"] == 20
+    assert [e["name"] for e in events if e["type"] == "tool"] == ["Read"]
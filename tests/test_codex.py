@@ -0,0 +1,48 @@
+"""Codex adapter against a fake codex CLI printing JSONL events."""
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hire.adapters import get_adapter
+
+EVENTS = [
+    {"type": "thread.started", "thread_id": "th-1"},
+    {"type": "item.completed", "item": {"type": "agent_message", "text": "Looking at it"}},
+    {"type": "item.completed", "item": {"type": "command_execution", "command": "ls"}},
+    {"type": "item.completed", "item": {"type": "agent_message", "text": "Final answer"}},
+    {"type": "turn.completed", "usage": {"input_tokens": 30, "cached_input_tokens": 20,
+                                         "output_tokens": 5}},
+]
+
+
+@pytest.fixture
+def fake_codex(tmp_path: Path, write_config: Callable[[dict[str, Any]], None]) -> None:
+    script = tmp_path / "codex"
+    lines = "\n".join(f"echo '{json.dumps(e)}'" for e in EVENTS)
+    script.write_text(f"#!/bin/sh\n{lines}\n")
+    script.chmod(0o755)
+    write_config({"adapters": {"codex": {"command": str(script), "args": []}}})
+
+
+def test_ask_and_stream_return_the_same_response(fake_codex: None) -> None:
+    adapter = get_adapter("codex")
+    result = adapter.ask("hi")
+    assert result["response"] == "Looking at it\n\nFinal answer"
+    assert result["session_id"] == "th-1"
+
+    events = list(adapter.stream("hi"))
+    streamed = "".join(e["text"] for e in events if e["type"] == "text")
+    final = events[-1]["result"]
+    assert streamed == final["response"] == result["response"]
+    assert final["usage"] == result["usage"]
+    assert result["usage"]["cached_tokens"] == 20
+
+
+def test_usage_events_carry_normalized_usage(fake_codex: None) -> None:
+    events = list(get_adapter("codex").stream("hi"))
+    usage_events = [e["usage"] for e in events if e["type"] == "usage"]
+    assert usage_events == [events[-1]["result"]["usage"]]
@@ -0,0 +1,112 @@
+"""`hire serve` with real clients: per-request environment and cancellation."""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs Unix sockets")
+
+
+def hire_env(home: Path, **extra: str) -> dict[str, str]:
+    return {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "HIRE_SOCKET": str(home.parent / "serve.sock"),
+        "XDG_CONFIG_HOME": str(home / "config"),
+        "XDG_DATA_HOME": str(home / "data"),
+        **extra,
+    }
+
+
+def make_home(tmp_path: Path, name: str, agent_script: str) -> Path:
+    """A config/data home whose claude command is the given shell script."""
+    home = tmp_path / name
+    script = home / "claude"
+    script.parent.mkdir(parents=True)
+    script.write_text(f"#!/bin/sh\n{agent_script}\n")
+    script.chmod(0o755)
+    config = home / "config" / "hire" / "config.json"
+    config.parent.mkdir(parents=True)
+    config.write_text(f'{{"adapters": {{"claude": {{"command": "{script}"}}}}}}')
+    return home
+
+
+@pytest.fixture
+def daemon(tmp_path: Path) -> Iterator[Path]:
+    """Run `hire serve` with its own (agent-less) home; yields the tmp dir."""
+    home = make_home(tmp_path, "daemon", "exit 1")
+    proc = subprocess.Popen([sys.executable, "-m", "hire.cli", "serve"], env=hire_env(home),
+                            stdin=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    socket_path = tmp_path / "serve.sock"
+    deadline = time.monotonic() + 10
+    while not socket_path.exists():
+        assert proc.poll() is None and time.monotonic() < deadline, "hire serve did not start"
+        time.sleep(0.05)
+    yield tmp_path
+    proc.send_signal(signal.SIGTERM)
+    proc.wait(10)
+
+
+def test_requests_use_the_client_environment(daemon: Path) -> None:
+    # The client's XDG dirs select its config (and agent); its env reaches the agent
+    home = make_home(daemon, "client", 'echo "{\\"type\\":\\"result\\",\\"session_id\\":\\"s1\\",'
+                                       '\\"result\\":\\"$GREETING\\",\\"is_error\\":false}"')
+    out = subprocess.run([sys.executable, "-m", "hire.cli", "claude", "hi"],
+                         env=hire_env(home, GREETING="hello from the client"),
+                         stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=30)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "hello from the client"
+    assert list((home / "data" / "hire" / "sessions" / "claude").iterdir())
+
+
+def test_client_interrupt_cancels_the_request(daemon: Path) -> None:
+    pid_file = daemon / "agent.pid"
+    home = make_home(daemon, "client", f"echo $$ > {pid_file}\nexec sleep 30")
+    client = subprocess.Popen([sys.executable, "-m", "hire.cli", "claude", "hi"],
+                              env=hire_env(home), stdin=subprocess.DEVNULL,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + 10
+    while not pid_file.exists():
+        assert time.monotonic() < deadline, "agent did not start"
+        time.sleep(0.05)
+    agent_pid = int(pid_file.read_text())
+
+    client.send_signal(signal.SIGINT)
+    assert client.wait(10) == 130
+
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            os.kill(agent_pid, 0)
+        except ProcessLookupError:
+            break
+        assert time.monotonic() < deadline, "agent was not stopped"
+        time.sleep(0.05)
+
+    # Give the daemon a moment to finish the cancelled request
+    time.sleep(0.5)
+    sessions = home / "data" / "hire" / "sessions" / "claude"
+    assert not sessions.exists() or not list(sessions.iterdir())
+    metrics = (home / "data" / "hire" / "metrics.jsonl").read_text()
+    assert '"status": "cancelled"' in metrics
+
+
+def test_command_errors_are_reported_to_the_client(daemon: Path) -> None:
+    home = make_home(daemon, "client", "exit 0")
+    # Point claude at a binary that does not exist: Popen raises FileNotFoundError
+    config = home / "config" / "hire" / "config.json"
+    config.write_text(f'{{"adapters": {{"claude": {{"command": "{home / "missing"}"}}}}}}')
+    out = subprocess.run([sys.executable, "-m", "hire.cli", "claude", "hi"],
+                         env=hire_env(home), stdin=subprocess.DEVNULL,
+                         capture_output=True, text=True, timeout=30)
+    assert out.returncode == 1
+    assert "missing" in out.stderr
+    assert "closed the connection" not in out.stderr
@@ -0,0 +1,316 @@
+"""Grok adapter against a local stand-in for the xAI API (see conftest.FakeXAI)."""
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from conftest import FakeXAI
+
+from hire.adapters import get_adapter
+
+
+def _response(text: str, response_id: str = "resp_1") -> dict:
+    return {
+        "id": response_id,
+        "output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}],
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+
+
+def _files(tmp_path: Path, *names: str) -> list[str]:
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_text(f"contents of {name}")
+        paths.append(str(path))
+    return paths
+
+
+def test_upload_failure_aborts_uploads_in_flight(xai_server: FakeXAI, tmp_path: Path) -> None:
+    def files(handler, body: bytes) -> None:
+        if b"slow.txt" in body:
+            time.sleep(5)
+            handler.send_json(200, {"id": "file-slow"})
+        else:
+            time.sleep(0.2)
+            handler.send_json(500, {"error": "upload failed"})
+
+    xai_server.handlers["/v1/files"] = files
+    start = time.perf_counter()
+    result = get_adapter("grok").ask("hi", files=_files(tmp_path, "slow.txt", "bad.txt"))
+    assert "File upload failed" in result["error"]
+    assert time.perf_counter() - start < 2
+    # The in-flight upload was aborted, so no worker is left for exit to join
+    deadline = time.monotonic() + 2
+    while any(t.name.startswith("ThreadPoolExecutor") for t in threading.enumerate()):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_upload_with_bad_response_is_an_error_result(
+    xai_server: FakeXAI, tmp_path: Path
+) -> None:
+    replies = iter([b"not json", json.dumps({"object": "file"}).encode()])
+    xai_server.handlers["/v1/files"] = lambda handler, body: handler.send_raw(200, next(replies))
+    adapter = get_adapter("grok")
+    for _ in range(2):
+        result = adapter.ask("hi", files=_files(tmp_path, "a.txt"))
+        assert result["response"] is None
+        assert "File upload failed" in result["error"]
+        assert not adapter.is_retryable(result)
+
+
+def test_upload_errors_are_classified_like_response_errors(
+    xai_server: FakeXAI, tmp_path: Path
+) -> None:
+    xai_server.handlers["/v1/files"] = lambda handler, body: handler.send_json(
+        503, {"error": "overloaded"}, {"Retry-After": "2"})
+    adapter = get_adapter("grok")
+    result = adapter.ask("hi", files=_files(tmp_path, "a.txt"))
+    assert result["status"] == 503
+    assert result["retry_after"] == 2.0
+    assert adapter.is_retryable(result)
+
+    xai_server.handlers["/v1/files"] = lambda handler, body: handler.send_json(
+        400, {"error": "bad file"})
+    result = adapter.ask("hi", files=_files(tmp_path, "b.txt"))
+    assert result["status"] == 400
+    assert not adapter.is_retryable(result)
+
+
+def test_upload_connection_error_is_transient(
+    write_config: Callable[[dict[str, Any]], None], tmp_path: Path
+) -> None:
+    # Nothing listens on this port
+    write_config({"adapters": {"grok": {"api_key": "k", "base_url": "http://127.0.0.1:9/v1"}}})
+    adapter = get_adapter("grok")
+    result = adapter.ask("hi", files=_files(tmp_path, "a.txt"))
+    assert result["transient"] is True
+    assert adapter.is_retryable(result)
+
+
+def _upload_handler(xai_server: FakeXAI) -> list[str]:
+    """Answer /files with a new ID per upload; returns the uploaded file names."""
+    uploaded: list[str] = []
+
+    def files(handler, body: bytes) -> None:
+        name = "a.txt" if b"a.txt" in body else "b.txt"
+        uploaded.append(name)
+        handler.send_json(200, {"id": f"file-{name[0]}{len(uploaded)}"})
+
+    xai_server.handlers["/v1/files"] = files
+    return uploaded
+
+
+def _sent_file_ids(xai_server: FakeXAI) -> list[list[str]]:
+    return [[part["file_id"] for part in request["input"][-1]["content"]
+             if part["type"] == "input_file"] for request in _sent(xai_server)]
+
+
+def test_rejected_cached_file_id_is_uploaded_again(
+    xai_server: FakeXAI, tmp_path: Path
+) -> None:
+    uploaded = _upload_handler(xai_server)
+    _responses_handler(xai_server)
+    files = _files(tmp_path, "a.txt", "b.txt")
+    adapter = get_adapter("grok")
+    assert adapter.ask("hi", files=files)["response"] == "answer"
+    assert sorted(uploaded) == ["a.txt", "b.txt"]
+    file_a = _sent_file_ids(xai_server)[0][0]
+
+    # The server deleted a.txt's upload; b.txt's cached ID is still good
+    rejected = iter([True])
+
+    def responses(handler, body: bytes) -> None:
+        if next(rejected, False):
+            handler.send_json(400, {"error": f"File {file_a} not found"})
+        else:
+            handler.send_json(200, _response("answer again"))
+
+    xai_server.handlers["/v1/responses"] = responses
+    result = adapter.ask("hi", files=files)
+    assert result["response"] == "answer again"
+    assert sorted(uploaded) == ["a.txt", "a.txt", "b.txt"]
+    first, rejected_ids, retried = _sent_file_ids(xai_server)
+    assert rejected_ids == first
+    assert retried == ["file-a3", first[1]]
+
+    # The new ID is cached: the next call uploads nothing
+    assert adapter.ask("hi", files=files)["response"] == "answer again"
+    assert len(uploaded) == 3
+    assert _sent_file_ids(xai_server)[-1] == retried
+
+
+def test_other_errors_with_cached_files_are_not_uploaded_again(
+    xai_server: FakeXAI, tmp_path: Path
+) -> None:
+    uploaded = _upload_handler(xai_server)
+    _responses_handler(xai_server)
+    files = _files(tmp_path, "a.txt")
+    adapter = get_adapter("grok")
+    adapter.ask("hi", files=files)
+
+    xai_server.handlers["/v1/responses"] = lambda handler, body: handler.send_json(
+        400, {"error": "Invalid model"})
+    result = adapter.ask("hi", files=files)
+    assert result["status"] == 400
+    assert uploaded == ["a.txt"]
+    assert len(_sent(xai_server)) == 2
+
+
+def _sse(event: dict, trailing: str = "\n\n") -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}{trailing}"
+
+
+def _stream(xai_server: FakeXAI, chunks: list[str]) -> tuple[list[dict], dict]:
+    xai_server.handlers["/v1/responses"] = lambda handler, body: handler.send_sse(chunks)
+    events = list(get_adapter("grok").stream("hi"))
+    return events[:-1], events[-1]["result"]
+
+
+def test_sse_text_deltas_and_completion(xai_server: FakeXAI) -> None:
+    events, result = _stream(xai_server, [
+        ": keep-alive comment\n\n",
+        _sse({"type": "response.output_text.delta", "delta": "Hello "}),
+        _sse({"type": "response.output_text.delta", "delta": "world"}),
+        _sse({"type": "response.completed", "response": _response("Hello world", "resp_9")}),
+    ])
+    assert [e["text"] for e in events if e["type"] == "text"] == ["Hello ", "world"]
+    assert result["response"] == "Hello world"
+    assert result["session_id"] == "resp_9"
+    body = json.loads(xai_server.requests[0]["body"])
+    assert body["stream"] is True
+
+
+def test_sse_event_split_across_chunks_and_multiline_data(xai_server: FakeXAI) -> None:
+    payload = json.dumps({"type": "response.output_text.delta", "delta": "split"})
+    events, result = _stream(xai_server, [
+        f"data: {payload[:10]}",
+        f"{payload[10:]}\n\n",
+        'data: {"type": "response.output_text.delta",\ndata: "delta": "multi"}\n\n',
+        _sse({"type": "response.completed", "response": _response("splitmulti")}),
+    ])
+    assert [e["text"] for e in events if e["type"] == "text"] == ["split", "multi"]
+    assert result["response"] == "splitmulti"
+
+
+def test_sse_malformed_event_is_skipped(xai_server: FakeXAI) -> None:
+    events, result = _stream(xai_server, [
+        _sse({"type": "response.output_text.delta", "delta": "ok"}),
+        "data: {not json\n\n",
+        "data: [1, 2]\n\n",
+        _sse({"type": "response.completed", "response": _response("ok")}),
+    ])
+    assert not result.get("error")
+    assert result["response"] == "ok"
+
+
+def test_sse_final_event_without_blank_line(xai_server: FakeXAI) -> None:
+    events, result = _stream(xai_server, [
+        _sse({"type": "response.output_text.delta", "delta": "last"}),
+        _sse({"type": "response.completed", "response": _response("last", "resp_end")}, "\n"),
+    ])
+    assert result["response"] == "last"
+    assert result["session_id"] == "resp_end"
+
+
+def test_sse_error_event(xai_server: FakeXAI) -> None:
+    events, result = _stream(xai_server, [
+        _sse({"type": "error", "error": {"message": "model overloaded"}}),
+    ])
+    assert result["response"] is None
+    assert "model overloaded" in result["error"]
+
+
+HISTORY = [
+    {"role": "user", "content": "first question"},
+    {"role": "assistant", "content": "first answer"},
+]
+
+
+def _responses_handler(xai_server: FakeXAI, expired: set[str] | None = None) -> None:
+    """Answer /responses, rejecting the given previous_response_ids as expired."""
+    counter = iter(range(1, 100))
+
+    def responses(handler, body: bytes) -> None:
+        request = json.loads(body)
+        if request.get("previous_response_id") in (expired or set()):
+            handler.send_json(404, {"error": "Response not found"})
+            return
+        handler.send_json(200, _response("answer", f"resp_{next(counter)}"))
+
+    xai_server.handlers["/v1/responses"] = responses
+
+
+def _sent(xai_server: FakeXAI) -> list[dict]:
+    return [json.loads(r["body"]) for r in xai_server.requests if r["path"] == "/v1/responses"]
+
+
+def test_new_conversation_sends_history_and_stores_it(xai_server: FakeXAI) -> None:
+    _responses_handler(xai_server)
+    result = get_adapter("grok").ask("hello")
+    assert result["response"] == "answer"
+    assert result["session_id"] == "resp_1"
+    (request,) = _sent(xai_server)
+    assert request["store"] is True
+    assert "previous_response_id" not in request
+    assert request["input"] == [{"role": "user", "content": "hello"}]
+
+
+def test_follow_up_chains_on_previous_response(xai_server: FakeXAI) -> None:
+    _responses_handler(xai_server)
+    result = get_adapter("grok").ask("second question", session_id="resp_prev", history=HISTORY)
+    assert result["session_id"] == "resp_1"
+    (request,) = _sent(xai_server)
+    assert request["previous_response_id"] == "resp_prev"
+    # Only the new turn is sent, not the history
+    assert request["input"] == [{"role": "user", "content": "second question"}]
+
+
+def test_expired_previous_response_falls_back_to_history(xai_server: FakeXAI) -> None:
+    _responses_handler(xai_server, expired={"resp_gone"})
+    result = get_adapter("grok").ask("second question", session_id="resp_gone", history=HISTORY)
+    assert result["response"] == "answer"
+    assert result["session_id"] == "resp_1"
+    chained, replayed = _sent(xai_server)
+    assert chained["previous_response_id"] == "resp_gone"
+    assert "previous_response_id" not in replayed
+    assert [m["content"] for m in replayed["input"]] == [
+        "first question", "first answer", "second question"]
+
+
+def test_placeholder_session_id_replays_history(xai_server: FakeXAI) -> None:
+    _responses_handler(xai_server)
+    get_adapter("grok").ask("second question", session_id="unknown", history=HISTORY)
+    (request,) = _sent(xai_server)
+    assert "previous_response_id" not in request
+    assert len(request["input"]) == 3
+
+
+def test_server_error_on_chained_call_is_not_replayed(xai_server: FakeXAI) -> None:
+    xai_server.handlers["/v1/responses"] = lambda handler, body: handler.send_json(
+        500, {"error": "internal"})
+    result = get_adapter("grok").ask("second question", session_id="resp_prev", history=HISTORY)
+    assert result["status"] == 500
+    assert len(_sent(xai_server)) == 1
+
+
+def test_context_budget_elides_oldest_unpinned_messages(
+    xai_server: FakeXAI, write_config: Callable[[dict[str, Any]], None]
+) -> None:
+    write_config({"adapters": {"grok": {**xai_server.grok_config,
+                                        "context_budget": {"tokens": 120}}}})
+    _responses_handler(xai_server)
+    history = [{"role": "user", "content": "pinned " * 20, "pinned": True}]
+    for i in range(6):
+        history.append({"role": "user" if i % 2 else "assistant", "content": f"m{i} " * 20})
+    result = get_adapter("grok").ask("new", history=history)
+    (request,) = _sent(xai_server)
+    sent = [m["content"] for m in request["input"]]
+    assert sent[0].startswith("pinned")
+    assert sent[-1] == "new"
+    assert result["elided"] == len(history) + 1 - len(sent)
+    assert result["elided"] > 0
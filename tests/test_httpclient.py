@@ -0,0 +1,105 @@
+"""Keep-alive pooling and aborts in the HTTP client, against a local server."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import FakeXAI
+
+from hire.httpclient import AbortSignal, ConnectionPool, HTTPError
+
+
+def _ok(handler, body: bytes) -> None:
+    handler.send_json(200, {"ok": True, "size": len(body)})
+
+
+def test_sequential_requests_reuse_one_connection(xai_server: FakeXAI) -> None:
+    xai_server.handlers["/v1/ping"] = _ok
+    pool = ConnectionPool()
+    for _ in range(5):
+        assert pool.request("POST", f"{xai_server.base_url}/ping", body=b"x").json()["ok"]
+    assert pool.requests == 5
+    assert pool.connections_opened == 1
+    # The server saw every request arrive from the same client socket
+    assert len({r["port"] for r in xai_server.requests}) == 1
+
+
+def test_concurrent_requests_open_at_most_one_connection_each(xai_server: FakeXAI) -> None:
+    def slow(handler, body: bytes) -> None:
+        time.sleep(0.1)
+        _ok(handler, body)
+
+    xai_server.handlers["/v1/ping"] = slow
+    pool = ConnectionPool()
+
+    def call(_: int) -> bool:
+        return pool.request("POST", f"{xai_server.base_url}/ping", body=b"x").json()["ok"]
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert all(executor.map(call, range(3)))
+        assert all(executor.map(call, range(3)))
+    assert pool.requests == 6
+    assert pool.connections_opened <= 3
+
+
+def test_streamed_body_is_sent_with_content_length(xai_server: FakeXAI) -> None:
+    xai_server.handlers["/v1/ping"] = _ok
+    pool = ConnectionPool()
+    body = [b"a" * 1000, b"b" * 24]
+    resp = pool.request("POST", f"{xai_server.base_url}/ping", body=lambda: iter(body),
+                        headers={"Content-Length": "1024"})
+    assert resp.json()["size"] == 1024
+
+
+def test_error_status_raises_and_keeps_the_connection(xai_server: FakeXAI) -> None:
+    xai_server.handlers["/v1/ping"] = lambda handler, body: handler.send_json(
+        429, {"error": "slow down"}, {"Retry-After": "3"})
+    pool = ConnectionPool()
+    for _ in range(2):
+        with pytest.raises(HTTPError) as excinfo:
+            pool.request("POST", f"{xai_server.base_url}/ping", body=b"x")
+        assert excinfo.value.code == 429
+        assert excinfo.value.headers["retry-after"] == "3"
+        assert b"slow down" in excinfo.value.body
+    assert pool.connections_opened == 1
+
+
+def test_connection_closed_by_server_is_replaced(xai_server: FakeXAI) -> None:
+    def close_after(handler, body: bytes) -> None:
+        _ok(handler, body)
+        # Drop the keep-alive connection without telling the client
+        handler.close_connection = True
+
+    xai_server.handlers["/v1/ping"] = close_after
+    pool = ConnectionPool()
+    for _ in range(3):
+        assert pool.request("POST", f"{xai_server.base_url}/ping", body=b"x").json()["ok"]
+        time.sleep(0.05)
+    assert pool.connections_opened == 3
+    assert len(xai_server.requests) == 3
+
+
+def test_abort_interrupts_a_request_in_flight(xai_server: FakeXAI) -> None:
+    xai_server.handlers["/v1/ping"] = lambda handler, body: (time.sleep(3), _ok(handler, body))
+    pool = ConnectionPool()
+    signal = AbortSignal()
+    threading.Timer(0.2, signal.abort).start()
+    start = time.perf_counter()
+    with pytest.raises(OSError):
+        pool.request("POST", f"{xai_server.base_url}/ping", body=b"x", abort=signal)
+    assert time.perf_counter() - start < 2
+    # Requests with an aborted signal fail at once
+    with pytest.raises(OSError):
+        pool.request("POST", f"{xai_server.base_url}/ping", body=b"x", abort=signal)
+
+
+def test_child_signal_follows_its_parent() -> None:
+    parent = AbortSignal()
+    child = parent.child()
+    other = parent.child()
+    other.abort()
+    assert not parent.aborted and not child.aborted
+    parent.abort()
+    assert child.aborted
+    assert parent.child().aborted
@@ -0,0 +1,79 @@
+"""The SQLite session index: lookups by ID and name, and rebuilding it."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from hire.index import (
+    INDEX_FILENAME,
+    _connections,
+    count_sessions,
+    find_by_id,
+    find_by_name,
+    rebuild_index,
+)
+from hire.paths import get_sessions_dir
+from hire.session import create_session, delete_session, find_session, save_session
+
+
+def write_session_file(agent: str, session_id: str, name: str | None, updated_at: str) -> None:
+    """A session file written behind the index's back (e.g. by an older hire)."""
+    session = {"id": session_id, "agent": agent, "cli_session_id": "cli", "name": name,
+               "created_at": updated_at, "updated_at": updated_at}
+    path = get_sessions_dir(agent) / f"{session_id}.json"
+    path.write_text(json.dumps(session), encoding="utf-8")
+
+
+def test_saved_sessions_are_found_by_id_prefix_and_name() -> None:
+    session = create_session("claude", "cli-1", name="review")
+    save_session(session)
+
+    assert find_by_id(session["id"]) == [(session["id"], "claude")]
+    assert find_by_id(session["id"][:8]) == [(session["id"], "claude")]
+    assert find_by_name("review") == (session["id"], "claude")
+    assert find_session("review")["cli_session_id"] == "cli-1"
+    assert find_session(session["id"][:8])["id"] == session["id"]
+
+
+def test_prefix_matching_several_sessions_returns_all() -> None:
+    write_session_file("codex", "abc-1", None, "2026-01-01T00:00:00")
+    write_session_file("gemini", "abc-2", None, "2026-01-02T00:00:00")
+    write_session_file("codex", "abd-3", None, "2026-01-03T00:00:00")
+    rebuild_index()
+    assert sorted(find_by_id("abc")) == [("abc-1", "codex"), ("abc-2", "gemini")]
+    assert find_by_id("abc-2") == [("abc-2", "gemini")]
+
+
+def test_name_resolves_to_most_recently_updated_session() -> None:
+    write_session_file("claude", "old", "shared", "2026-01-01T00:00:00")
+    write_session_file("codex", "new", "shared", "2026-02-01T00:00:00")
+    rebuild_index()
+    assert find_by_name("shared") == ("new", "codex")
+    assert find_by_name("missing") is None
+
+
+def test_deleted_sessions_leave_the_index() -> None:
+    session = create_session("claude", "cli-1", name="gone")
+    save_session(session)
+    assert delete_session(session)
+    assert find_by_name("gone") is None
+    assert find_by_id(session["id"]) == []
+
+
+def test_index_is_rebuilt_from_files_when_missing_or_outdated() -> None:
+    write_session_file("claude", "s-1", "first", "2026-01-01T00:00:00")
+    write_session_file("codex", "s-2", None, "2026-01-02T00:00:00")
+    (get_sessions_dir("codex") / "latest.json").write_text('{"session_id": "s-2"}')
+    (get_sessions_dir("codex") / "broken.json").write_text("{not json")
+    assert count_sessions() == 2
+
+    # An index from an older schema version is dropped and rebuilt
+    path: Path = get_sessions_dir() / INDEX_FILENAME
+    _connections.pop(path).close()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA user_version=0")
+    conn.execute("DELETE FROM sessions")
+    conn.commit()
+    conn.close()
+    assert find_by_name("first") == ("s-1", "claude")
+    assert count_sessions(agent="codex") == 1
@@ -0,0 +1,80 @@
+"""Per-call metrics: recording, percentiles and the hire stats summary."""
+
+import json
+from argparse import Namespace
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from hire.commands.stats import run_stats
+from hire.metrics import percentile, read_metrics, record_call, summarize
+
+
+def call(total: float, **result: Any) -> None:
+    """Record a claude call that took `total` seconds."""
+    record_call("claude", "sonnet", "ask", "hi", {"response": "ok", **result}, {"total": total})
+
+
+def test_percentile_is_nearest_rank() -> None:
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile([2, 1], 0.5) == 1
+    assert percentile([7], 0.99) == 7
+    hundred = list(range(1, 101))
+    assert percentile(hundred, 0.5) == 50
+    assert percentile(hundred, 0.95) == 95
+    assert percentile(hundred, 0.99) == 99
+    assert percentile(hundred, 1.0) == 100
+
+
+def test_record_call_writes_status_and_timings() -> None:
+    call(1.23456, usage={"total_tokens": 3})
+    call(2.0, response=None, error="boom")
+    call(3.0, response=None, error="slow", timed_out=True)
+    call(4.0, response=None, error="Cancelled", cancelled=True)
+
+    rows = read_metrics()
+    assert [r["status"] for r in rows] == ["ok", "error", "timeout", "cancelled"]
+    assert rows[0]["timings"] == {"total": 1.2346}
+    assert rows[0]["usage"] == {"total_tokens": 3}
+    assert rows[0]["request_bytes"] == 2 and rows[0]["response_bytes"] == 2
+    assert read_metrics(agent="codex") == []
+
+
+def test_metrics_can_be_disabled(write_config: Callable[[dict[str, Any]], None]) -> None:
+    write_config({"metrics": {"enabled": False}})
+    call(1.0)
+    assert read_metrics() == []
+
+
+def test_summary_percentiles_and_accounting() -> None:
+    for total in (1, 2, 3, 4):
+        call(total)
+    call(10, response=None, error="boom")
+    call(20, response=None, error="slow", timed_out=True)
+    # Cancelled calls (race losers) count as calls, but not as errors or latency
+    call(99, response=None, error="Cancelled", cancelled=True)
+
+    [entry] = summarize(read_metrics())
+    assert entry["agent"] == "claude" and entry["model"] == "sonnet"
+    assert entry["calls"] == 7
+    assert entry["errors"] == 2
+    assert entry["timeouts"] == 1
+    assert entry["cancelled"] == 1
+    assert entry["error_rate"] == pytest.approx(2 / 6)
+    # Latencies of the six finished calls: 1, 2, 3, 4, 10, 20
+    assert entry["p50"] == 3
+    assert entry["p95"] == 20
+    assert entry["p99"] == 20
+
+
+def test_stats_json(capsys: pytest.CaptureFixture[str]) -> None:
+    for total in (1, 2):
+        call(total)
+    record_call("codex", None, "batch", "hi", {"response": None, "error": "x"}, {"total": 5})
+
+    assert run_stats(Namespace(since=None, agent=None, json=True)) == 0
+    summary = {s["agent"]: s for s in json.loads(capsys.readouterr().out)}
+    assert summary["claude"]["p50"] == 1
+    assert summary["claude"]["errors"] == 0
+    assert summary["codex"]["error_rate"] == 1.0
@@ -0,0 +1,91 @@
+"""Token bucket and in-flight limits shared through ratelimit.db."""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from hire import ratelimit
+
+
+def test_unlimited_agent_does_not_wait() -> None:
+    assert ratelimit.get_rate_limit("claude") is None
+    assert ratelimit.acquire_slot("claude", None) == (None, 0.0)
+
+
+def test_settings(write_config: Callable[[dict[str, Any]], None]) -> None:
+    write_config({"adapters": {"grok": {"rate_limit": {"per_minute": 120, "burst": 3}}}})
+    assert ratelimit.get_rate_limit("grok") == {"rate": 2.0, "burst": 3.0, "max_in_flight": None}
+
+
+def test_burst_then_refill(write_config: Callable[[dict[str, Any]], None]) -> None:
+    write_config({"adapters": {"grok": {"rate_limit": {"per_minute": 600, "burst": 2}}}})
+    waits = []
+    for _ in range(3):
+        slot, wait = ratelimit.acquire_slot("grok", "m")
+        ratelimit.release_slot(slot)
+        waits.append(wait)
+    assert waits[0] < 0.05 and waits[1] < 0.05
+    # 10 tokens a second: the third call waits for roughly one refill
+    assert 0.05 <= waits[2] < 1.0
+
+
+def test_models_have_separate_buckets(write_config: Callable[[dict[str, Any]], None]) -> None:
+    write_config({"adapters": {"grok": {"rate_limit": {"per_minute": 1, "burst": 1}}}})
+    stop = threading.Event()
+    stop.set()
+    slot, _ = ratelimit.acquire_slot("grok", "a")
+    assert slot is not None
+    ratelimit.release_slot(slot)
+    # "a" is out of tokens, "b" still has its own
+    assert ratelimit.acquire_slot("grok", "a", stop)[0] is None
+    slot, _ = ratelimit.acquire_slot("grok", "b", stop)
+    assert slot is not None
+    ratelimit.release_slot(slot)
+
+
+def test_max_in_flight(write_config: Callable[[dict[str, Any]], None]) -> None:
+    write_config({"adapters": {"codex": {"rate_limit": {"max_in_flight": 1}}}})
+    first, _ = ratelimit.acquire_slot("codex", None)
+    assert first is not None
+
+    acquired: list[float] = []
+
+    def second() -> None:
+        slot, wait = ratelimit.acquire_slot("codex", None)
+        acquired.append(wait)
+        ratelimit.release_slot(slot)
+
+    thread = threading.Thread(target=second)
+    thread.start()
+    time.sleep(0.3)
+    assert not acquired
+    ratelimit.release_slot(first)
+    thread.join(timeout=5)
+    assert acquired and acquired[0] >= 0.25
+
+
+def test_stop_event_ends_the_wait(write_config: Callable[[dict[str, Any]], None]) -> None:
+    write_config({"adapters": {"codex": {"rate_limit": {"max_in_flight": 1}}}})
+    held, _ = ratelimit.acquire_slot("codex", None)
+    stop = threading.Event()
+    threading.Timer(0.2, stop.set).start()
+    slot, wait = ratelimit.acquire_slot("codex", None, stop)
+    ratelimit.release_slot(held)
+    assert slot is None
+    assert 0.15 <= wait < 2
+
+
+def test_slots_of_dead_processes_are_reclaimed(
+    write_config: Callable[[dict[str, Any]], None],
+) -> None:
+    write_config({"adapters": {"codex": {"rate_limit": {"max_in_flight": 1}}}})
+    conn = ratelimit._connect()
+    # A slot left behind by a process that no longer exists
+    conn.execute("INSERT INTO slots (key, pid, started) VALUES (?, ?, ?)",
+                 ("codex:", 2**22 + 12345, time.time()))
+    stop = threading.Event()
+    threading.Timer(1.0, stop.set).start()
+    slot, _ = ratelimit.acquire_slot("codex", None, stop)
+    assert slot is not None
+    ratelimit.release_slot(slot)
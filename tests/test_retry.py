@@ -0,0 +1,130 @@
+"""Circuit breaker states and the retry loop around agent calls."""
+
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+
+from hire import retry
+from hire.adapters import get_adapter
+from hire.commands.ask import _call_with_retries
+
+POLICY = {"attempts": 1, "base_delay": 0.0, "max_delay": 0.0, "threshold": 2, "cooldown": 30.0}
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers(write_config: Callable[[dict[str, Any]], None]) -> Iterator[None]:
+    write_config({"retry": {"attempts": 1}, "circuit_breaker": {"threshold": 2, "cooldown": 30}})
+    retry._breakers.clear()
+    yield
+    retry._breakers.clear()
+
+
+def open_circuit(agent: str, cooldown_over: bool = True) -> None:
+    """Trip the agent's breaker, optionally with the cooldown already over."""
+    for _ in range(POLICY["threshold"]):
+        retry.record_outcome(agent, False, POLICY)
+    if cooldown_over:
+        retry._breakers[agent]["open_until"] -= POLICY["cooldown"] + 1
+
+
+def call(agent: str, result: dict[str, Any]) -> dict[str, Any]:
+    return _call_with_retries(agent, None, get_adapter(agent), lambda: result, [],
+                              threading.Event())[0]
+
+
+def test_breaker_opens_after_threshold() -> None:
+    retry.record_outcome("claude", False, POLICY)
+    assert retry.breaker_wait("claude") == (0, False)
+    retry.record_outcome("claude", False, POLICY)
+    wait, trial = retry.breaker_wait("claude")
+    assert wait > 0 and not trial
+
+
+def test_half_open_allows_one_trial() -> None:
+    open_circuit("claude")
+    assert retry.breaker_wait("claude") == (0, True)
+    wait, trial = retry.breaker_wait("claude")
+    assert wait > 0 and not trial
+
+
+def test_half_open_to_closed_on_success() -> None:
+    open_circuit("claude")
+    result = call("claude", {"response": "ok", "session_id": None})
+    assert not result.get("error")
+    assert "claude" not in retry._breakers
+    assert retry.breaker_wait("claude") == (0, False)
+
+
+def test_half_open_to_open_on_transient_failure() -> None:
+    open_circuit("claude")
+    result = call("claude", {"response": None, "error": "503 Service Unavailable"})
+    assert result["error"]
+    wait, trial = retry.breaker_wait("claude")
+    assert wait > 0 and not trial
+
+
+def test_failed_trial_reopens_even_below_a_raised_threshold() -> None:
+    open_circuit("claude")
+    assert retry.breaker_wait("claude") == (0, True)
+    retry.record_outcome("claude", False, {**POLICY, "threshold": 10})
+    wait, trial = retry.breaker_wait("claude")
+    assert wait > 0 and not trial
+
+
+def test_non_transient_trial_failure_keeps_circuit_half_open() -> None:
+    open_circuit("claude")
+    result = call("claude", {"response": None, "error": "Invalid API key"})
+    assert result["error"] == "Invalid API key"
+    # The next caller gets to make a trial call instead of failing fast forever
+    assert retry.breaker_wait("claude") == (0, True)
+
+
+def test_trial_released_when_attempt_raises() -> None:
+    open_circuit("claude")
+
+    def attempt() -> dict[str, Any]:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        _call_with_retries("claude", None, get_adapter("claude"), attempt, [],
+                           threading.Event())
+    assert retry.breaker_wait("claude") == (0, True)
+
+
+def test_parse_retry_after() -> None:
+    assert retry.parse_retry_after("3") == 3.0
+    assert retry.parse_retry_after("-1") == 0.0
+    assert retry.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry.parse_retry_after("soon") is None
+    assert retry.parse_retry_after(None) is None
+
+
+def test_backoff_delay_honours_retry_after_and_cap() -> None:
+    policy = {**POLICY, "base_delay": 1.0, "max_delay": 5.0}
+    assert retry.backoff_delay(0, policy, retry_after=2.0) == 2.0
+    assert retry.backoff_delay(0, policy, retry_after=60.0) == 5.0
+    for n in range(6):
+        assert 0 < retry.backoff_delay(n, policy) <= 5.0
+
+
+def test_rate_limit_wait_timeout_is_not_a_breaker_failure(
+    write_config: Callable[[dict[str, Any]], None],
+) -> None:
+    write_config({"retry": {"attempts": 1},
+                  "adapters": {"claude": {"rate_limit": {"max_in_flight": 1}}}})
+    from hire.ratelimit import acquire_slot, release_slot
+
+    held, _ = acquire_slot("claude", None)
+    timed_out = threading.Event()
+    timed_out.set()
+    try:
+        result, _, transient = _call_with_retries(
+            "claude", None, get_adapter("claude"), lambda: {"response": "unreachable"}, [],
+            timed_out)
+    finally:
+        release_slot(held)
+    assert result["error"] == "Timed out waiting for the rate limit"
+    assert transient
+    assert "claude" not in retry._breakers
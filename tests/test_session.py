@@ -0,0 +1,154 @@
+"""Session records, transcripts, the session index and listing."""
+
+import json
+from argparse import Namespace
+
+import pytest
+
+from hire.commands.delete import run_delete
+from hire.commands.sessions import run_sessions
+from hire.index import query_sessions, rebuild_index
+from hire.paths import get_sessions_dir
+from hire.session import (
+    _update_latest,
+    append_transcript,
+    create_session,
+    delete_session,
+    delete_sessions,
+    find_session,
+    get_latest_session,
+    list_sessions,
+    load_transcript,
+    save_session,
+)
+
+
+def test_transcript_counts_exchanges_not_messages() -> None:
+    session = create_session("grok", "resp_1", name="chat")
+    for i in range(3):
+        append_transcript(session, [{"role": "user", "content": f"q{i}"},
+                                    {"role": "assistant", "content": f"a{i}"}])
+    save_session(session)
+    assert session["turns"] == 3
+    assert [m["content"] for m in load_transcript(session)] == [
+        "q0", "a0", "q1", "a1", "q2", "a2"]
+
+
+def test_turn_without_reply_still_counts() -> None:
+    session = create_session("grok", "resp_1")
+    append_transcript(session, [{"role": "user", "content": "q"}])
+    assert session["turns"] == 1
+
+
+def test_inline_messages_are_moved_into_the_transcript() -> None:
+    session = create_session("grok", "resp_1")
+    session["messages"] = [{"role": "user", "content": "old q"},
+                           {"role": "assistant", "content": "old a"}]
+    session["turns"] = 2  # Older records counted messages
+    append_transcript(session, [{"role": "user", "content": "new q"}])
+    assert "messages" not in session
+    assert session["turns"] == 2
+    assert len(load_transcript(session)) == 3
+
+
+def make_sessions(count: int, agents: tuple[str, ...] = ("claude", "codex")) -> list[str]:
+    """Write sessions with distinct (or, every third one, tied) update times.
+
+    Returns:
+        Their IDs, most recently updated first (the listing order).
+    """
+    rows = []
+    for i in range(count):
+        agent = agents[i % len(agents)]
+        # Ties on updated_at are ordered by ID, so pages must not skip or repeat them
+        updated = f"2026-01-{1 + i // 3:02d}T00:00:00"
+        session = {"id": f"s-{i:03d}", "agent": agent, "cli_session_id": "cli",
+                   "name": f"job-{i}" if i % 2 else f"chat-{i}",
+                   "created_at": updated, "updated_at": updated}
+        path = get_sessions_dir(agent) / f"{session['id']}.json"
+        path.write_text(json.dumps(session), encoding="utf-8")
+        rows.append((updated, session["id"]))
+    rebuild_index()
+    return [sid for _, sid in sorted(rows, reverse=True)]
+
+
+def test_keyset_pages_cover_every_session_once() -> None:
+    expected = make_sessions(20)
+    for page_size in (1, 3, 7, 500):
+        ids = [row["id"] for row in query_sessions(page_size=page_size)]
+        assert ids == expected
+
+
+def test_listing_filters_and_limit() -> None:
+    expected = make_sessions(20)
+    assert [s["id"] for s in list_sessions(limit=5)] == expected[:5]
+    assert [row["id"] for row in query_sessions(limit=5, page_size=2)] == expected[:5]
+
+    codex = [s["id"] for s in list_sessions(agent="codex")]
+    assert codex == [sid for sid in expected if int(sid[2:]) % 2]
+
+    recent = list_sessions(since="2026-01-06T00:00:00")
+    assert [s["id"] for s in recent] == expected[:5]
+
+    jobs = [s["name"] for s in list_sessions(name_glob="job-*", limit=3)]
+    assert jobs == ["job-19", "job-17", "job-15"]
+
+
+def test_sessions_ndjson_streams_one_session_per_line(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    expected = make_sessions(6)
+    args = Namespace(target=None, agent=None, json=False, ndjson=True, limit=4, since=None,
+                     name_glob=None, reindex=False)
+    assert run_sessions(args) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == expected[:4]
+
+
+def latest_id(agent: str) -> str | None:
+    session = get_latest_session(agent)
+    return session["id"] if session else None
+
+
+def test_delete_sessions_by_agent() -> None:
+    expected = make_sessions(10)
+    for agent in ("claude", "codex"):
+        _update_latest(agent)
+
+    assert delete_sessions(agent="codex") == 5
+    assert [s["id"] for s in list_sessions()] == [
+        sid for sid in expected if int(sid[2:]) % 2 == 0]
+    assert not list(get_sessions_dir("codex").glob("s-*.json"))
+    assert not (get_sessions_dir("codex") / "latest.json").exists()
+    assert latest_id("claude") == "s-008"
+
+
+def test_delete_sessions_by_age_repoints_latest() -> None:
+    make_sessions(10)
+    # An older session is latest (e.g. it was resumed last), and gets deleted
+    (get_sessions_dir("claude") / "latest.json").write_text(
+        json.dumps({"session_id": "s-000", "filename": "s-000.json"}), encoding="utf-8")
+
+    # Sessions 0-5 were last updated on Jan 1 and 2
+    assert delete_sessions(before="2026-01-03T00:00:00") == 6
+    assert sorted(s["id"] for s in list_sessions()) == ["s-006", "s-007", "s-008", "s-009"]
+    assert latest_id("claude") == "s-008"
+    assert latest_id("codex") == "s-009"
+
+
+def test_deleting_the_latest_session_repoints_latest() -> None:
+    make_sessions(6)
+    _update_latest("codex")
+    assert latest_id("codex") == "s-005"
+
+    session = find_session("s-005")
+    assert session and delete_session(session)
+    assert latest_id("codex") == "s-003"
+
+
+def test_delete_rejects_a_name_with_bulk_options(capsys: pytest.CaptureFixture[str]) -> None:
+    make_sessions(4)
+    args = Namespace(name_or_id="s-001", all=False, agent="codex", older_than=None, force=True)
+    assert run_delete(args) == 1
+    assert "Error:" in capsys.readouterr().err
+    assert len(list_sessions()) == 4